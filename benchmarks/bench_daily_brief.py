@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Daily Brief Scale Benchmark — runs the generator against a local fake GitHub API
+
+For each repository scale (default 10 / 1,000 / 10,000 open PRs) and backend
+this starts benchmarks/fake_github_server.py, points generate_daily_brief.py
+at it and measures:
+- Wall time of a cold run (empty conditional-request cache)
+- Wall time of a warm run (cache and per-PR state populated, nothing changed)
+- HTTP requests served, 304 responses and peak traced Python memory
+
+No GitHub token or network access is needed, so this can gate regressions in
+CI: with budgets set, the script exits 1 when any run exceeds them. Request
+budgets are `base + per-PR × PRs` (request counts are deterministic against
+the fake server; the warm budget catches a lost conditional-request cache),
+and --max-seconds bounds the wall time of every run.
+
+Usage:
+    python benchmarks/bench_daily_brief.py
+    python benchmarks/bench_daily_brief.py --scales 10 1000 --backend graphql --latency-ms 20
+    python benchmarks/bench_daily_brief.py --scales 10 1000 --max-cold-requests-per-pr 2 \
+        --max-warm-requests-per-pr 0.3 --max-seconds 60
+
+Dependencies: Python 3.7+, requests
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+import generate_daily_brief as gdb  # noqa: E402
+from fake_github_server import FakeGitHubServer, SyntheticRepo  # noqa: E402
+
+DEFAULT_SCALES = [10, 1000, 10000]
+# Fixed requests allowed per run on top of the per-PR budget (listing, paging)
+REQUEST_BUDGET_BASE = 10
+
+
+def run_brief(server: FakeGitHubServer, cache_dir: Path, backend: str, concurrency: int, trace_memory: bool) -> Dict:
+    """Run main() once against the fake server and collect measurements."""
+    gdb.GITHUB_API_URL = server.url
+    gdb.GITHUB_TOKEN = "fake-token"
+    gdb.GITHUB_CACHE_DIR = cache_dir
+    gdb.PROJECT_ITEMS_SNAPSHOT = cache_dir / "project_items.json"
+    gdb.BRIEF_STATE_PATH = cache_dir / "brief_state.json"
+    # Write mode (test mode never saves per-PR state), into the temp dir
+    gdb.REPO_ROOT = cache_dir
+    gdb.DAILY_BRIEF_DIR = cache_dir / "DAILY_BRIEF"
+    gdb.APPROVALS_QUEUE_DIR = cache_dir / "APPROVALS_QUEUE"
+    gdb._github_client = None
+    gdb._replaying = False
+    gdb._now_override = None
+
+    argv = ["generate_daily_brief.py", "--backend", backend, "--concurrency", str(concurrency)]
+    requests_before = server.request_count
+    not_modified_before = server.not_modified_count
+    output = io.StringIO()
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    saved_argv = sys.argv
+    try:
+        sys.argv = argv
+        with contextlib.redirect_stdout(output):
+            gdb.main()
+    finally:
+        sys.argv = saved_argv
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        if trace_memory:
+            tracemalloc.stop()
+
+    return {
+        "seconds": round(elapsed, 3),
+        "requests": server.request_count - requests_before,
+        "not_modified": server.not_modified_count - not_modified_before,
+        "peak_mb": round(peak / (1024 * 1024), 2),
+        "output_bytes": sum(
+            path.stat().st_size for directory in (gdb.DAILY_BRIEF_DIR, gdb.APPROVALS_QUEUE_DIR)
+            for path in directory.glob("*.md")
+        ),
+    }
+
+
+def run_scale(num_prs: int, backend: str, args) -> Dict:
+    """Benchmark one scale: a cold run followed by a warm run."""
+    repo = SyntheticRepo(num_prs, files_per_pr=args.files_per_pr)
+    with FakeGitHubServer(repo, latency=args.latency_ms / 1000.0, rate_limit=args.rate_limit) as server:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = run_brief(server, Path(cache_dir), backend, args.concurrency, not args.no_memory)
+            warm = run_brief(server, Path(cache_dir), backend, args.concurrency, not args.no_memory)
+        rate_limited = server.rate_limited_count
+    return {"prs": num_prs, "backend": backend, "cold": cold, "warm": warm, "rate_limited": rate_limited}
+
+
+def format_table(results: List[Dict]) -> str:
+    """Render results as a fixed-width table."""
+    header = f"{'PRs':>7} {'backend':<8} {'run':<5} {'seconds':>9} {'requests':>9} {'304s':>7} {'peak MB':>8}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        for run in ("cold", "warm"):
+            m = result[run]
+            lines.append(
+                f"{result['prs']:>7} {result['backend']:<8} {run:<5} {m['seconds']:>9.3f} "
+                f"{m['requests']:>9} {m['not_modified']:>7} {m['peak_mb']:>8.2f}"
+            )
+    return "\n".join(lines)
+
+
+def check_budgets(results: List[Dict], args) -> List[str]:
+    """Budget violations, one message per run that exceeded a budget."""
+    per_pr = {"cold": args.max_cold_requests_per_pr, "warm": args.max_warm_requests_per_pr}
+    violations = []
+    for result in results:
+        for run in ("cold", "warm"):
+            m = result[run]
+            label = f"{result['prs']} PRs / {result['backend']} / {run}"
+            if per_pr[run] is not None:
+                budget = int(REQUEST_BUDGET_BASE + per_pr[run] * result["prs"])
+                if m["requests"] > budget:
+                    violations.append(f"{label}: {m['requests']} requests > budget {budget}")
+            if args.max_seconds is not None and m["seconds"] > args.max_seconds:
+                violations.append(f"{label}: {m['seconds']}s > budget {args.max_seconds}s")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily brief scale benchmark (fake GitHub API)")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Open PR counts to benchmark")
+    parser.add_argument("--backend", choices=gdb.BRIEF_BACKENDS + ["all"], default="all", help="PR data backend")
+    parser.add_argument("--concurrency", type=int, default=gdb.GITHUB_CONCURRENCY, help="Per-PR request concurrency")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated per-request server latency")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Simulated primary rate limit per hour")
+    parser.add_argument("--files-per-pr", type=int, default=5, help="Changed files per synthetic PR")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (lower overhead)")
+    parser.add_argument("--json", type=Path, help="Also write results as JSON to this path")
+    parser.add_argument(
+        "--max-cold-requests-per-pr", type=float, default=None, help="Request budget per PR for a cold run"
+    )
+    parser.add_argument(
+        "--max-warm-requests-per-pr", type=float, default=None, help="Request budget per PR for a warm run"
+    )
+    parser.add_argument("--max-seconds", type=float, default=None, help="Wall-time budget for any single run")
+    args = parser.parse_args()
+
+    backends = gdb.BRIEF_BACKENDS if args.backend == "all" else [args.backend]
+    results = []
+    for num_prs in args.scales:
+        for backend in backends:
+            result = run_scale(num_prs, backend, args)
+            results.append(result)
+            print(f"[INFO] {num_prs} PRs / {backend}: cold {result['cold']['seconds']}s, warm {result['warm']['seconds']}s")
+
+    print()
+    print(format_table(results))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    violations = check_budgets(results, args)
+    if violations:
+        print()
+        for violation in violations:
+            print(f"[FAIL] {violation}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Fake GitHub API Server — local stand-in for benchmarking the daily brief
+
+Serves a synthetic repository over HTTP with the endpoints the brief uses:
+- GET  /repos/{owner}/{repo}/pulls             (Link-header pagination)
+- GET  /repos/{owner}/{repo}/issues            (Link-header pagination)
+- GET  /repos/{owner}/{repo}/git/refs/pull/{n}/head
+- GET  /repos/{owner}/{repo}/commits/{sha}/status
+- GET  /repos/{owner}/{repo}/pulls/{n}/files   (Link-header pagination)
+- POST /graphql  (open PRs with rollup/files, PR files, projectV2 items, nodes)
+
+Responses carry ETags (answering If-None-Match with 304) and X-RateLimit-*
+headers. Per-request latency and a primary rate limit are configurable.
+
+Dependencies: Python 3.7+ (standard library only)
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+PROTECTED_SAMPLE_FILES = ["GOVERNANCE/GUARDRAILS.md", ".github/workflows/ci.yml", "STATE/STATUS_LEDGER.md"]
+STATUS_CYCLE = ["success", "success", "success", "failure", "pending"]
+PROJECT_STATUS_CYCLE = ["In Review (PR Open)", "Waiting for Approval", "Blocked", "Done", None]
+NODE_ID_RE = re.compile(r"(PR|PVTI)_(\d+)$")
+
+
+class SyntheticRepo:
+    """Deterministic synthetic repository of open PRs, issues and project items."""
+
+    def __init__(self, num_prs: int, files_per_pr: int = 5, num_issues: Optional[int] = None):
+        self.num_prs = num_prs
+        self.files_per_pr = files_per_pr
+        self.num_issues = num_prs // 2 if num_issues is None else num_issues
+        self.num_project_items = num_prs
+
+    def pr(self, number: int) -> Dict:
+        labels = []
+        if number % 7 == 0:
+            labels.append({"name": "tier-2"})
+        if number % 11 == 0:
+            labels.append({"name": "documentation"})
+        return {
+            "number": number,
+            "title": f"Synthetic change #{number}",
+            "html_url": f"https://github.com/fake/repo/pull/{number}",
+            "body": "Routine update" if number % 5 else "Risk Tier: T1 critical change",
+            "user": {"login": f"dev{number % 13}"},
+            "created_at": "2026-01-%02dT12:00:00Z" % (1 + number % 28),
+            "updated_at": "2026-01-%02dT13:00:00Z" % (1 + number % 28),
+            "labels": labels,
+            "head": {"sha": self.head_sha(number)},
+        }
+
+    def prs(self) -> List[Dict]:
+        return [self.pr(n) for n in range(self.num_prs, 0, -1)]
+
+    def issues(self) -> List[Dict]:
+        base = self.num_prs + 1
+        return [{
+            "number": base + i,
+            "title": f"Synthetic issue #{base + i}",
+            "html_url": f"https://github.com/fake/repo/issues/{base + i}",
+            "user": {"login": "reporter"},
+            "created_at": "2026-01-15T09:00:00Z",
+            "labels": [],
+        } for i in range(self.num_issues)]
+
+    @staticmethod
+    def head_sha(number: int) -> str:
+        return hashlib.sha1(f"pr-{number}".encode()).hexdigest()
+
+    def number_for_sha(self, sha: str) -> Optional[int]:
+        # Synthetic SHAs are derived from the PR number; invert by search once
+        if not hasattr(self, "_sha_index"):
+            self._sha_index = {self.head_sha(n): n for n in range(1, self.num_prs + 1)}
+        return self._sha_index.get(sha)
+
+    def files(self, number: int) -> List[str]:
+        files = [f"APP/module_{number}/file_{i}.py" for i in range(self.files_per_pr)]
+        if number % 3 == 0:
+            files[-1] = PROTECTED_SAMPLE_FILES[number % len(PROTECTED_SAMPLE_FILES)]
+        return files
+
+    def status(self, number: int) -> Dict:
+        state = STATUS_CYCLE[number % len(STATUS_CYCLE)]
+        return {
+            "state": state,
+            "total_count": 2,
+            "statuses": [{"state": "success"}, {"state": state}],
+        }
+
+    def project_item(self, index: int) -> Dict:
+        number = self.num_prs + 1 + (index % max(self.num_issues, 1))
+        return {
+            "id": f"PVTI_{index}",
+            "updatedAt": "2026-01-20T00:00:00Z",
+            "content": {
+                "number": number,
+                "title": f"Synthetic issue #{number}",
+                "state": "OPEN",
+                "url": f"https://github.com/fake/repo/issues/{number}",
+                "updatedAt": "2026-01-20T00:00:00Z",
+            },
+            "fieldValueByName": {"name": PROJECT_STATUS_CYCLE[index % len(PROJECT_STATUS_CYCLE)]},
+        }
+
+    def graphql_pr(self, number: int) -> Dict:
+        pr = self.pr(number)
+        files = self.files(number)
+        status = self.status(number)
+        return {
+            "id": f"PR_{number}",
+            "number": number,
+            "title": pr["title"],
+            "url": pr["html_url"],
+            "body": pr["body"],
+            "createdAt": pr["created_at"],
+            "updatedAt": pr["updated_at"],
+            "headRefOid": pr["head"]["sha"],
+            "author": pr["user"],
+            "labels": {"nodes": pr["labels"]},
+            "files": {
+                "pageInfo": {"hasNextPage": len(files) > 100, "endCursor": "100" if len(files) > 100 else None},
+                "nodes": [{"path": p} for p in files[:100]],
+            },
+            "commits": {"nodes": [{"commit": {"statusCheckRollup": {
+                "state": status["state"].upper(),
+                "contexts": {
+                    "totalCount": len(status["statuses"]),
+                    "nodes": [{"__typename": "StatusContext", "state": s["state"].upper()} for s in status["statuses"]],
+                },
+            }}}]},
+        }
+
+
+class FakeGitHubServer:
+    """Threaded HTTP server wrapping a SyntheticRepo.
+
+    Use as a context manager; `url` is the API base to point clients at.
+    """
+
+    def __init__(
+        self,
+        repo: SyntheticRepo,
+        latency: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_window: float = 3600.0,
+    ):
+        self.repo = repo
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.rate_limited_count = 0
+        self._charged = 0
+        self._window_start = time.time()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- rate limiting -------------------------------------------------
+
+    def _rate_headers(self) -> Tuple[bool, Dict[str, str]]:
+        """Account for one request; return (allowed, rate-limit headers)."""
+        with self._lock:
+            self.request_count += 1
+            now = time.time()
+            if now - self._window_start >= self.rate_window:
+                self._window_start = now
+                self._charged = 0
+            limit = self.rate_limit if self.rate_limit is not None else 1000000
+            allowed = self._charged < limit
+            if allowed:
+                self._charged += 1
+            else:
+                self.rate_limited_count += 1
+            headers = {
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(max(limit - self._charged, 0)),
+                "X-RateLimit-Reset": str(int(self._window_start + self.rate_window)),
+            }
+        return allowed, headers
+
+    def _uncharge(self):
+        # GitHub does not charge conditional requests answered with 304
+        with self._lock:
+            self._charged = max(self._charged - 1, 0)
+            self.not_modified_count += 1
+
+    # ---- routing -------------------------------------------------------
+
+    def _paginate(self, items: List, query: Dict[str, List[str]], base_path: str) -> Tuple[List, Optional[str]]:
+        per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * per_page
+        chunk = items[start:start + per_page]
+        link = None
+        if start + per_page < len(items):
+            params = {k: v[0] for k, v in query.items()}
+            params["page"] = str(page + 1)
+            qs = "&".join(f"{k}={v}" for k, v in params.items())
+            last = (len(items) + per_page - 1) // per_page
+            link = f'<{self.url}{base_path}?{qs}>; rel="next", <{self.url}{base_path}?page={last}>; rel="last"'
+        return chunk, link
+
+    def route_get(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, object, Optional[str]]:
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "repos":
+            return 404, {"message": "Not Found"}, None
+        rest = parts[3:]
+        if rest == ["pulls"]:
+            return (200,) + self._paginate(self.repo.prs(), query, path)
+        if rest == ["issues"]:
+            return (200,) + self._paginate(self.repo.issues(), query, path)
+        if len(rest) == 3 and rest[0] == "pulls" and rest[2] == "files":
+            files = [{"filename": f} for f in self.repo.files(int(rest[1]))]
+            return (200,) + self._paginate(files, query, path)
+        if len(rest) == 6 and rest[:3] == ["git", "refs", "pull"] and rest[4:] == ["head"]:
+            return 200, {"object": {"sha": self.repo.head_sha(int(rest[3]))}}, None
+        if len(rest) == 3 and rest[0] == "commits" and rest[2] == "status":
+            number = self.repo.number_for_sha(rest[1])
+            if number is None:
+                return 404, {"message": "Not Found"}, None
+            return 200, self.repo.status(number), None
+        return 404, {"message": "Not Found"}, None
+
+    def route_graphql(self, query: str, variables: Dict) -> Dict:
+        if "pullRequests(" in query:
+            numbers = list(range(self.repo.num_prs, 0, -1))
+            return self._graphql_page(numbers, variables, self.repo.graphql_pr, ("repository", "pullRequests"))
+        if "pullRequest(number" in query:
+            files = self.repo.files(int(variables["number"]))
+            start = int(variables.get("cursor") or 0)
+            chunk = files[start:start + 100]
+            more = start + 100 < len(files)
+            return {"data": {"repository": {"pullRequest": {"files": {
+                "pageInfo": {"hasNextPage": more, "endCursor": str(start + 100) if more else None},
+                "nodes": [{"path": p} for p in chunk],
+            }}}}}
+        if "projectV2(" in query:
+            indexes = list(range(self.repo.num_project_items))
+            return self._graphql_page(
+                indexes,
+                variables,
+                lambda i: {k: v for k, v in self.repo.project_item(i).items() if k in ("id", "updatedAt", "content")},
+                ("repository", "projectV2", "items"),
+            )
+        if "nodes(ids" in query:
+            nodes = []
+            for node_id in variables.get("ids", []):
+                match = NODE_ID_RE.match(node_id)
+                if not match:
+                    nodes.append(None)
+                elif match.group(1) == "PR":
+                    nodes.append(self.repo.graphql_pr(int(match.group(2))))
+                else:
+                    nodes.append(self.repo.project_item(int(match.group(2))))
+            return {"data": {"nodes": nodes}}
+        return {"errors": [{"message": "Unsupported query for fake server"}]}
+
+    @staticmethod
+    def _graphql_page(keys: List, variables: Dict, build, path: Tuple[str, ...]) -> Dict:
+        page_size = int(variables.get("pageSize") or 100)
+        start = int(variables.get("cursor") or 0)
+        chunk = keys[start:start + page_size]
+        more = start + page_size < len(keys)
+        connection = {
+            "pageInfo": {"hasNextPage": more, "endCursor": str(start + page_size) if more else None},
+            "nodes": [build(k) for k in chunk],
+        }
+        for key in reversed(path):
+            connection = {key: connection}
+        return {"data": connection}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):  # silence default stderr logging
+                pass
+
+            def _send(self, status: int, body: object, headers: Dict[str, str]):
+                payload = b"" if status == 304 else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if payload:
+                    self.wfile.write(payload)
+
+            def _throttle(self) -> Optional[Dict[str, str]]:
+                if server.latency:
+                    time.sleep(server.latency)
+                allowed, headers = server._rate_headers()
+                if not allowed:
+                    self._send(403, {"message": "API rate limit exceeded"}, headers)
+                    return None
+                return headers
+
+            def do_GET(self):
+                headers = self._throttle()
+                if headers is None:
+                    return
+                parsed = urlparse(self.path)
+                status, body, link = server.route_get(parsed.path, parse_qs(parsed.query))
+                if status == 200:
+                    etag = '"%s"' % hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()
+                    headers["ETag"] = etag
+                    if link:
+                        headers["Link"] = link
+                    if self.headers.get("If-None-Match") == etag:
+                        server._uncharge()
+                        self._send(304, None, headers)
+                        return
+                self._send(status, body, headers)
+
+            def do_POST(self):
+                headers = self._throttle()
+                if headers is None:
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                headers["X-RateLimit-Resource"] = "graphql"
+                self._send(200, server.route_graphql(request.get("query", ""), request.get("variables") or {}), headers)
+
+        return Handler
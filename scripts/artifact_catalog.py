@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Artifact Catalog — persistent SQLite index of COCKPIT/artifacts
+
+Keeps the parsed fields of every TRAE_REVIEW, PLAN, VERIFICATION and
+ROLLBACK artifact in a local SQLite file so consumers query rows instead
+of re-reading and regex-parsing the whole history on every run:
+- TRAE_REVIEW: pr_number, verdict, created_at, BEST_PRACTICE_ALIGNMENT values,
+  schema validation errors
+- PLAN / VERIFICATION / ROLLBACK: pr_number, created_at, PLAN fields present
+
+Refresh is incremental: files whose mtime and size are unchanged are not
+opened; changed files are hashed and only reparsed when the content hash
+moved. Rows for deleted files are dropped. The catalog lives under .cache/
+(gitignored) and is persisted between CI runs by the workflow cache.
+
+Dependencies: Python 3.6+ (sqlite3 from the standard library)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from trae_artifacts import ARTIFACT_NAME_RE, BEST_PRACTICE_FIELDS, CREATED_AT_FORMAT, TraeArtifact, parse_trae_content
+
+SCHEMA_VERSION = 6
+
+# Catalogued artifact kinds → file suffix in COCKPIT/artifacts/<kind>/
+ARTIFACT_KINDS = {
+    "TRAE_REVIEW": ".yml",
+    "PLAN": ".md",
+    "VERIFICATION": ".md",
+    "ROLLBACK": ".md",
+}
+
+# PLAN fields looked for by default (the validator passes its own list)
+PLAN_FIELDS = ["Objective", "Non-Goals", "Files", "Risk Tier", "Rollback"]
+
+_PR_NUMBER_RE = re.compile(r'^pr_number:\s*["\']?(\d+)["\']?', re.MULTILINE)
+_CREATED_AT_RE = re.compile(r'^created_at:\s*["\']?([^"\'\n]+)["\']?', re.MULTILINE)
+
+META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    pr_number INTEGER,
+    verdict TEXT,
+    created_at TEXT,
+    created_sort TEXT NOT NULL DEFAULT '',
+    plan_quality TEXT,
+    change_size TEXT,
+    ownership_clear TEXT,
+    expiry_days INTEGER,
+    plan_fields TEXT,
+    errors TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind_pr ON artifacts (kind, pr_number, created_sort, path);
+"""
+
+
+def find_plan_fields(content: str, fields: Iterable[str] = PLAN_FIELDS) -> List[str]:
+    """Return the PLAN fields present as headings, bold labels or list items."""
+    content_lower = content.lower()
+    found = []
+    for field in fields:
+        name = re.escape(field.lower())
+        heading_patterns = [
+            rf"^#+\s+{name}",  # ## Objective
+            r"^\*{1,2}" + name + r"\*{0,2}:",  # **Objective:** or *Objective:*
+            rf"^\s*-\s+{name}",  # - Objective
+        ]
+        if any(re.search(pattern, content_lower, re.MULTILINE) for pattern in heading_patterns):
+            found.append(field)
+    return found
+
+
+def _created_sort(created_at: Optional[str]) -> str:
+    """Sortable form of created_at; '' (sorts first) when unparseable."""
+    try:
+        return datetime.strptime(created_at or "", CREATED_AT_FORMAT).strftime("%Y-%m-%d %H:%M")
+    except ValueError:
+        return ""
+
+
+class ArtifactCatalog:
+    """SQLite-backed catalog of artifacts under one artifacts root."""
+
+    def __init__(self, artifacts_root: Path, db_path: Path, plan_fields: Iterable[str] = PLAN_FIELDS):
+        self.artifacts_root = Path(artifacts_root)
+        self.db_path = Path(db_path)
+        self.plan_fields = list(plan_fields)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Parser identity; stored rows are discarded when it changes."""
+        return f"{SCHEMA_VERSION}:{','.join(self.plan_fields)}"
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(META_SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+            stale = row is None or row["value"] != self.fingerprint
+            if stale:
+                # Recreate rather than empty the table: columns may have changed
+                conn.executescript("DROP TABLE IF EXISTS artifacts;")
+            conn.executescript(SCHEMA)
+            if stale:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                        (self.fingerprint,),
+                    )
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _parse(self, kind: str, name: str, path: Path, content: str) -> Dict:
+        if kind == "TRAE_REVIEW":
+            review = parse_trae_content(content, path)
+            fields = {slot: getattr(review, slot) for slot in TraeArtifact.__slots__}
+            name_match = ARTIFACT_NAME_RE.match(name)
+            if name_match:
+                # Artifacts are filed under the PR number in their name
+                fields["pr_number"] = int(name_match.group(1))
+            fields["plan_fields"] = None
+            fields["errors"] = list(review.errors)
+            return fields
+
+        pr_match = _PR_NUMBER_RE.search(content)
+        created_match = _CREATED_AT_RE.search(content)
+        return {
+            "pr_number": int(pr_match.group(1)) if pr_match else None,
+            "verdict": None,
+            "created_at": created_match.group(1).strip() if created_match else None,
+            "plan_quality": None,
+            "change_size": None,
+            "ownership_clear": None,
+            "expiry_days": None,
+            "plan_fields": find_plan_fields(content, self.plan_fields) if kind == "PLAN" else None,
+            "errors": None,
+        }
+
+    def refresh(self, kinds: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Bring the catalog in line with the files on disk.
+
+        Returns counts of files seen, reparsed, and rows removed.
+        """
+        kinds = list(kinds) if kinds is not None else list(ARTIFACT_KINDS)
+        stats = {"seen": 0, "parsed": 0, "removed": 0}
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for kind in kinds:
+                    self._refresh_kind(conn, kind, stats)
+        return stats
+
+    def _refresh_kind(self, conn: sqlite3.Connection, kind: str, stats: Dict[str, int]):
+        known = {
+            row["path"]: row
+            for row in conn.execute("SELECT path, mtime_ns, size, sha256 FROM artifacts WHERE kind = ?", (kind,))
+        }
+        directory = self.artifacts_root / kind
+        seen = set()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+
+        for entry in entries:
+            if not entry.name.endswith(ARTIFACT_KINDS[kind]) or not entry.is_file():
+                continue
+            if kind == "TRAE_REVIEW" and not ARTIFACT_NAME_RE.match(entry.name):
+                continue
+            rel_path = f"{kind}/{entry.name}"
+            seen.add(rel_path)
+            stats["seen"] += 1
+            stat = entry.stat()
+            row = known.get(rel_path)
+            if row is not None and row["mtime_ns"] == stat.st_mtime_ns and row["size"] == stat.st_size:
+                continue
+
+            try:
+                with open(entry.path, "rb") as f:
+                    raw = f.read()
+            except OSError:
+                continue
+            digest = hashlib.sha256(raw).hexdigest()
+            if row is not None and row["sha256"] == digest:
+                conn.execute(
+                    "UPDATE artifacts SET mtime_ns = ?, size = ? WHERE path = ?",
+                    (stat.st_mtime_ns, stat.st_size, rel_path),
+                )
+                continue
+
+            fields = self._parse(kind, entry.name, Path(entry.path), raw.decode("utf-8", errors="replace"))
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts (path, kind, mtime_ns, size, sha256, pr_number, verdict, "
+                "created_at, created_sort, plan_quality, change_size, ownership_clear, expiry_days, plan_fields, errors) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    rel_path,
+                    kind,
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    digest,
+                    fields["pr_number"],
+                    fields["verdict"],
+                    fields["created_at"],
+                    _created_sort(fields["created_at"]),
+                    fields["plan_quality"],
+                    fields["change_size"],
+                    fields["ownership_clear"],
+                    fields["expiry_days"],
+                    json.dumps(fields["plan_fields"]) if fields["plan_fields"] is not None else None,
+                    json.dumps(fields["errors"]) if fields["errors"] is not None else None,
+                ),
+            )
+            stats["parsed"] += 1
+
+        for rel_path in set(known) - seen:
+            conn.execute("DELETE FROM artifacts WHERE path = ?", (rel_path,))
+            stats["removed"] += 1
+
+    def _row_to_artifact(self, row: sqlite3.Row) -> Dict:
+        return {
+            "kind": row["kind"],
+            "pr_number": row["pr_number"],
+            "verdict": row["verdict"],
+            "created_at": row["created_at"],
+            "file_path": self.artifacts_root / row["path"],
+            "plan_quality": row["plan_quality"],
+            "change_size": row["change_size"],
+            "ownership_clear": row["ownership_clear"],
+            "expiry_days": row["expiry_days"],
+            "plan_fields": json.loads(row["plan_fields"]) if row["plan_fields"] is not None else None,
+            "errors": json.loads(row["errors"]) if row["errors"] is not None else None,
+        }
+
+    def artifacts(self, kind: str, pr_number: Optional[int] = None) -> List[Dict]:
+        """Catalogued artifacts of one kind, ordered by PR then created_at."""
+        query = "SELECT * FROM artifacts WHERE kind = ?"
+        params: list = [kind]
+        if pr_number is not None:
+            query += " AND pr_number = ?"
+            params.append(int(pr_number))
+        query += " ORDER BY pr_number, created_sort, path"
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+        return [self._row_to_artifact(row) for row in rows]
+
+    def trae_reviews(self, pr_number: Optional[int] = None) -> List[TraeArtifact]:
+        """TRAE_REVIEW records, ordered by PR then created_at."""
+        query = "SELECT * FROM artifacts WHERE kind = 'TRAE_REVIEW'"
+        params: list = []
+        if pr_number is not None:
+            query += " AND pr_number = ?"
+            params.append(int(pr_number))
+        query += " ORDER BY pr_number, created_sort, path"
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+        return [
+            TraeArtifact(
+                self.artifacts_root / row["path"],
+                pr_number=row["pr_number"],
+                verdict=row["verdict"],
+                created_at=row["created_at"],
+                expiry_days=row["expiry_days"],
+                errors=json.loads(row["errors"] or "[]"),
+                **{field: row[field] for field in BEST_PRACTICE_FIELDS},
+            )
+            for row in rows
+        ]
+
+    def get(self, path: Union[str, Path]) -> Optional[Dict]:
+        """Catalogued artifact at a path (absolute, or relative to the repo or artifacts root)."""
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.artifacts_root)
+            except ValueError:
+                return None
+        elif path.parts[:2] == self.artifacts_root.parts[-2:]:
+            # Repo-relative reference such as COCKPIT/artifacts/PLAN/x.md
+            path = Path(*path.parts[2:])
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM artifacts WHERE path = ?", (path.as_posix(),)).fetchone()
+        return self._row_to_artifact(row) if row is not None else None
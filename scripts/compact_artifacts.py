@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Artifact Compaction — monthly archives for DAILY_BRIEF and APPROVALS_QUEUE history
+
+A brief and an approvals queue are written every day, so the working tree
+grows by two files per day forever. This command keeps only recent ones as
+loose files:
+- compact: roll artifacts older than N days (by the date in their file name)
+  into one deflate-compressed zip per kind and month under ARCHIVE/
+- list: show archived artifacts from the lookup index (ARCHIVE/index.json)
+- extract: read a single archived artifact back on demand
+
+Archives are rewritten atomically and source files are only deleted once the
+archive and index are on disk, so an interrupted run loses nothing.
+
+Usage:
+    python scripts/compact_artifacts.py compact --days 30
+    python scripts/compact_artifacts.py list --kind DAILY_BRIEF
+    python scripts/compact_artifacts.py extract BRIEF-20260126.md [--output DIR]
+
+Dependencies: Python 3.7+
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Configuration
+REPO_ROOT = Path(os.getenv("GITHUB_WORKSPACE", Path(__file__).parent.parent))
+ARTIFACTS_DIR = REPO_ROOT / "COCKPIT" / "artifacts"
+ARCHIVE_DIRNAME = "ARCHIVE"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+# Keep this many days of loose artifacts
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+
+# Archivable kinds → file name pattern (the date is the first group)
+ARCHIVABLE_KINDS = {
+    "DAILY_BRIEF": re.compile(r"^BRIEF-(\d{8})\.md$"),
+    "APPROVALS_QUEUE": re.compile(r"^APPROVALS-(\d{8})\.md$"),
+}
+
+
+def log(message: str, level: str = "INFO"):
+    print(f"[{level}] {message}", file=sys.stderr)
+
+
+def archive_dir_for(artifacts_dir: Path) -> Path:
+    return Path(artifacts_dir) / ARCHIVE_DIRNAME
+
+
+def archive_name(kind: str, date: datetime) -> str:
+    return f"{kind}-{date:%Y-%m}.zip"
+
+
+def _artifact_kind(name: str) -> Optional[Tuple[str, datetime]]:
+    """(kind, date) for an archivable file name, or None."""
+    for kind, pattern in ARCHIVABLE_KINDS.items():
+        match = pattern.match(name)
+        if match:
+            try:
+                return kind, datetime.strptime(match.group(1), "%Y%m%d")
+            except ValueError:
+                return None
+    return None
+
+
+def find_candidates(artifacts_dir: Path, cutoff: datetime) -> Dict[str, List[Tuple[datetime, Path]]]:
+    """Loose artifacts dated before `cutoff`, grouped by target archive name."""
+    groups: Dict[str, List[Tuple[datetime, Path]]] = {}
+    for kind in ARCHIVABLE_KINDS:
+        try:
+            entries = list(os.scandir(Path(artifacts_dir) / kind))
+        except OSError:
+            continue
+        for entry in entries:
+            parsed = _artifact_kind(entry.name)
+            if parsed is None or parsed[0] != kind or not entry.is_file():
+                continue
+            date = parsed[1]
+            if date < cutoff:
+                groups.setdefault(archive_name(kind, date), []).append((date, Path(entry.path)))
+    for members in groups.values():
+        members.sort()
+    return groups
+
+
+def load_index(archive_dir: Path) -> Dict[str, Dict]:
+    """Archived artifact name → {kind, archive, date, size, sha256} ({} if missing)."""
+    try:
+        with open(Path(archive_dir) / INDEX_NAME) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return {}
+    return index.get("artifacts") or {}
+
+
+def save_index(archive_dir: Path, artifacts: Dict[str, Dict]):
+    """Write the lookup index (atomic replace, stable key order)."""
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(archive_dir), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump({"version": INDEX_VERSION, "artifacts": artifacts}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, str(archive_dir / INDEX_NAME))
+
+
+def rebuild_index(archive_dir: Path) -> Dict[str, Dict]:
+    """Recreate the lookup index by reading every archive's members."""
+    artifacts = {}
+    for archive_path in sorted(Path(archive_dir).glob("*.zip")):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                parsed = _artifact_kind(info.filename)
+                if parsed is None:
+                    continue
+                artifacts[info.filename] = {
+                    "kind": parsed[0],
+                    "archive": archive_path.name,
+                    "date": f"{parsed[1]:%Y-%m-%d}",
+                    "size": info.file_size,
+                    "sha256": hashlib.sha256(archive.read(info)).hexdigest(),
+                }
+    return artifacts
+
+
+def _zip_info(name: str, date: datetime) -> zipfile.ZipInfo:
+    # Fixed timestamp and mode: identical input produces identical archives
+    info = zipfile.ZipInfo(name, date_time=(date.year, date.month, date.day, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _append_to_archive(
+    archive_path: Path, members: List[Tuple[datetime, Path]], index: Dict[str, Dict]
+) -> List[Path]:
+    """Add members to one monthly archive; returns source files now safe to delete."""
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(archive_path.parent), suffix=".zip.tmp")
+    os.close(fd)
+    archived = []
+    try:
+        if archive_path.exists():
+            shutil.copyfile(archive_path, tmp_path)
+            mode = "a"
+        else:
+            mode = "w"
+        with zipfile.ZipFile(tmp_path, mode, compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+            present = set(archive.namelist())
+            for date, path in members:
+                raw = path.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                if path.name in present:
+                    existing = index.get(path.name) or {}
+                    if existing.get("sha256") != digest:
+                        existing_digest = hashlib.sha256(archive.read(path.name)).hexdigest()
+                        if existing_digest != digest:
+                            log(f"{path.name} differs from the archived copy; left in place", "WARN")
+                            continue
+                else:
+                    archive.writestr(_zip_info(path.name, date), raw)
+                index[path.name] = {
+                    "kind": _artifact_kind(path.name)[0],
+                    "archive": archive_path.name,
+                    "date": f"{date:%Y-%m-%d}",
+                    "size": len(raw),
+                    "sha256": digest,
+                }
+                archived.append(path)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, str(archive_path))
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return archived
+
+
+def compact(
+    artifacts_dir: Path = ARTIFACTS_DIR,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    today: Optional[datetime] = None,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Roll artifacts older than `older_than_days` into monthly archives.
+
+    Returns counts of files archived, archives written and bytes freed.
+    """
+    today = today or datetime.utcnow()
+    cutoff = datetime(today.year, today.month, today.day) - timedelta(days=older_than_days)
+    archive_dir = archive_dir_for(artifacts_dir)
+    groups = find_candidates(artifacts_dir, cutoff)
+    stats = {"archived": 0, "archives": 0, "bytes": 0}
+    if dry_run:
+        for name, members in sorted(groups.items()):
+            log(f"Would archive {len(members)} file(s) into {name}")
+            stats["archived"] += len(members)
+            stats["bytes"] += sum(path.stat().st_size for _, path in members)
+        stats["archives"] = len(groups)
+        return stats
+    if not groups:
+        return stats
+
+    index = load_index(archive_dir)
+    if not index and any(archive_dir.glob("*.zip")):
+        index = rebuild_index(archive_dir)
+    to_delete = []
+    for name, members in sorted(groups.items()):
+        archived = _append_to_archive(archive_dir / name, members, index)
+        to_delete.extend(archived)
+        stats["archives"] += 1
+        log(f"Archived {len(archived)} file(s) into {name}")
+    save_index(archive_dir, index)
+
+    # Sources go only after the archives and index are durable
+    for path in to_delete:
+        stats["bytes"] += path.stat().st_size
+        path.unlink()
+        stats["archived"] += 1
+    return stats
+
+
+def list_archived(artifacts_dir: Path = ARTIFACTS_DIR, kind: Optional[str] = None) -> List[Tuple[str, Dict]]:
+    """Archived artifacts (name, entry) in date order, optionally for one kind."""
+    index = load_index(archive_dir_for(artifacts_dir))
+    entries = [(name, entry) for name, entry in index.items() if kind is None or entry.get("kind") == kind]
+    return sorted(entries, key=lambda item: (item[1].get("date", ""), item[0]))
+
+
+def read_archived(name: str, artifacts_dir: Path = ARTIFACTS_DIR) -> Optional[bytes]:
+    """Content of one archived artifact, or None when it is not archived.
+
+    Uses the index to open only the archive holding the file; falls back to the
+    monthly archive named after the file's date when the index is missing.
+    """
+    archive_dir = archive_dir_for(artifacts_dir)
+    entry = load_index(archive_dir).get(name)
+    if entry is not None:
+        archive_path = archive_dir / entry["archive"]
+    else:
+        parsed = _artifact_kind(name)
+        if parsed is None:
+            return None
+        archive_path = archive_dir / archive_name(*parsed)
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            return archive.read(name)
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact DAILY_BRIEF / APPROVALS_QUEUE history into monthly archives")
+    parser.add_argument("--artifacts-dir", type=Path, default=ARTIFACTS_DIR, help="COCKPIT artifacts directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact_cmd = commands.add_parser("compact", help="Archive artifacts older than N days")
+    compact_cmd.add_argument(
+        "--days", type=int, default=ARCHIVE_AFTER_DAYS, help=f"Keep this many days loose (default: {ARCHIVE_AFTER_DAYS})"
+    )
+    compact_cmd.add_argument("--dry-run", action="store_true", help="Report what would be archived")
+
+    list_cmd = commands.add_parser("list", help="List archived artifacts")
+    list_cmd.add_argument("--kind", choices=sorted(ARCHIVABLE_KINDS), help="Only this artifact kind")
+
+    extract_cmd = commands.add_parser("extract", help="Extract one archived artifact")
+    extract_cmd.add_argument("name", help="File name, e.g. BRIEF-20260126.md")
+    extract_cmd.add_argument("--output", type=Path, help="Write into this directory instead of stdout")
+
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        stats = compact(args.artifacts_dir, args.days, dry_run=args.dry_run)
+        verb = "Would archive" if args.dry_run else "Archived"
+        log(f"{verb} {stats['archived']} file(s) into {stats['archives']} archive(s), {stats['bytes']} bytes")
+    elif args.command == "list":
+        for name, entry in list_archived(args.artifacts_dir, args.kind):
+            print(f"{entry.get('date', '?')}  {name:<24} {entry.get('archive', '?')}")
+    else:
+        content = read_archived(args.name, args.artifacts_dir)
+        if content is None:
+            log(f"{args.name} not found in archives", "ERROR")
+            sys.exit(1)
+        if args.output:
+            args.output.mkdir(parents=True, exist_ok=True)
+            (args.output / args.name).write_bytes(content)
+            log(f"Extracted {args.name} to {args.output / args.name}")
+        else:
+            sys.stdout.buffer.write(content)
+
+
+if __name__ == "__main__":
+    main()
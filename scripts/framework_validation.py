@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Framework Validation — per-file Markdown and YAML checks with a content-hash cache
+
+Framework-only mode validates documentation and workflow files. Checks run on
+individual files, so their cost follows the files handed in:
+- On PRs the validator passes only changed `.md` / `.yml` / `.yaml` files
+- Full-tree mode walks the repository with os.scandir, skipping VCS, cache
+  and vendored directories, and reads files on a thread pool
+- Results are cached by content hash (.cache/framework_validation.json), so
+  a file is never re-validated until its content or the checks change; the
+  cache keeps the CACHE_MAX_ENTRIES most recently used results (full-tree
+  runs keep exactly the current tree's)
+- YAML is parsed for real by yaml_validation (workflow structure and the
+  TRAE_REVIEW schema included); errors read `file:line:column: problem`
+
+Dependencies: Python 3.7+
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from yaml_validation import check_yaml_file, yaml as _yaml, yaml_kind
+
+# Bump when a check changes so cached results are recomputed; results from
+# the tab heuristic (no PyYAML) are kept apart from real parses
+CACHE_VERSION = 3 if _yaml is not None else "3-noyaml"
+
+# Results kept by the cache, least recently used dropped first
+CACHE_MAX_ENTRIES = int(os.getenv("FRAMEWORK_VALIDATION_CACHE_MAX_ENTRIES", "2000"))
+
+# Directories never validated in full-tree mode
+IGNORED_DIRS = {
+    ".git", ".cache", ".venv", "venv", "node_modules", "vendor", "__pycache__",
+    ".pytest_cache", ".mypy_cache", ".ruff_cache", ".tox", ".nox",
+}
+
+_HEADING_RE = re.compile(rb"^#{1,3}\s+", re.MULTILINE)
+
+
+def check_markdown(path: str, content: bytes) -> Dict:
+    """Markdown must be text; headings are recorded for the structure check."""
+    errors = []
+    if b"\x00" in content:
+        errors.append("binary content in Markdown file")
+    return {"errors": errors, "heading": _HEADING_RE.search(content) is not None}
+
+
+# File suffix → check(path, content)
+CHECKS: Dict[str, Callable[[str, bytes], Dict]] = {
+    ".md": check_markdown,
+    ".yml": check_yaml_file,
+    ".yaml": check_yaml_file,
+}
+
+YAML_KINDS = ("yaml", "workflow", "trae_review", "trae_other")
+
+
+def file_kind(path: str) -> str:
+    """Result kind: "markdown", or the YAML kind from yaml_validation."""
+    return "markdown" if path.lower().endswith(".md") else yaml_kind(path)
+
+
+class FileResult(NamedTuple):
+    path: str
+    kind: str
+    key: str
+    errors: List[str]
+    heading: bool
+    cached: bool
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def messages(self) -> List[str]:
+        """Errors as `file:line:column: problem` (or `file: problem`)."""
+        return [f"{self.path}:{e}" if e[:1].isdigit() else f"{self.path}: {e}" for e in self.errors]
+
+
+class ValidationCache:
+    """Check results keyed by kind and SHA-256 of the file content.
+
+    Entries are kept in least- to most-recently-used order, so save() can
+    trim the oldest once there are more than CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        if self.path is None:
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self.entries = data.get("entries") or {}
+
+    def get(self, key: str) -> Optional[Dict]:
+        result = self.entries.pop(key, None)
+        if result is not None:
+            self.entries[key] = result
+        return result
+
+    def put(self, key: str, result: Dict):
+        self.entries[key] = result
+        self.dirty = True
+
+    def save(self, keep: Optional[Iterable[str]] = None):
+        """Write the cache atomically; `keep` prunes entries to those keys."""
+        if self.path is None or not self.dirty:
+            return
+        if keep is not None:
+            keep = set(keep)
+            self.entries = {key: value for key, value in self.entries.items() if key in keep}
+        if len(self.entries) > CACHE_MAX_ENTRIES:
+            keys = list(self.entries)
+            self.entries = {key: self.entries[key] for key in keys[len(keys) - CACHE_MAX_ENTRIES:]}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                # Not sorted: key order is the recency order
+                json.dump({"version": CACHE_VERSION, "entries": self.entries}, f)
+            os.replace(tmp_path, str(self.path))
+            self.dirty = False
+        except OSError:
+            pass
+
+
+def is_checked(path) -> bool:
+    return Path(path).suffix.lower() in CHECKS
+
+
+def iter_tree_files(root: Path, ignored: Iterable[str] = IGNORED_DIRS) -> Iterator[str]:
+    """Repo-relative paths of checkable files, skipping ignored directories."""
+    root = Path(root)
+    ignored = set(ignored)
+    stack = [""]
+    while stack:
+        relative = stack.pop()
+        try:
+            entries = list(os.scandir(root / relative if relative else root))
+        except OSError:
+            continue
+        for entry in sorted(entries, key=lambda e: e.name):
+            path = f"{relative}/{entry.name}" if relative else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in ignored and not entry.name.endswith(".egg-info"):
+                    stack.append(path)
+            elif entry.is_file() and is_checked(entry.name):
+                yield path
+
+
+def _check_file(root: Path, path: str, cache: ValidationCache) -> Optional[FileResult]:
+    check = CHECKS[Path(path).suffix.lower()]
+    kind = file_kind(path)
+    try:
+        content = (root / path).read_bytes()
+    except OSError:
+        return None  # Deleted or unreadable: nothing to validate
+    key = f"{kind}:{hashlib.sha256(content).hexdigest()}"
+    result = cache.get(key)
+    cached = result is not None
+    if not cached:
+        result = check(path, content)
+        cache.put(key, result)
+    return FileResult(path, kind, key, list(result["errors"]), bool(result.get("heading")), cached)
+
+
+def validate_files(
+    root: Path,
+    paths: Iterable,
+    cache: Optional[ValidationCache] = None,
+    jobs: Optional[int] = None,
+) -> List[FileResult]:
+    """Check files (repo-relative paths) in parallel; results in input order."""
+    root = Path(root)
+    cache = cache or ValidationCache(None)
+    paths = [Path(p).as_posix() for p in paths if is_checked(p)]
+    if not paths:
+        return []
+    workers = jobs or min(32, (os.cpu_count() or 1) + 4)
+    if workers == 1 or len(paths) == 1:
+        results = [_check_file(root, path, cache) for path in paths]
+    else:
+        # Reads and hashing release the GIL; the cache dict is only touched
+        # with single-key operations
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda path: _check_file(root, path, cache), paths))
+    return [result for result in results if result is not None]
+
+
+def summarize(results: List[FileResult], full_tree: bool = True) -> Dict[str, bool]:
+    """Framework check name → passed, over a set of file results.
+
+    Documentation Structure (some document has headings) describes the whole
+    tree, so it is only judged in full-tree mode.
+    """
+    markdown = [r for r in results if r.kind == "markdown"]
+    return {
+        "YAML Syntax": all(r.ok for r in results if r.kind in YAML_KINDS),
+        "Markdown Valid": all(r.ok for r in markdown),
+        "Documentation Structure": not full_tree or not markdown or any(r.heading for r in markdown),
+    }
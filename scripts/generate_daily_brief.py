@@ -11,18 +11,40 @@ Dependencies: Python 3.6+, requests (installed in GitHub Actions)
 
 import os
 import sys
-import re
 import json
 import subprocess
+import tempfile
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Iterable, Iterator, List, Dict, NamedTuple, Optional, Tuple
+
+from github_client import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_POOL_SIZE,
+    GitHubClient,
+    RateLimitScheduler,
+    RecordingSession,
+    ReplaySession,
+    ResponseCache,
+    create_pooled_session,
+    map_concurrent,
+)
+import github_graphql
+from artifact_catalog import ArtifactCatalog
+from path_policy import PROTECTED_PATHS, PROTECTED_POLICY  # noqa: F401 (PROTECTED_PATHS re-exported)
+from trae_artifacts import (
+    DEFAULT_EXPIRY_DAYS,
+    ReviewExpiryIndex,
+    TraeArtifact,
+    TraeArtifactIndex,
+    TraeArtifactLoader,
+)
 
 # Configuration
 REPO_ROOT = Path(os.getenv("GITHUB_WORKSPACE", Path(__file__).parent.parent))
 REPO_OWNER = os.getenv("GITHUB_REPOSITORY_OWNER", "ranjan-expatready")
 REPO_NAME = os.getenv("GITHUB_REPOSITORY_NAME", "autonomous-engineering-os")
-GITHUB_API_URL = "https://api.github.com"
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 
 # Project configuration - will be queried from environment or hardcoded
@@ -30,19 +52,63 @@ GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 SDLC_PROJECT_ID = os.getenv("GITHUB_PROJECT_ID", "")
 SDLC_PROJECT_NUMBER = os.getenv("GITHUB_PROJECT_NUMBER", "2")
 
-# Trae artifact directory
-TRAE_ARTIFACT_DIR = REPO_ROOT / "COCKPIT" / "artifacts" / "TRAE_REVIEW"
-
 # Output directories
 ARTIFACTS_DIR = REPO_ROOT / "COCKPIT" / "artifacts"
 DAILY_BRIEF_DIR = ARTIFACTS_DIR / "DAILY_BRIEF"
 APPROVALS_QUEUE_DIR = ARTIFACTS_DIR / "APPROVALS_QUEUE"
 
+# Persistent catalog of parsed artifacts (shared with the governance validator)
+ARTIFACT_CATALOG_PATH = Path(os.getenv("ARTIFACT_CATALOG_PATH", REPO_ROOT / ".cache" / "artifact_catalog.sqlite3"))
+
+# Parsed Trae artifacts keyed by content hash (used when the catalog is unavailable)
+TRAE_PARSE_CACHE_PATH = Path(os.getenv("TRAE_PARSE_CACHE_PATH", REPO_ROOT / ".cache" / "trae_artifacts.marshal"))
+
+# Warn about approved Trae reviews that lapse within this many days
+TRAE_EXPIRY_WARNING_DAYS = int(os.getenv("TRAE_EXPIRY_WARNING_DAYS", "2"))
+
+# Trae artifact directory (indexed once, rescanned only when it changes)
+TRAE_ARTIFACT_DIR = ARTIFACTS_DIR / "TRAE_REVIEW"
+_trae_index = TraeArtifactIndex(
+    TRAE_ARTIFACT_DIR,
+    catalog=ArtifactCatalog(ARTIFACTS_DIR, ARTIFACT_CATALOG_PATH),
+    loader=TraeArtifactLoader(TRAE_PARSE_CACHE_PATH),
+)
+
+# Conditional-request cache for GitHub GET responses (persisted between runs)
+GITHUB_CACHE_DIR = Path(os.getenv("GITHUB_CACHE_DIR", REPO_ROOT / ".cache" / "github"))
+
+# Local snapshot of SDLC project items for incremental sync
+PROJECT_ITEMS_SNAPSHOT = GITHUB_CACHE_DIR / "project_items.json"
+
+# Per-PR state from the previous run (reused for PRs that have not moved)
+BRIEF_STATE_PATH = GITHUB_CACHE_DIR / "brief_state.json"
+
+# Maximum number of per-PR GitHub requests in flight at once
+GITHUB_CONCURRENCY = int(os.getenv("GITHUB_CONCURRENCY", str(DEFAULT_CONCURRENCY)))
+
+# Optional cap on GitHub API calls per run (the token is shared with other automation)
+GITHUB_API_BUDGET = int(os.getenv("GITHUB_API_BUDGET", "0")) or None
+
+# PR data backend: "rest" (1 + per-PR calls) or "graphql" (one batched query per page)
+BRIEF_BACKENDS = ["rest", "graphql"]
+BRIEF_BACKEND = os.getenv("BRIEF_BACKEND", "rest")
+
 # Protected paths and risk tiers
-PROTECTED_PATHS = ["GOVERNANCE", "AGENTS", "COCKPIT", ".github/workflows", "STATE"]
 RISK_TIERS = ["T1", "T2", "T3", "T4"]
 
 
+# Frozen "now" used when replaying a recorded archive (keeps output deterministic)
+_now_override: Optional[datetime] = None
+
+# Timestamp format shared by briefs, Trae artifacts and replay archives
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M UTC"
+
+
+def utc_now() -> datetime:
+    """Current UTC time, or the capture time of the archive being replayed."""
+    return _now_override or datetime.utcnow()
+
+
 def log(message: str, level: str = "INFO"):
     """Safe logging that only logs metadata."""
     print(f"[{level}] {message}")
@@ -60,56 +126,151 @@ def get_github_headers() -> Dict[str, str]:
     }
 
 
+_github_client: Optional[GitHubClient] = None
+_replaying = False
+
+
+def get_github_client() -> GitHubClient:
+    """Get the shared pooled GitHub client for this run."""
+    global _github_client
+    if _github_client is None:
+        _github_client = GitHubClient(
+            GITHUB_API_URL,
+            get_github_headers(),
+            cache=ResponseCache(GITHUB_CACHE_DIR),
+            pool_size=max(GITHUB_CONCURRENCY, DEFAULT_POOL_SIZE),
+            scheduler=RateLimitScheduler(budget=GITHUB_API_BUDGET),
+        )
+    return _github_client
+
+
+def configure_github_client(record_path: Optional[Path] = None, replay_path: Optional[Path] = None):
+    """Set up the shared client for recording or offline replay.
+
+    Both modes bypass the conditional-request cache so that archives hold
+    full responses and replays never depend on local cache state.
+    """
+    global _github_client, _replaying, _now_override
+    pool_size = max(GITHUB_CONCURRENCY, DEFAULT_POOL_SIZE)
+
+    if replay_path:
+        session = ReplaySession(replay_path)
+        if session.captured_at:
+            _now_override = datetime.strptime(session.captured_at, TIMESTAMP_FORMAT)
+        _replaying = True
+        _github_client = GitHubClient(
+            GITHUB_API_URL,
+            {"Accept": "application/vnd.github+json"},
+            session=session,
+            scheduler=RateLimitScheduler(budget=GITHUB_API_BUDGET, sleep=lambda _: None),
+        )
+        log(f"Replaying GitHub API traffic from {replay_path} (captured {session.captured_at})")
+    elif record_path:
+        session = RecordingSession(
+            create_pooled_session(pool_size),
+            record_path,
+            utc_now().strftime(TIMESTAMP_FORMAT),
+        )
+        _github_client = GitHubClient(
+            GITHUB_API_URL,
+            get_github_headers(),
+            session=session,
+            pool_size=pool_size,
+            scheduler=RateLimitScheduler(budget=GITHUB_API_BUDGET),
+        )
+        log(f"Recording GitHub API traffic to {record_path}")
+
+
+def has_github_access() -> bool:
+    """True when authenticated calls (GraphQL, projects) can be made."""
+    return bool(GITHUB_TOKEN) or _replaying
+
+
 def github_api_get(endpoint: str) -> Optional[Dict]:
     """Make a GET request to GitHub API."""
-    url = f"{GITHUB_API_URL}{endpoint}"
     try:
-        import requests
-        response = requests.get(url, headers=get_github_headers(), timeout=30)
-        response.raise_for_status()
-        return response.json()
+        return get_github_client().get(endpoint)
     except Exception as e:
         log(f"GitHub API error: {e}", "ERROR")
         return None
 
 
+def github_api_paginate(endpoint: str, limit: Optional[int] = None) -> Iterator[Any]:
+    """Stream items from a paginated GitHub list endpoint.
+
+    Errors are logged and end the stream, mirroring github_api_get.
+    """
+    try:
+        for item in get_github_client().paginate(endpoint, limit):
+            yield item
+    except Exception as e:
+        log(f"GitHub API error: {e}", "ERROR")
+
+
+def iter_pull_requests(limit: Optional[int] = None) -> Iterator[Dict]:
+    """Stream open pull requests across all pages."""
+    endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/pulls?state=open&sort=created&direction=desc&per_page=100"
+    return github_api_paginate(endpoint, limit)
+
+
+def iter_open_issues(limit: Optional[int] = None) -> Iterator[Dict]:
+    """Stream open issues across all pages."""
+    endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/issues?state=open&sort=created&direction=desc&per_page=100"
+    return github_api_paginate(endpoint, limit)
+
+
 def get_pull_requests() -> List[Dict]:
     """Get open pull requests."""
-    endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/pulls?state=open&sort=created&direction=desc&per_page=100"
-    data = github_api_get(endpoint)
-    return data if isinstance(data, list) else []
+    return list(iter_pull_requests())
 
 
 def get_open_issues() -> List[Dict]:
     """Get open issues."""
-    endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/issues?state=open&sort=created&direction=desc&per_page=100"
-    data = github_api_get(endpoint)
-    return data if isinstance(data, list) else []
+    return list(iter_open_issues())
 
 
-def get_pr_checks_status(pr_number: int) -> Tuple[bool, str]:
-    """Get CI checks status for a PR."""
-    # Get combined status
-    endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/commits"
-    data = github_api_get(endpoint)
-    if not data:
-        return False, "Unknown"
+def _format_checks_status(
+    state: str, total_count: int, passed: int, failed: int, pending: int
+) -> Tuple[bool, str, bool]:
+    """Format CI check counts into (is_passing, status string, is_final).
 
-    # Find the PR HEAD commit
-    pr_ref_endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/git/refs/pull/{pr_number}/head"
-    pr_ref_data = github_api_get(pr_ref_endpoint)
-    if not pr_ref_data:
-        return False, "No ref"
+    `is_final` is True once every check has concluded; only final results
+    are reused by later runs, since statuses change without the PR moving.
+    """
+    is_passing = state == "success" and failed == 0
+    is_final = state in ("success", "failure", "error") and pending == 0
+    status_str = f"✅ PASS (total: {total_count}, passed: {passed}"
+    if failed > 0:
+        status_str += f", ❌ failed: {failed}"
+    if pending > 0:
+        status_str += f", ⏳ pending: {pending}"
+    status_str += ")"
+
+    return is_passing, status_str, is_final
+
+
+def get_pr_checks_status(pr_number: int, head_sha: Optional[str] = None) -> Tuple[bool, str, bool]:
+    """Get CI checks status for a PR.
 
-    sha = pr_ref_data.get("object", {}).get("sha", "")
+    Pass the PR's `head.sha` (present in the pulls listing) to skip the ref lookup.
+    """
+    sha = head_sha
     if not sha:
-        return False, "No SHA"
+        # Find the PR HEAD commit
+        pr_ref_endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/git/refs/pull/{pr_number}/head"
+        pr_ref_data = github_api_get(pr_ref_endpoint)
+        if not pr_ref_data:
+            return False, "No ref", False
+
+        sha = pr_ref_data.get("object", {}).get("sha", "")
+        if not sha:
+            return False, "No SHA", False
 
-    # Get status for the commit
+    # Get combined status for the commit
     status_endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/commits/{sha}/status"
     status_data = github_api_get(status_endpoint)
     if not status_data:
-        return False, "Unknown"
+        return False, "Unknown", False
 
     state = status_data.get("state", "unknown")
     total_count = status_data.get("total_count", 0)
@@ -120,66 +281,68 @@ def get_pr_checks_status(pr_number: int) -> Tuple[bool, str]:
     failed = sum(1 for s in statuses if s.get("state") in ["failure", "error"])
     pending = sum(1 for s in statuses if s.get("state") in ["pending", "in_progress"])
 
-    is_passing = state == "success" and failed == 0
-    status_str = f"✅ PASS (total: {total_count}, passed: {passed}"
-    if failed > 0:
-        status_str += f", ❌ failed: {failed}"
-    if pending > 0:
-        status_str += f", ⏳ pending: {pending}"
-    status_str += ")"
+    return _format_checks_status(state, total_count, passed, failed, pending)
 
-    return is_passing, status_str
 
+def get_trae_artifact(pr_number: int) -> Optional[TraeArtifact]:
+    """Get the latest Trae review artifact for a PR (by `created_at`)."""
+    return _trae_index.latest(pr_number)
 
-def get_trae_artifact(pr_number: int) -> Optional[Dict]:
-    """Get Trae review artifact for a PR."""
-    if not TRAE_ARTIFACT_DIR.exists():
-        return None
 
-    # Look for artifact matching PR number
-    artifact_files = list(TRAE_ARTIFACT_DIR.glob(f"TRAE-*-{pr_number}.yml"))
+def is_artifact_stale(created_at_str: str, expiry_days: int = DEFAULT_EXPIRY_DAYS) -> bool:
+    """Check if artifact is stale (older than its expiry, 7 days by default)."""
+    try:
+        created_at = datetime.strptime(created_at_str, TIMESTAMP_FORMAT)
+        expiry_date = utc_now() - timedelta(days=expiry_days)
+        return created_at < expiry_date
+    except Exception:
+        return False
 
-    if not artifact_files:
-        return None
 
-    artifact_path = artifact_files[-1]  # Get latest
-    return parse_trae_artifact(artifact_path)
+def get_expiring_reviews(
+    prs: List[Dict],
+    since: Optional[datetime] = None,
+    expiry_index: Optional[ReviewExpiryIndex] = None,
+    days: Optional[float] = None,
+) -> Dict[str, List[Dict]]:
+    """Approved Trae reviews of open PRs that lapse soon or lapsed since `since`.
 
+    Both lists come from range queries on the expiry-ordered index, so the
+    cost does not grow with the number of artifacts outside the window.
+    """
+    expiry_index = expiry_index or _trae_index.expiry()
+    days = TRAE_EXPIRY_WARNING_DAYS if days is None else days
+    now = utc_now()
+    open_prs = {pr.get("number"): pr for pr in prs}
+
+    def entries(artifacts: List[TraeArtifact]) -> List[Dict]:
+        result = []
+        for artifact in artifacts:
+            pr = open_prs.get(artifact.pr_number)
+            if pr is None:
+                continue
+            result.append({
+                "pr_number": artifact.pr_number,
+                "pr_title": pr.get("title", "Unknown"),
+                "pr_link": pr.get("html_url", ""),
+                "verdict": artifact.verdict,
+                "created_at": artifact.created_at,
+                "expires_at": artifact.expires_at,
+                "artifact_path": artifact.file_path,
+            })
+        return result
 
-def parse_trae_artifact(artifact_path: Path) -> Optional[Dict]:
-    """Parse Trae review artifact (simple YAML parser)."""
-    try:
-        with open(artifact_path) as f:
-            content = f.read()
-
-        # Extract key fields using regex
-        pr_match = re.search(r'pr_number:\s*["\']?(\d+)["\']?', content)
-        verdict_match = re.search(r'verdict:\s*["\']?([^"\'\s\n]+)["\']?', content)
-        created_match = re.search(r'created_at:\s*["\']?([^"\']+)["\']?', content)
-
-        return {
-            "pr_number": int(pr_match.group(1)) if pr_match else None,
-            "verdict": verdict_match.group(1) if verdict_match else None,
-            "created_at": created_match.group(1) if created_match else None,
-            "file_path": artifact_path,
-        }
-    except Exception as e:
-        log(f"Error parsing Trae artifact {artifact_path}: {e}", "ERROR")
-        return None
+    lapsed = entries(expiry_index.expired_since(since, now)) if since and since < now else []
+    return {"expiring": entries(expiry_index.expiring_within(now, days)), "lapsed": lapsed}
 
 
-def is_artifact_stale(created_at_str: str) -> bool:
-    """Check if artifact is stale (> 7 days old)."""
-    try:
-        created_at = datetime.strptime(created_at_str, "%Y-%m-%d %H:%M UTC")
-        expiry_date = datetime.utcnow() - timedelta(days=7)
-        return created_at < expiry_date
-    except Exception:
-        return False
+def _format_time_left(expires_at: datetime) -> str:
+    hours = max(0, int((expires_at - utc_now()).total_seconds() // 3600))
+    return f"{hours // 24}d {hours % 24}h" if hours >= 24 else f"{hours}h"
 
 
-def detect_risk_tier(pr: Dict, trae_artifact: Optional[Dict]) -> str:
-    """Detect risk tier from PR."""
+def _declared_risk_tier(pr: Dict, trae_artifact: Optional[TraeArtifact]) -> Optional[str]:
+    """Detect risk tier from PR labels, description and Trae verdict (no API calls)."""
     # Check PR labels
     labels = [label.get("name", "").lower() for label in pr.get("labels", [])]
     if any(l in labels for l in ["tier-1", "critical", "t1"]):
@@ -192,7 +355,7 @@ def detect_risk_tier(pr: Dict, trae_artifact: Optional[Dict]) -> str:
         return "T4"
 
     # Check PR description
-    desc_lower = pr.get("body", "").lower()
+    desc_lower = (pr.get("body") or "").lower()
     if "tier 1" in desc_lower or "t1" in desc_lower or "critical" in desc_lower:
         return "T1"
     if "tier 2" in desc_lower or "t2" in desc_lower or "high risk" in desc_lower:
@@ -203,216 +366,371 @@ def detect_risk_tier(pr: Dict, trae_artifact: Optional[Dict]) -> str:
         return "T4"
 
     # Check Trae artifact verdict (T1-T4 if Trae reviewed)
-    if trae_artifact and trae_artifact.get("verdict") in ["APPROVE", "EMERGENCY_OVERRIDE"]:
+    if trae_artifact and trae_artifact.approved:
         return "T2"  # Assume T2 as fallback when unsure
 
-    # Check files changed (protected paths = T1/T2)
-    files_changed = get_pr_files(pr.get("number"))
-    touches_protected = any(
-        any(p in str(f) for p in PROTECTED_PATHS)
-        for f in files_changed
-    )
-    if touches_protected:
+    return None
+
+
+def _risk_tier_from_files(files_changed: Iterable[str]) -> str:
+    """Detect risk tier from changed files (protected paths = T1).
+
+    Uses the validator's path policy; stops consuming `files_changed` at the
+    first protected path.
+    """
+    if PROTECTED_POLICY.any_match(files_changed):
         return "T1"
 
     return "T3"  # Default
 
 
+def detect_risk_tier(pr: Dict, trae_artifact: Optional[TraeArtifact], files: Optional[List[str]] = None) -> str:
+    """Detect risk tier from PR.
+
+    Files are only fetched when labels, description and Trae verdict are
+    inconclusive; pass ``files`` to reuse an already-fetched list.
+    """
+    risk_tier = _declared_risk_tier(pr, trae_artifact)
+    if risk_tier:
+        return risk_tier
+
+    # Check files changed (protected paths = T1/T2); streamed so that
+    # later pages are not fetched once a protected path is seen
+    if files is None:
+        return _risk_tier_from_files(iter_pr_files(pr.get("number")))
+    return _risk_tier_from_files(files)
+
+
+def iter_pr_files(pr_number: int, limit: Optional[int] = None) -> Iterator[str]:
+    """Stream file names changed in a PR across all pages."""
+    endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/pulls/{pr_number}/files?per_page=100"
+    for item in github_api_paginate(endpoint, limit):
+        yield item.get("filename", "")
+
+
 def get_pr_files(pr_number: int) -> List[str]:
-    """Get list of files changed in a PR."""
+    """Get list of files changed in a PR; raises if any page fails."""
     endpoint = f"/repos/{REPO_OWNER}/{REPO_NAME}/pulls/{pr_number}/files?per_page=100"
-    data = github_api_get(endpoint)
-    files = []
-    if isinstance(data, list):
-        files = [item.get("filename", "") for item in data]
-    return files
+    return [item.get("filename", "") for item in get_github_client().paginate(endpoint)]
 
 
-def get_project_items() -> List[Dict]:
-    """Get items from GitHub Project v2 using GraphQL."""
-    if not GITHUB_TOKEN:
-        log("WARNING: No GITHUB_TOKEN, skipping project items query", "WARN")
-        return []
+def _fetch_pr_files(pr_number: int) -> Tuple[Tuple[str, ...], bool]:
+    """(files, files_final) for a PR.
 
-    # GraphQL query for project items
-    query = """
-    query($owner: String!, $repo: String!, $projectNumber: Int!) {
-      repository(owner: $owner, name: $repo) {
-        projectsV2(first: 10) {
-          nodes {
-            number
-            title
-            items(first: 100) {
-              nodes {
-                id
-                content {
-                  ... on Issue {
-                    number
-                    title
-                    state
-                    url
-                  }
-                }
-                fieldValues(first: 10) {
-                  nodes {
-                    ... on ProjectV2ItemFieldSingleSelectValue {
-                      name
-                      field {
-                        ... on ProjectV2FieldCommon {
-                          name
-                        }
-                      }
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-    }
+    A failed fetch yields no files and files_final=False: the record is used
+    for this run but its files are not saved for reuse by later runs.
     """
+    try:
+        return tuple(get_pr_files(pr_number)), True
+    except Exception as e:
+        log(f"GitHub API error fetching files for PR #{pr_number}: {e}", "ERROR")
+        return (), False
+
+
+class PRRecord(NamedTuple):
+    """Per-PR enrichment computed once per run and shared by all renderers."""
+
+    number: int
+    ci_passing: bool
+    ci_status: str
+    ci_final: bool
+    trae_artifact: Optional[TraeArtifact]
+    risk_tier: str
+    # None when the risk tier was decided without looking at changed files
+    files: Optional[Tuple[str, ...]]
+    # False when the file fetch failed; such lists are never reused
+    files_final: bool = True
+
+
+def enrich_pull_request(pr: Dict) -> PRRecord:
+    """Compute CI status, Trae artifact, risk tier and files for one PR."""
+    pr_number = pr.get("number")
+    ci_passing, ci_status, ci_final = get_pr_checks_status(pr_number, pr.get("head", {}).get("sha"))
+    trae_artifact = get_trae_artifact(pr_number)
+
+    files = None
+    files_final = True
+    risk_tier = _declared_risk_tier(pr, trae_artifact)
+    if not risk_tier:
+        files, files_final = _fetch_pr_files(pr_number)
+        risk_tier = _risk_tier_from_files(files)
+
+    return PRRecord(
+        number=pr_number,
+        ci_passing=ci_passing,
+        ci_status=ci_status,
+        ci_final=ci_final,
+        trae_artifact=trae_artifact,
+        risk_tier=risk_tier,
+        files=files,
+        files_final=files_final,
+    )
 
-    variables = {
-        "owner": REPO_OWNER,
-        "repo": REPO_NAME,
-        "projectNumber": int(SDLC_PROJECT_NUMBER),
-    }
 
+def read_brief_state(path: Optional[Path] = None) -> Dict:
+    """Load the previous run's state snapshot for this repository.
+
+    Returns {} when there is no usable snapshot (first run, other repo,
+    unreadable file), which makes the run rebuild everything.
+    """
+    path = path or BRIEF_STATE_PATH
     try:
-        import requests
-        response = requests.post(
-            f"{GITHUB_API_URL}/graphql",
-            headers=get_github_headers(),
-            json={"query": query, "variables": variables},
-            timeout=30,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        # Extract items from project
-        items = []
-        projects = data.get("data", {}).get("repository", {}).get("projectsV2", {}).get("nodes", [])
-        for project in projects:
-            if project.get("number") == int(SDLC_PROJECT_NUMBER):
-                item_nodes = project.get("items", {}).get("nodes", [])
-                for item_node in item_nodes:
-                    content = item_node.get("content")
-                    if content:
-                        # Parse field values
-                        status = None
-                        field_values = item_node.get("fieldValues", {}).get("nodes", [])
-                        for fv in field_values:
-                            field = fv.get("field", {})
-                            if field and field.get("name") == "Status":
-                                status = fv.get("name")
-                                break
-
-                        items.append({
-                            "number": content.get("number"),
-                            "title": content.get("title"),
-                            "state": content.get("state"),
-                            "url": content.get("url"),
-                            "status": status,
-                        })
-                break
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("scope") != f"{REPO_OWNER}/{REPO_NAME}":
+        return {}
+    return state
 
-        return items
 
-    except Exception as e:
-        log(f"Error fetching project items: {e}", "ERROR")
-        return []
+def load_brief_state(path: Optional[Path] = None) -> Dict[str, Dict]:
+    """Load per-PR state saved by the previous run ({} when unusable)."""
+    return read_brief_state(path).get("prs") or {}
 
 
-def get_project_items() -> List[Dict]:
-    """Get items from GitHub Project v2 using GraphQL."""
-    if not GITHUB_TOKEN:
-        log("WARNING: No GITHUB_TOKEN, skipping project items query", "WARN")
-        return []
+def last_run_time(state: Dict) -> Optional[datetime]:
+    """When the run that wrote `state` happened, or None."""
+    try:
+        return datetime.strptime(state.get("generated_at") or "", TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
 
-    # GraphQL query for project items
-    query = """
-    query($owner: String!, $repo: String!, $projectNumber: Int!) {
-      repository(owner: $owner, name: $repo) {
-        projectsV2(first: 10) {
-          nodes {
-            number
-            title
-            items(first: 100) {
-              nodes {
-                id
-                content {
-                  ... on Issue {
-                    number
-                    title
-                    state
-                    url
-                  }
-                }
-                fieldValues(first: 10) {
-                  nodes {
-                    ... on ProjectV2ItemFieldSingleSelectValue {
-                      name
-                      field {
-                        ... on ProjectV2FieldCommon {
-                          name
-                        }
-                      }
-                    }
-                  }
-                }
-              }
-            }
-          }
+
+def save_brief_state(prs: List[Dict], records: Dict[int, PRRecord], path: Optional[Path] = None):
+    """Persist per-PR state for the next run (atomic replace).
+
+    `watermark` is the newest PR `updated_at` seen this run.
+    """
+    path = path or BRIEF_STATE_PATH
+    entries = {}
+    for pr in prs:
+        record = records.get(pr.get("number"))
+        if record is None:
+            continue
+        entries[str(record.number)] = {
+            "updated_at": pr.get("updated_at"),
+            "head_sha": (pr.get("head") or {}).get("sha"),
+            "pr": pr,
+            "ci_passing": record.ci_passing,
+            "ci_status": record.ci_status,
+            "ci_final": record.ci_final,
+            "risk_tier": record.risk_tier,
+            "trae_verdict": record.trae_artifact.verdict if record.trae_artifact else None,
+            "files": list(record.files) if record.files is not None and record.files_final else None,
         }
-      }
+
+    state = {
+        "scope": f"{REPO_OWNER}/{REPO_NAME}",
+        "generated_at": utc_now().strftime(TIMESTAMP_FORMAT),
+        "watermark": max((pr.get("updated_at") or "" for pr in prs), default=""),
+        "prs": entries,
     }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, str(path))
+    except OSError as e:
+        log(f"Could not save brief state: {e}", "WARN")
+
+
+def _previous_entry(pr: Dict, previous: Dict[str, Dict]) -> Optional[Dict]:
+    """State entry for a PR whose `updated_at` and head SHA have not moved."""
+    entry = previous.get(str(pr.get("number")))
+    if not entry:
+        return None
+    if entry.get("updated_at") != pr.get("updated_at"):
+        return None
+    if entry.get("head_sha") != (pr.get("head") or {}).get("sha"):
+        return None
+    return entry
+
+
+def enrich_pull_requests(
+    prs: List[Dict],
+    concurrency: Optional[int] = None,
+    previous: Optional[Dict[str, Dict]] = None,
+) -> Dict[int, PRRecord]:
+    """Enrichment stage: build one PRRecord per open PR, keyed by PR number.
+
+    Local work (Trae artifacts, metadata tier) runs first; the remaining
+    per-PR GitHub calls run concurrently, at most `concurrency` at a time.
+    With `previous` state, unchanged PRs reuse their changed files and any
+    final CI result, so API calls scale with churn rather than backlog size.
     """
+    if concurrency is None:
+        concurrency = GITHUB_CONCURRENCY
+    previous = previous or {}
+
+    trae_artifacts = {}
+    declared_tiers = {}
+    head_shas = {}
+    reused_checks = {}
+    reused_files = {}
+    jobs = []
+    for pr in prs:
+        pr_number = pr.get("number")
+        trae_artifacts[pr_number] = get_trae_artifact(pr_number)
+        declared_tiers[pr_number] = _declared_risk_tier(pr, trae_artifacts[pr_number])
+        head_shas[pr_number] = pr.get("head", {}).get("sha")
+        entry = _previous_entry(pr, previous)
+
+        if entry and entry.get("ci_final"):
+            reused_checks[pr_number] = (entry["ci_passing"], entry["ci_status"], True)
+        else:
+            jobs.append(("checks", pr_number))
+        if not declared_tiers[pr_number]:
+            if entry and entry.get("files") is not None:
+                reused_files[pr_number] = tuple(entry["files"])
+            else:
+                jobs.append(("files", pr_number))
 
-    variables = {
-        "owner": REPO_OWNER,
-        "repo": REPO_NAME,
-        "projectNumber": int(SDLC_PROJECT_NUMBER),
-    }
+    def run_job(job):
+        kind, pr_number = job
+        if kind == "checks":
+            return get_pr_checks_status(pr_number, head_shas[pr_number])
+        return _fetch_pr_files(pr_number)
 
-    try:
-        import requests
-        response = requests.post(
-            f"{GITHUB_API_URL}/graphql",
-            headers=get_github_headers(),
-            json={"query": query, "variables": variables},
-            timeout=30,
+    results = dict(zip(jobs, map_concurrent(run_job, jobs, concurrency)))
+    if previous:
+        log(f"Reused CI for {len(reused_checks)} and files for {len(reused_files)} of {len(prs)} PRs from last run")
+
+    records = {}
+    for pr in prs:
+        pr_number = pr.get("number")
+        ci_passing, ci_status, ci_final = reused_checks.get(pr_number) or results[("checks", pr_number)]
+        files, files_final = None, True
+        if pr_number in reused_files:
+            files = reused_files[pr_number]
+        elif ("files", pr_number) in results:
+            files, files_final = results[("files", pr_number)]
+        risk_tier = declared_tiers[pr_number] or _risk_tier_from_files(files)
+        records[pr_number] = PRRecord(
+            number=pr_number,
+            ci_passing=ci_passing,
+            ci_status=ci_status,
+            ci_final=ci_final,
+            trae_artifact=trae_artifacts[pr_number],
+            risk_tier=risk_tier,
+            files=files,
+            files_final=files_final,
         )
-        response.raise_for_status()
-        data = response.json()
-
-        # Extract items from project
-        items = []
-        projects = data.get("data", {}).get("repository", {}).get("projectsV2", {}).get("nodes", [])
-        for project in projects:
-            if project.get("number") == int(SDLC_PROJECT_NUMBER):
-                item_nodes = project.get("items", {}).get("nodes", [])
-                for item_node in item_nodes:
-                    content = item_node.get("content")
-                    if content:
-                        # Parse field values
-                        status = None
-                        field_values = item_node.get("fieldValues", {}).get("nodes", [])
-                        for fv in field_values:
-                            field = fv.get("field", {})
-                            if field and field.get("name") == "Status":
-                                status = fv.get("name")
-                                break
-
-                        items.append({
-                            "number": content.get("number"),
-                            "title": content.get("title"),
-                            "state": content.get("state"),
-                            "url": content.get("url"),
-                            "status": status,
-                        })
-                break
+    return records
+
+
+def _graphql_record(pr: Dict, ci: Tuple[bool, str, bool], files: Tuple[str, ...]) -> PRRecord:
+    """Build a record for a GraphQL-backed PR (files are always known)."""
+    pr_number = pr.get("number")
+    trae_artifact = get_trae_artifact(pr_number)
+    return PRRecord(
+        number=pr_number,
+        ci_passing=ci[0],
+        ci_status=ci[1],
+        ci_final=ci[2],
+        trae_artifact=trae_artifact,
+        risk_tier=_declared_risk_tier(pr, trae_artifact) or _risk_tier_from_files(files),
+        files=files,
+    )
+
+
+def fetch_pull_requests_graphql(
+    previous: Optional[Dict[str, Dict]] = None,
+) -> Tuple[List[Dict], Dict[int, PRRecord]]:
+    """GraphQL backend: open PRs and their records from batched page queries.
+
+    CI state comes from the head commit's statusCheckRollup and changed files
+    from the same query, so round trips scale with pages rather than PRs.
+    With `previous` state, a light index pass finds PRs whose `updatedAt`,
+    head SHA or non-final CI changed, and only those are fetched in full.
+    """
+    client = get_github_client()
+    prs = []
+    records = {}
+
+    if not previous:
+        for node, pr in github_graphql.iter_open_pull_requests(client, REPO_OWNER, REPO_NAME):
+            prs.append(pr)
+            records[pr["number"]] = _graphql_record(
+                pr, _format_checks_status(*github_graphql.rollup_counts(node)), github_graphql.file_paths(node)
+            )
+        return prs, records
+
+    index = list(github_graphql.iter_open_pull_request_versions(client, REPO_OWNER, REPO_NAME))
+    reused = {}
+    for item in index:
+        pr_stub = {"number": item.get("number"), "updated_at": item.get("updatedAt"), "head": {"sha": item.get("headRefOid")}}
+        entry = _previous_entry(pr_stub, previous)
+        if entry and entry.get("ci_final") and entry.get("files") is not None and entry.get("pr"):
+            reused[item["id"]] = entry
+
+    stale = [item["id"] for item in index if item["id"] not in reused]
+    fetched = {}
+    for node, pr in github_graphql.fetch_pull_requests(client, REPO_OWNER, REPO_NAME, stale):
+        fetched[node.get("id")] = (node, pr)
+    log(f"GraphQL: {len(index)} open PRs, {len(fetched)} refetched, {len(reused)} reused from last run")
+
+    # Keep listing order (newest first) across reused and refetched PRs
+    for item in index:
+        if item["id"] in reused:
+            entry = reused[item["id"]]
+            pr = entry["pr"]
+            ci = (entry["ci_passing"], entry["ci_status"], True)
+            files = tuple(entry["files"])
+        elif item["id"] in fetched:
+            node, pr = fetched[item["id"]]
+            ci = _format_checks_status(*github_graphql.rollup_counts(node))
+            files = github_graphql.file_paths(node)
+        else:
+            continue
+        prs.append(pr)
+        records[pr["number"]] = _graphql_record(pr, ci, files)
+    return prs, records
+
+
+def load_pull_requests(
+    backend: str,
+    concurrency: Optional[int] = None,
+    previous: Optional[Dict[str, Dict]] = None,
+) -> Tuple[List[Dict], Dict[int, PRRecord]]:
+    """Fetch open PRs and their enrichment records from the selected backend.
+
+    `previous` is the per-PR state from load_brief_state(); pass None or {}
+    to rebuild every record from scratch.
+    """
+    if backend == "graphql":
+        if not has_github_access():
+            log("WARNING: GraphQL backend requires GITHUB_TOKEN, using REST", "WARN")
+        else:
+            try:
+                return fetch_pull_requests_graphql(previous)
+            except Exception as e:
+                log(f"GraphQL backend error: {e}; falling back to REST", "ERROR")
+
+    prs = get_pull_requests()
+    return prs, enrich_pull_requests(prs, concurrency, previous)
+
 
+def get_project_items() -> List[Dict]:
+    """Get issue items from the SDLC GitHub Project v2 using GraphQL.
+
+    Pages through every item and only refetches items whose `updatedAt`
+    moved since the snapshot in PROJECT_ITEMS_SNAPSHOT.
+    """
+    if not has_github_access():
+        log("WARNING: No GITHUB_TOKEN, skipping project items query", "WARN")
+        return []
+
+    try:
+        items, refreshed = github_graphql.sync_project_items(
+            get_github_client(),
+            REPO_OWNER,
+            REPO_NAME,
+            int(SDLC_PROJECT_NUMBER),
+            PROJECT_ITEMS_SNAPSHOT,
+        )
+        log(f"Project items: {len(items)} total, {refreshed} refreshed since last snapshot")
         return items
 
     except Exception as e:
@@ -420,12 +738,14 @@ def get_project_items() -> List[Dict]:
         return []
 
 
-def get_governance_failures(prs: List[Dict]) -> List[Dict]:
+def get_governance_failures(prs: List[Dict], records: Optional[Dict[int, PRRecord]] = None) -> List[Dict]:
     """Get list of governance failures across PRs.
     
     Parses governance_validator_results.json if available.
     Returns list of failure dictionaries with type and details.
     """
+    if records is None:
+        records = enrich_pull_requests(prs)
     failures = []
     
     # Try to read governance validator results
@@ -482,8 +802,9 @@ def get_governance_failures(prs: List[Dict]) -> List[Dict]:
     # Also check PRs directly for missing Trae reviews on T1/T2
     for pr in prs:
         pr_number = pr.get("number")
-        trae_artifact = get_trae_artifact(pr_number)
-        risk_tier = detect_risk_tier(pr, trae_artifact)
+        record = records[pr_number]
+        trae_artifact = record.trae_artifact
+        risk_tier = record.risk_tier
         
         if risk_tier in ["T1", "T2"]:
             if not trae_artifact:
@@ -497,8 +818,8 @@ def get_governance_failures(prs: List[Dict]) -> List[Dict]:
                     "action": "Get Trae review",
                     "risk_tier": risk_tier,
                 })
-            elif trae_artifact.get("verdict") not in ["APPROVE", "EMERGENCY_OVERRIDE"]:
-                verdict = trae_artifact.get("verdict", "UNKNOWN")
+            elif not trae_artifact.approved:
+                verdict = trae_artifact.verdict or "UNKNOWN"
                 failures.append({
                     "type": "TRAE_REVIEW",
                     "pr_number": pr_number,
@@ -511,8 +832,8 @@ def get_governance_failures(prs: List[Dict]) -> List[Dict]:
                 })
             else:
                 # Check if stale
-                created_at = trae_artifact.get("created_at", "")
-                if created_at and is_artifact_stale(created_at):
+                created_at = trae_artifact.created_at or ""
+                if trae_artifact.is_expired(utc_now()):
                     failures.append({
                         "type": "TRAE_REVIEW",
                         "pr_number": pr_number,
@@ -527,97 +848,81 @@ def get_governance_failures(prs: List[Dict]) -> List[Dict]:
     # Check CI status for failures
     for pr in prs:
         pr_number = pr.get("number")
-        ci_passing, ci_status = get_pr_checks_status(pr_number)
+        record = records[pr_number]
         
-        if not ci_passing:
+        if not record.ci_passing:
             failures.append({
                 "type": "CI_FAILURE",
                 "pr_number": pr_number,
                 "pr_title": pr.get("title", "Unknown"),
                 "pr_link": pr.get("html_url", ""),
-                "status": ci_status,
+                "status": record.ci_status,
             })
     
     return failures
 
 
-def get_best_practice_flags(prs: List[Dict]) -> List[Dict]:
+def get_best_practice_flags(prs: List[Dict], records: Optional[Dict[int, PRRecord]] = None) -> List[Dict]:
     """Get best practice advisory flags from Trae review artifacts.
     
     Parses BEST_PRACTICE_ALIGNMENT fields from Trae review artifacts.
     Returns list of flags with recommendations (non-blocking).
     """
+    if records is None:
+        records = enrich_pull_requests(prs)
     flags = []
     
     for pr in prs:
         pr_number = pr.get("number")
-        trae_artifact = get_trae_artifact(pr_number)
+        trae_artifact = records[pr_number].trae_artifact
         
         if not trae_artifact:
             continue
         
-        # Parse the full artifact content for BEST_PRACTICE_ALIGNMENT
-        artifact_path = trae_artifact.get("file_path")
-        if not artifact_path or not artifact_path.exists():
-            continue
-        
-        try:
-            with open(artifact_path) as f:
-                content = f.read()
-            
-            # Check for BEST_PRACTICE_ALIGNMENT section
-            if "BEST_PRACTICE_ALIGNMENT" not in content:
-                continue
-            
-            # Extract values
-            plan_quality = None
-            change_size = None
-            ownership_clear = None
-            
-            plan_quality_match = re.search(r'PLAN_QUALITY:\s*(PASS|CONCERN)', content, re.IGNORECASE)
-            change_size_match = re.search(r'CHANGE_SIZE:\s*(OK|TOO_LARGE)', content, re.IGNORECASE)
-            ownership_clear_match = re.search(r'OWNERSHIP_CLEAR:\s*(YES|NO)', content, re.IGNORECASE)
-            
-            if plan_quality_match:
-                plan_quality = plan_quality_match.group(1)
-            if change_size_match:
-                change_size = change_size_match.group(1)
-            if ownership_clear_match:
-                ownership_clear = ownership_clear_match.group(1)
-            
-            # Generate recommendations based on flags
-            recommendations = []
-            if plan_quality == "CONCERN":
-                recommendations.append("Consider improving PLAN completeness")
-            if change_size == "TOO_LARGE":
-                recommendations.append("Consider splitting into smaller PRs")
-            if ownership_clear == "NO":
-                recommendations.append("Clarify ownership before merge")
-            
-            # Only add if there are any flags
-            if plan_quality or change_size or ownership_clear:
-                flags.append({
-                    "pr_number": pr_number,
-                    "pr_title": pr.get("title", "Unknown"),
-                    "pr_link": pr.get("html_url", ""),
-                    "plan_quality": plan_quality,
-                    "change_size": change_size,
-                    "ownership_clear": ownership_clear,
-                    "recommendation": "; ".join(recommendations) if recommendations else None,
-                })
-        
-        except Exception as e:
-            log(f"Error parsing best practice alignment for PR #{pr_number}: {e}", "ERROR")
+        # BEST_PRACTICE_ALIGNMENT values are parsed with the artifact
+        plan_quality = trae_artifact.plan_quality
+        change_size = trae_artifact.change_size
+        ownership_clear = trae_artifact.ownership_clear
+
+        # Generate recommendations based on flags
+        recommendations = []
+        if plan_quality == "CONCERN":
+            recommendations.append("Consider improving PLAN completeness")
+        if change_size == "TOO_LARGE":
+            recommendations.append("Consider splitting into smaller PRs")
+        if ownership_clear == "NO":
+            recommendations.append("Clarify ownership before merge")
+
+        # Only add if there are any flags
+        if plan_quality or change_size or ownership_clear:
+            flags.append({
+                "pr_number": pr_number,
+                "pr_title": pr.get("title", "Unknown"),
+                "pr_link": pr.get("html_url", ""),
+                "plan_quality": plan_quality,
+                "change_size": change_size,
+                "ownership_clear": ownership_clear,
+                "recommendation": "; ".join(recommendations) if recommendations else None,
+            })
     
     return flags
 
 
-def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: List[Dict], date_str: str) -> str:
+def generate_daily_brief(
+    prs: List[Dict],
+    issues: List[Dict],
+    project_items: List[Dict],
+    date_str: str,
+    records: Optional[Dict[int, PRRecord]] = None,
+    last_run: Optional[datetime] = None,
+) -> str:
     """Generate daily brief markdown."""
+    if records is None:
+        records = enrich_pull_requests(prs)
     brief = []
     brief.append(f"# Daily Brief — {date_str}")
     brief.append("")
-    brief.append("**Generated**: " + datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"))
+    brief.append("**Generated**: " + utc_now().strftime(TIMESTAMP_FORMAT))
     brief.append("**System**: Autonomous Engineering OS")
     brief.append("")
 
@@ -644,7 +949,7 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
     # Governance failures section
     brief.append("## Governance Failures Summary")
     brief.append("")
-    governance_failures = get_governance_failures(prs)
+    governance_failures = get_governance_failures(prs, records)
     
     if governance_failures:
         # PLAN structure failures
@@ -692,7 +997,7 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
 
     brief.append("## Best Practices Advisory (Soft Risk)")
     brief.append("")
-    best_practice_flags = get_best_practice_flags(prs)
+    best_practice_flags = get_best_practice_flags(prs, records)
     
     if best_practice_flags:
         for flag in best_practice_flags:
@@ -722,8 +1027,9 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
 
     for pr in prs:
         pr_number = pr.get("number")
-        trae_artifact = get_trae_artifact(pr_number)
-        risk_tier = detect_risk_tier(pr, trae_artifact)
+        record = records[pr_number]
+        trae_artifact = record.trae_artifact
+        risk_tier = record.risk_tier
 
         if risk_tier in ["T1", "T2"]:
             if not trae_artifact:
@@ -733,9 +1039,9 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
                     "verdict": "MISSING",
                 })
             else:
-                verdict = trae_artifact.get("verdict", "UNKNOWN")
-                created_at = trae_artifact.get("created_at", "")
-                is_stale = is_artifact_stale(created_at) if created_at else False
+                verdict = trae_artifact.verdict or "UNKNOWN"
+                created_at = trae_artifact.created_at or ""
+                is_stale = trae_artifact.is_expired(utc_now())
 
                 trae_required.append({
                     "pr": pr,
@@ -743,7 +1049,7 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
                     "verdict": verdict,
                     "created_at": created_at,
                     "is_stale": is_stale,
-                    "artifact_path": trae_artifact.get("file_path"),
+                    "artifact_path": trae_artifact.file_path,
                 })
 
     if trae_required:
@@ -755,7 +1061,7 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
             brief.append(f"- **Link**: {pr.get('html_url')}")
             brief.append(f"- **Trae Verdict**: {verdict}")
             if item.get("created_at"):
-                staleness = " (STALE - >7 days old)" if item.get("is_stale") else ""
+                staleness = " (STALE - past expiry)" if item.get("is_stale") else ""
                 brief.append(f"- **Created**: {item['created_at']}{staleness}")
             if item.get("artifact_path"):
                 brief.append(f"- **Artifact**: `{item['artifact_path']}`")
@@ -771,6 +1077,39 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
     brief.append("---")
     brief.append("")
 
+    # Expiring Soon Section
+    brief.append("## Expiring Soon")
+    brief.append("")
+    expiring = get_expiring_reviews(prs, since=last_run)
+    if expiring["expiring"]:
+        brief.append(f"Approved Trae reviews lapsing within {TRAE_EXPIRY_WARNING_DAYS} days:")
+        brief.append("")
+        for item in expiring["expiring"]:
+            brief.append(f"### PR #{item['pr_number']}: {item['pr_title']}")
+            brief.append(f"- **Link**: {item['pr_link']}")
+            brief.append(
+                f"- **Expires**: {item['expires_at'].strftime(TIMESTAMP_FORMAT)} "
+                f"(in {_format_time_left(item['expires_at'])})"
+            )
+            brief.append(f"- **Artifact**: `{item['artifact_path']}`")
+            brief.append("- **Action**: Merge or schedule a fresh Trae review before expiry")
+            brief.append("")
+    else:
+        brief.append(f"No Trae approvals expire in the next {TRAE_EXPIRY_WARNING_DAYS} days.")
+        brief.append("")
+    if expiring["lapsed"]:
+        brief.append("### Lapsed Since Last Run")
+        brief.append("")
+        for item in expiring["lapsed"]:
+            brief.append(
+                f"- **PR #{item['pr_number']}**: {item['pr_title']} — "
+                f"expired {item['expires_at'].strftime(TIMESTAMP_FORMAT)}"
+            )
+        brief.append("")
+
+    brief.append("---")
+    brief.append("")
+
     # Open PRs Section
     brief.append("## Open Pull Requests")
     brief.append("")
@@ -778,9 +1117,9 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
     if prs:
         for pr in prs:
             pr_number = pr.get("number")
-            ci_passing, ci_status = get_pr_checks_status(pr_number)
-            trae_artifact = get_trae_artifact(pr_number)
-            risk_tier = detect_risk_tier(pr, trae_artifact)
+            record = records[pr_number]
+            ci_passing, ci_status = record.ci_passing, record.ci_status
+            risk_tier = record.risk_tier
 
             brief.append(f"### PR #{pr_number}: {pr.get('title')}")
             brief.append(f"- **Link**: {pr.get('html_url')}")
@@ -865,12 +1204,20 @@ def generate_daily_brief(prs: List[Dict], issues: List[Dict], project_items: Lis
     return "\n".join(brief)
 
 
-def generate_approvals_queue(prs: List[Dict], project_items: List[Dict], date_str: str) -> str:
+def generate_approvals_queue(
+    prs: List[Dict],
+    project_items: List[Dict],
+    date_str: str,
+    records: Optional[Dict[int, PRRecord]] = None,
+    last_run: Optional[datetime] = None,
+) -> str:
     """Generate approvals queue markdown."""
+    if records is None:
+        records = enrich_pull_requests(prs)
     queue = []
     queue.append(f"# Approvals Queue — {date_str}")
     queue.append("")
-    queue.append("**Generated**: " + datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"))
+    queue.append("**Generated**: " + utc_now().strftime(TIMESTAMP_FORMAT))
     queue.append("**System**: Autonomous Engineering OS")
     queue.append("")
     queue.append("> INSTRUCTIONS FOR FOUNDER (Board Member):")
@@ -892,8 +1239,9 @@ def generate_approvals_queue(prs: List[Dict], project_items: List[Dict], date_st
     has_trae_decisions = False
     for pr in prs:
         pr_number = pr.get("number")
-        trae_artifact = get_trae_artifact(pr_number)
-        risk_tier = detect_risk_tier(pr, trae_artifact)
+        record = records[pr_number]
+        trae_artifact = record.trae_artifact
+        risk_tier = record.risk_tier
 
         if risk_tier in ["T1", "T2"]:
             has_trae_decisions = True
@@ -910,9 +1258,9 @@ def generate_approvals_queue(prs: List[Dict], project_items: List[Dict], date_st
                 queue.append("- [ ] **DEFER** - Defer this PR until next cycle")
                 queue.append("")
             else:
-                verdict = trae_artifact.get("verdict", "UNKNOWN")
-                created_at = trae_artifact.get("created_at", "")
-                is_stale = is_artifact_stale(created_at) if created_at else False
+                verdict = trae_artifact.verdict or "UNKNOWN"
+                created_at = trae_artifact.created_at or ""
+                is_stale = trae_artifact.is_expired(utc_now())
 
                 if verdict == "APPROVE" and not is_stale:
                     queue.append("**Status**: 🟢 TRAE APPROVED")
@@ -955,6 +1303,24 @@ def generate_approvals_queue(prs: List[Dict], project_items: List[Dict], date_st
         queue.append("✅ No T1-T2 PRs requiring Trae review.")
     queue.append("")
 
+    expiring = get_expiring_reviews(prs, since=last_run)
+    if expiring["expiring"] or expiring["lapsed"]:
+        queue.append("### Expiring Soon")
+        queue.append("")
+        queue.append(f"Trae approvals lapsing within {TRAE_EXPIRY_WARNING_DAYS} days (merge or request re-review):")
+        queue.append("")
+        for item in expiring["expiring"]:
+            queue.append(
+                f"- **PR #{item['pr_number']}**: {item['pr_title']} — expires "
+                f"{item['expires_at'].strftime(TIMESTAMP_FORMAT)} (in {_format_time_left(item['expires_at'])})"
+            )
+        for item in expiring["lapsed"]:
+            queue.append(
+                f"- **PR #{item['pr_number']}**: {item['pr_title']} — ⚠️ lapsed since last run "
+                f"({item['expires_at'].strftime(TIMESTAMP_FORMAT)})"
+            )
+        queue.append("")
+
     # Section 2: Waiting for Approval (Project Items)
     queue.append("## 2. Founder Decisions Needed (Waiting for Approval)")
     queue.append("")
@@ -1009,7 +1375,7 @@ def generate_approvals_queue(prs: List[Dict], project_items: List[Dict], date_st
     has_failing_ci = False
     for pr in prs:
         pr_number = pr.get("number")
-        ci_passing, _ = get_pr_checks_status(pr_number)
+        ci_passing = records[pr_number].ci_passing
 
         if not ci_passing:
             has_failing_ci = True
@@ -1056,17 +1422,64 @@ def main():
 
     parser = argparse.ArgumentParser(description="Daily Brief + Approvals Queue Generator")
     parser.add_argument("--test", action="store_true", help="Run in test mode (output to stdout)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=GITHUB_CONCURRENCY,
+        help=f"Max concurrent per-PR GitHub requests (default: {GITHUB_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BRIEF_BACKENDS,
+        default=BRIEF_BACKEND,
+        help=f"PR data source (default: {BRIEF_BACKEND})",
+    )
+    parser.add_argument(
+        "--api-budget",
+        type=int,
+        default=GITHUB_API_BUDGET,
+        help="Max GitHub API calls this run (default: unlimited)",
+    )
+    traffic = parser.add_mutually_exclusive_group()
+    traffic.add_argument(
+        "--record",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Record all GitHub API responses to a gzip archive",
+    )
+    traffic.add_argument(
+        "--replay",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Replay GitHub API responses from an archive (no network)",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Ignore the previous run's per-PR state and rebuild every record",
+    )
     args = parser.parse_args()
+    configure_github_client(record_path=args.record, replay_path=args.replay)
+    get_github_client().scheduler.budget = args.api_budget
 
     log("🤖 Daily Brief + Approvals Queue Generator")
     log("=" * 60)
 
     # Get date string
-    date_str = datetime.utcnow().strftime("%Y%m%d")
+    date_str = utc_now().strftime("%Y%m%d")
 
     # Fetch data
-    log("Fetching data from GitHub...")
-    prs = get_pull_requests()
+    log(f"Fetching data from GitHub (backend: {args.backend})...")
+    # Recording and replay always see full traffic, independent of local
+    # state; test runs read the state but never write it
+    use_state = not (args.full_refresh or args.record or args.replay)
+    state = read_brief_state() if use_state else {}
+    previous = state.get("prs") or {}
+    last_run = last_run_time(state)
+    # Each PR is enriched exactly once; every section below reuses these records
+    prs, records = load_pull_requests(args.backend, args.concurrency, previous)
+    if use_state and not args.test:
+        save_brief_state(prs, records)
     issues = get_open_issues()
     project_items = get_project_items()
 
@@ -1075,8 +1488,8 @@ def main():
     # Generate artifacts
     log("Generating artifacts...")
 
-    brief_content = generate_daily_brief(prs, issues, project_items, date_str)
-    approvals_content = generate_approvals_queue(prs, project_items, date_str)
+    brief_content = generate_daily_brief(prs, issues, project_items, date_str, records, last_run)
+    approvals_content = generate_approvals_queue(prs, project_items, date_str, records, last_run)
 
     brief_filename = f"BRIEF-{date_str}.md"
     approvals_filename = f"APPROVALS-{date_str}.md"
@@ -1111,6 +1524,9 @@ def main():
         print(f"brief_file={brief_path}")
         print(f"approvals_file={approvals_path}")
 
+    log(f"GitHub API cache: {get_github_client().stats.summary()}")
+    log(f"GitHub API usage: {get_github_client().scheduler.summary()}")
+    get_github_client().close()
     log("=" * 60)
     log("Done!")
 
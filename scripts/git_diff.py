@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Git Diff — one `git diff` per validation run, parsed once for every check
+
+Runs a single `git diff -z --raw --numstat --patch -M --unified=0` and parses
+the stream into a DiffData shared by the governance checks:
+- FileChange per file: status (A/M/D/R/C/T), old path for renames and copies,
+  rename similarity, added/deleted line counts, binary flag and hunk ranges
+- Added lines are handed to `on_added_line(path, line_number, text)` while
+  the patch streams past, so consumers such as the secret scanner see every
+  added line without the patch ever being held in memory
+
+Output layout with -z: NUL-terminated raw records, then NUL-terminated
+numstat records, an empty record, and the newline-separated patch. Patch
+sections come in the same order as the raw records, so hunks are matched to
+files by position rather than by re-parsing (possibly quoted) header paths.
+
+read_tree_diff() builds the same DiffData in-process from git_objects
+(statuses, renames, line counts, hunks and added lines), so no `git` process
+is spawned. Work is bounded: a changed blob larger than
+TREE_DIFF_MAX_BLOB_BYTES, or a line diff needing more than
+TREE_DIFF_WORK_LIMIT steps, raises GitObjectError, as does an object store
+that cannot be read in-process; callers then use read_diff(). Its line diff
+is minimal, so on large rewrites counts can be a little lower than git's
+(xdiff's heuristics do not always find the minimum), and among equal lines
+it may call a different copy the added one.
+
+Dependencies: Python 3.7+, git
+"""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from git_objects import SUBMODULE_MODE, GitObjectError, Repository
+
+DIFF_ARGS = [
+    "diff", "-z", "--raw", "--numstat", "--patch", "-M",
+    "--unified=0", "--no-color", "--no-ext-diff",
+]
+
+# read_tree_diff() bounds: largest blob read whole, and Myers diff steps spent
+# per file (beyond either, `git diff` is the cheaper path)
+TREE_DIFF_MAX_BLOB_BYTES = 1 << 20
+TREE_DIFF_WORK_LIMIT = 2_000_000
+
+# Same heuristic as git: a NUL in the first 8000 bytes means binary
+_BINARY_SNIFF_BYTES = 8000
+
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+AddedLineCallback = Callable[[str, int, str], None]
+
+
+class Hunk(NamedTuple):
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+
+
+class FileChange:
+    """One changed file as reported by git."""
+
+    __slots__ = (
+        "path", "old_path", "status", "similarity", "old_mode", "new_mode",
+        "added", "deleted", "binary", "hunks",
+    )
+
+    def __init__(self, path: str, status: str, old_path: Optional[str] = None, similarity: Optional[int] = None,
+                 old_mode: str = "", new_mode: str = ""):
+        self.path = path
+        self.old_path = old_path
+        self.status = status
+        self.similarity = similarity
+        self.old_mode = old_mode
+        self.new_mode = new_mode
+        self.added: Optional[int] = None
+        self.deleted: Optional[int] = None
+        self.binary = False
+        self.hunks: List[Hunk] = []
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.status == "D"
+
+    @property
+    def is_rename(self) -> bool:
+        return self.status == "R"
+
+    def __repr__(self) -> str:
+        source = f"{self.old_path} -> " if self.old_path else ""
+        return f"FileChange({self.status} {source}{self.path}, +{self.added} -{self.deleted})"
+
+
+class DiffData:
+    """All file changes of one diff, in git's order."""
+
+    def __init__(self, files: List[FileChange]):
+        self.files = files
+        self._by_path: Dict[str, FileChange] = {}
+        for change in files:
+            self._by_path[change.path] = change
+            if change.old_path:
+                self._by_path.setdefault(change.old_path, change)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __iter__(self) -> Iterator[FileChange]:
+        return iter(self.files)
+
+    def get(self, path) -> Optional[FileChange]:
+        """Change touching `path` (current path, or the source of a rename)."""
+        return self._by_path.get(Path(path).as_posix())
+
+    def paths(self) -> List[Path]:
+        """Changed paths (new path for renames), as `git diff --name-only` lists them."""
+        return [Path(change.path) for change in self.files]
+
+    @property
+    def deleted(self) -> List[FileChange]:
+        return [change for change in self.files if change.is_deleted]
+
+    @property
+    def renames(self) -> List[FileChange]:
+        return [change for change in self.files if change.is_rename]
+
+    @property
+    def lines_added(self) -> int:
+        return sum(change.added or 0 for change in self.files)
+
+    @property
+    def lines_deleted(self) -> int:
+        return sum(change.deleted or 0 for change in self.files)
+
+
+def _iter_records(stream: BinaryIO, pending: bytearray) -> Iterator[str]:
+    """NUL-terminated records up to the empty one that precedes the patch.
+
+    Bytes read past that point are left in `pending`.
+    """
+    while True:
+        end = pending.find(b"\0")
+        while end < 0:
+            chunk = stream.read(65536)
+            if not chunk:
+                return
+            pending.extend(chunk)
+            end = pending.find(b"\0")
+        record = bytes(pending[:end]).decode("utf-8", errors="surrogateescape")
+        del pending[:end + 1]
+        if record == "":
+            return
+        yield record
+
+
+def _iter_patch_lines(stream: BinaryIO, pending: bytearray) -> Iterator[str]:
+    """Newline-separated patch lines, starting with bytes already buffered."""
+    head = bytes(pending)
+    pending.clear()
+    if head:
+        lines = head.split(b"\n")
+        # The last piece may be a partial line; complete it from the stream
+        lines[-1] += stream.readline()
+        for line in lines:
+            if line:
+                yield line.decode("utf-8", errors="replace")
+    for line in stream:
+        yield line.decode("utf-8", errors="replace")
+
+
+def _parse_summary(records: Iterator[str]) -> List[FileChange]:
+    files: List[FileChange] = []
+    numstat_index = 0
+    for record in records:
+        if record.startswith(":"):
+            fields = record[1:].split()
+            old_mode, new_mode, status_field = fields[0], fields[1], fields[4]
+            status, score = status_field[0], status_field[1:]
+            if status in "RC":
+                old_path, path = next(records), next(records)
+            else:
+                old_path, path = None, next(records)
+            files.append(FileChange(path, status, old_path, int(score) if score else None, old_mode, new_mode))
+            continue
+
+        # numstat: "added<TAB>deleted<TAB>path", path empty for renames (old, new follow)
+        added, deleted, path = record.split("\t", 2)
+        if not path:
+            next(records), next(records)
+        if numstat_index < len(files):
+            change = files[numstat_index]
+            if added == "-":
+                change.binary = True
+            else:
+                change.added, change.deleted = int(added), int(deleted)
+        numstat_index += 1
+    return files
+
+
+def parse_diff(stream: BinaryIO, on_added_line: Optional[AddedLineCallback] = None) -> DiffData:
+    """Parse `git diff -z --raw --numstat --patch` output from a binary stream."""
+    pending = bytearray()
+    files = _parse_summary(_iter_records(stream, pending))
+
+    index = -1
+    change: Optional[FileChange] = None
+    line_number = 0
+    in_hunk = False
+    for raw in _iter_patch_lines(stream, pending):
+        if raw.startswith("diff --git "):
+            index += 1
+            change = files[index] if index < len(files) else None
+            in_hunk = False
+            continue
+        if not in_hunk:
+            if raw.startswith("@@"):
+                in_hunk = True
+            else:
+                continue
+
+        marker = raw[:1]
+        if marker == "+":
+            if on_added_line is not None and change is not None:
+                on_added_line(change.path, line_number, raw[1:].rstrip("\r\n"))
+            line_number += 1
+        elif marker == " ":
+            line_number += 1
+        elif marker == "@":
+            match = _HUNK_RE.match(raw)
+            if match and change is not None:
+                old_start, old_count, new_start, new_count = match.groups()
+                change.hunks.append(Hunk(
+                    int(old_start), int(old_count if old_count is not None else 1),
+                    int(new_start), int(new_count if new_count is not None else 1),
+                ))
+            line_number = int(match.group(3)) if match else 0
+    return DiffData(files)
+
+
+def read_diff(
+    rev_args: Sequence[str], cwd: Path, on_added_line: Optional[AddedLineCallback] = None
+) -> DiffData:
+    """Run one `git diff` over `rev_args` and parse it as it streams.
+
+    Raises subprocess.CalledProcessError when git exits non-zero.
+    """
+    command = ["git", *DIFF_ARGS, *rev_args]
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        diff = parse_diff(process.stdout, on_added_line)
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+    return diff
+
+
+def _split_lines(data: bytes) -> List[bytes]:
+    """Lines as git counts them: split on LF only, terminators kept."""
+    lines = data.split(b"\n")
+    last = lines.pop()
+    lines = [line + b"\n" for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def _matching_lines(old: Sequence[int], new: Sequence[int]) -> List[Tuple[int, int]]:
+    """(old index, new index) pairs of a longest common subsequence (Myers).
+
+    Greedy forward search costing O((N + M) * D) steps, then a walk back
+    through the saved frontiers; raises GitObjectError once the steps exceed
+    TREE_DIFF_WORK_LIMIT (the saved frontiers are bounded by the same count).
+    """
+    n, m = len(old), len(new)
+    offset = n + m + 1
+    furthest = [0] * (2 * offset + 1)
+    trace: List[List[int]] = []
+    work = 0
+    done = False
+    for d in range(n + m + 1):
+        # Frontier before round d, for k in [-d - 1, d + 1]
+        trace.append(furthest[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and furthest[offset + k - 1] < furthest[offset + k + 1]):
+                x = furthest[offset + k + 1]
+            else:
+                x = furthest[offset + k - 1] + 1
+            y = x - k
+            start = x
+            while x < n and y < m and old[x] == new[y]:
+                x += 1
+                y += 1
+            work += 1 + x - start
+            furthest[offset + k] = x
+            if x >= n and y >= m:
+                done = True
+                break
+        if done:
+            break
+        if work > TREE_DIFF_WORK_LIMIT:
+            raise GitObjectError(f"line diff of {n} and {m} lines exceeds the work limit")
+
+    pairs = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        frontier = trace[d]
+        k = x - y
+        if k == -d or (k != d and frontier[k + d] < frontier[k + d + 2]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = frontier[previous_k + d + 1]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            pairs.append((x, y))
+        x, y = previous_x, previous_y
+    pairs.reverse()
+    return pairs
+
+
+def _changed_regions(old_lines: List[bytes], new_lines: List[bytes]) -> List[Tuple[int, int, int, int]]:
+    """(old start, old end, new start, new end) of each change in a minimal line diff.
+
+    Common leading and trailing lines are trimmed and, as in xdiff, lines
+    found on one side only are set aside (they never match) before the
+    remaining lines are compared.
+    """
+    start = 0
+    end_old, end_new = len(old_lines), len(new_lines)
+    while start < end_old and start < end_new and old_lines[start] == new_lines[start]:
+        start += 1
+    while end_old > start and end_new > start and old_lines[end_old - 1] == new_lines[end_new - 1]:
+        end_old -= 1
+        end_new -= 1
+    shared = set(old_lines[start:end_old]).intersection(new_lines[start:end_new])
+    ids: Dict[bytes, int] = {line: index for index, line in enumerate(shared)}
+    old_positions = [i for i in range(start, end_old) if old_lines[i] in ids]
+    new_positions = [j for j in range(start, end_new) if new_lines[j] in ids]
+    pairs = _matching_lines(
+        [ids[old_lines[i]] for i in old_positions], [ids[new_lines[j]] for j in new_positions]
+    )
+
+    regions = []
+    old_at, new_at = start, start
+    for i, j in [(old_positions[a], new_positions[b]) for a, b in pairs] + [(end_old, end_new)]:
+        if i > old_at or j > new_at:
+            regions.append((old_at, i, new_at, j))
+        old_at, new_at = i + 1, j + 1
+    return regions
+
+
+def _diff_blobs(
+    repository: Repository, change: FileChange, old_sha: str, new_sha: str,
+    on_added_line: Optional[AddedLineCallback],
+):
+    shas = [sha for sha, present in ((old_sha, change.status != "A"), (new_sha, change.status != "D")) if present]
+    for sha in shas:
+        size = repository.object_info(sha)[1]
+        if size > TREE_DIFF_MAX_BLOB_BYTES:
+            raise GitObjectError(f"{change.path}: blob of {size} bytes exceeds the in-process diff limit")
+    old = repository.read_blob(old_sha) if change.status != "A" else b""
+    new = repository.read_blob(new_sha) if change.status != "D" else b""
+    if b"\0" in old[:_BINARY_SNIFF_BYTES] or b"\0" in new[:_BINARY_SNIFF_BYTES]:
+        change.binary = True
+        return
+    new_lines = _split_lines(new)
+    change.added = change.deleted = 0
+    for old_start, old_end, new_start, new_end in _changed_regions(_split_lines(old), new_lines):
+        # -U0 hunk headers: an empty side names the line before the change
+        change.hunks.append(Hunk(
+            old_start + 1 if old_end > old_start else old_start, old_end - old_start,
+            new_start + 1 if new_end > new_start else new_start, new_end - new_start,
+        ))
+        change.added += new_end - new_start
+        change.deleted += old_end - old_start
+        if on_added_line is not None:
+            for index in range(new_start, new_end):
+                on_added_line(change.path, index + 1, new_lines[index].decode("utf-8", errors="replace").rstrip("\r\n"))
+
+
+def read_tree_diff(
+    repository: Repository, rev_args: Sequence[str], on_added_line: Optional[AddedLineCallback] = None
+) -> DiffData:
+    """In-process read_diff() for `A...B` or `A B` revisions.
+
+    Raises GitObjectError for anything it cannot read or express within the
+    TREE_DIFF_* bounds; `on_added_line` may already have seen some lines.
+    """
+    if len(rev_args) == 1 and "..." in rev_args[0]:
+        base, head = rev_args[0].split("...", 1)
+        head_sha = repository.resolve(head or "HEAD")
+        old_sha = repository.merge_base(repository.resolve(base or "HEAD"), head_sha)
+    elif len(rev_args) == 2 and not any(arg.startswith("-") or ".." in arg for arg in rev_args):
+        old_sha, head_sha = repository.resolve(rev_args[0]), repository.resolve(rev_args[1])
+    else:
+        raise GitObjectError(f"unsupported revisions {list(rev_args)}")
+
+    old_tree = repository.commit(old_sha).tree
+    new_tree = repository.commit(head_sha).tree
+    files = []
+    for tree_change in repository.diff_trees(old_tree, new_tree):
+        change = FileChange(
+            tree_change.path, tree_change.status, tree_change.old_path, tree_change.similarity,
+            tree_change.old_mode, tree_change.new_mode,
+        )
+        if SUBMODULE_MODE not in (tree_change.old_mode, tree_change.new_mode):
+            _diff_blobs(repository, change, tree_change.old_sha, tree_change.new_sha, on_added_line)
+        files.append(change)
+    return DiffData(files)
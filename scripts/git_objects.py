@@ -0,0 +1,790 @@
+#!/usr/bin/env python3
+"""
+Git Objects — read-only, in-process access to the repository's object store
+
+Reads what the governance checks need without spawning `git`:
+- Refs: HEAD, loose and packed refs, symbolic refs, `rev^n` / `rev~n`
+- Objects: zlib loose objects and mmap'd packfiles looked up through their
+  v2 `.idx` (fan-out table + binary search), with OFS/REF delta chains
+- Commits and trees, merge bases, `rev-list --objects` style object walks
+- Name-status tree diffs with rename detection (exact, then by git's
+  chunk-hash similarity score, within a size cap and a work budget)
+
+Anything it cannot read (SHA-256 repositories, v1 pack indexes, missing or
+shallow history, unsupported rev syntax) raises GitObjectError, and callers
+fall back to the git CLI.
+
+Set GIT_OBJECT_BACKEND=cli to always use the git CLI.
+
+Dependencies: Python 3.7+
+"""
+
+import heapq
+import mmap
+import os
+import re
+import struct
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+GIT_OBJECT_BACKEND = os.getenv("GIT_OBJECT_BACKEND", "auto")
+
+# Pack entry type codes
+_PACK_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_OFS_DELTA, _REF_DELTA = 6, 7
+
+# Resolved delta bases kept per pack (delta chains share bases)
+_BASE_CACHE_SIZE = 256
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+_REV_RE = re.compile(r"^(.*?)((?:[\^~]\d*)*)$")
+_REV_SUFFIX_RE = re.compile(r"([\^~])(\d*)")
+
+TREE_MODE = "40000"
+SUBMODULE_MODE = "160000"
+NULL_SHA = "0" * 40
+
+# Rename detection: git's default -M threshold; the largest blob scored by
+# content; and a budget of chunks hashed plus signature entries compared over
+# all pairs (git's diff.renameLimit analogue). Past either bound diff_trees()
+# raises GitObjectError so callers ask the git CLI instead.
+RENAME_THRESHOLD = 50
+RENAME_MAX_BLOB_BYTES = 1 << 20
+RENAME_WORK_LIMIT = 10_000_000
+
+# Chunks hashed for similarity, as in git's diffcore-delta: up to 64 bytes,
+# ending early after a newline
+_CHUNK_RE = re.compile(rb"[^\n]{0,63}\n|[^\n]{1,64}")
+
+
+class GitObjectError(Exception):
+    """The object store cannot answer in-process; use the git CLI instead."""
+
+
+class Commit(NamedTuple):
+    sha: str
+    tree: str
+    parents: Tuple[str, ...]
+    committed: int
+
+
+class TreeEntry(NamedTuple):
+    mode: str
+    name: str
+    sha: str
+
+
+class TreeChange(NamedTuple):
+    """One path in a name-status diff (git raw-format modes)."""
+
+    status: str
+    path: str
+    old_path: Optional[str]
+    old_mode: str
+    new_mode: str
+    old_sha: str
+    new_sha: str
+    similarity: Optional[int] = None
+
+
+def _raw_mode(mode: str) -> str:
+    return mode.rjust(6, "0")
+
+
+class PackIndex:
+    """Version 2 pack index: SHA → offset in the matching .pack."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != b"\377tOc" or struct.unpack(">I", self._map[4:8])[0] != 2:
+            raise GitObjectError(f"unsupported pack index {path.name}")
+        self._fanout = struct.unpack(">256I", self._map[8:8 + 1024])
+        self.count = self._fanout[255]
+        self._names = 8 + 1024
+        self._offsets = self._names + 24 * self.count  # names, then 4-byte CRCs
+        self._large = self._offsets + 4 * self.count
+
+    def _name(self, i: int) -> bytes:
+        start = self._names + 20 * i
+        return self._map[start:start + 20]
+
+    def find(self, binsha: bytes) -> Optional[int]:
+        """Pack offset of an object, or None when it is not in this pack."""
+        first = binsha[0]
+        lo = self._fanout[first - 1] if first else 0
+        hi = self._fanout[first]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name = self._name(mid)
+            if name < binsha:
+                lo = mid + 1
+            elif name > binsha:
+                hi = mid
+            else:
+                start = self._offsets + 4 * mid
+                offset = struct.unpack(">I", self._map[start:start + 4])[0]
+                if offset & 0x80000000:
+                    start = self._large + 8 * (offset & 0x7FFFFFFF)
+                    offset = struct.unpack(">Q", self._map[start:start + 8])[0]
+                return offset
+        return None
+
+
+def _inflate(data: memoryview, offset: int, size: int, limit: Optional[int] = None) -> bytes:
+    """Decompress a zlib stream starting at `offset` (up to `limit` bytes of output)."""
+    decompressor = zlib.decompressobj()
+    chunk = max(size + 64, 4096)
+    want = size if limit is None else min(size, limit)
+    out = []
+    produced = 0
+    position = offset
+    while produced < want and not decompressor.eof:
+        piece = data[position:position + chunk]
+        if not piece:
+            raise GitObjectError("truncated pack entry")
+        position += len(piece)
+        result = decompressor.decompress(piece, want - produced)
+        while result:
+            out.append(result)
+            produced += len(result)
+            if produced >= want:
+                break
+            result = decompressor.decompress(decompressor.unconsumed_tail, want - produced)
+    return b"".join(out)
+
+
+def _delta_sizes(delta: bytes) -> Tuple[int, int, int]:
+    """(source size, target size, position of the first instruction)."""
+    sizes = []
+    position = 0
+    for _ in range(2):
+        value = shift = 0
+        while True:
+            byte = delta[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        sizes.append(value)
+    return sizes[0], sizes[1], position
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild an object from its base and a git delta."""
+    source_size, target_size, position = _delta_sizes(delta)
+    if source_size != len(base):
+        raise GitObjectError("delta base size mismatch")
+    out = bytearray()
+    end = len(delta)
+    while position < end:
+        command = delta[position]
+        position += 1
+        if command & 0x80:
+            offset = size = 0
+            for bit in range(4):
+                if command & (1 << bit):
+                    offset |= delta[position] << (8 * bit)
+                    position += 1
+            for bit in range(3):
+                if command & (0x10 << bit):
+                    size |= delta[position] << (8 * bit)
+                    position += 1
+            out += base[offset:offset + (size or 0x10000)]
+        elif command:
+            out += delta[position:position + command]
+            position += command
+        else:
+            raise GitObjectError("invalid delta instruction")
+    if len(out) != target_size:
+        raise GitObjectError("delta result size mismatch")
+    return bytes(out)
+
+
+class Pack:
+    """An mmap'd packfile with its index."""
+
+    def __init__(self, pack_path: Path, repository: "Repository"):
+        self.index = PackIndex(pack_path.with_suffix(".idx"))
+        with open(pack_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != b"PACK":
+            raise GitObjectError(f"not a packfile: {pack_path.name}")
+        self._view = memoryview(self._map)
+        self._repository = repository
+        self._bases: "OrderedDict[int, Tuple[str, bytes]]" = OrderedDict()
+
+    def _entry(self, offset: int) -> Tuple[int, int, int, Optional[object]]:
+        """(type code, size, data offset, delta base) of the entry at `offset`."""
+        data = self._map
+        byte = data[offset]
+        kind = (byte >> 4) & 7
+        size = byte & 0x0F
+        shift = 4
+        position = offset + 1
+        while byte & 0x80:
+            byte = data[position]
+            position += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+        base = None
+        if kind == _OFS_DELTA:
+            byte = data[position]
+            position += 1
+            distance = byte & 0x7F
+            while byte & 0x80:
+                byte = data[position]
+                position += 1
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+            base = offset - distance
+        elif kind == _REF_DELTA:
+            base = data[position:position + 20].hex()
+            position += 20
+        return kind, size, position, base
+
+    def read(self, offset: int) -> Tuple[str, bytes]:
+        """(type, content) of the object at `offset`, resolving delta chains."""
+        deltas = []
+        while True:
+            cached = self._bases.get(offset)
+            if cached is not None:
+                self._bases.move_to_end(offset)
+                kind_name, data = cached
+                break
+            kind, size, position, base = self._entry(offset)
+            if kind in _PACK_TYPES:
+                kind_name, data = _PACK_TYPES[kind], _inflate(self._view, position, size)
+                break
+            deltas.append((offset, _inflate(self._view, position, size)))
+            if kind == _OFS_DELTA:
+                offset = base
+            elif kind == _REF_DELTA:
+                base_offset = self.index.find(bytes.fromhex(base))
+                if base_offset is None:
+                    # Thin pack: the base lives elsewhere in the repository
+                    kind_name, data = self._repository.read_object(base)
+                    break
+                offset = base_offset
+            else:
+                raise GitObjectError(f"unknown pack entry type {kind}")
+        for delta_offset, delta in reversed(deltas):
+            data = apply_delta(data, delta)
+            self._remember(delta_offset, kind_name, data)
+        return kind_name, data
+
+    def _remember(self, offset: int, kind_name: str, data: bytes):
+        self._bases[offset] = (kind_name, data)
+        if len(self._bases) > _BASE_CACHE_SIZE:
+            self._bases.popitem(last=False)
+
+    def info(self, offset: int) -> Tuple[str, int]:
+        """(type, size) without inflating whole objects."""
+        kind, size, position, base = self._entry(offset)
+        if kind in _PACK_TYPES:
+            return _PACK_TYPES[kind], size
+        # The target size heads the delta; the type is the base's
+        head = _inflate(self._view, position, size, limit=32)
+        target_size = _delta_sizes(head)[1]
+        if kind == _OFS_DELTA:
+            return self.info(base)[0], target_size
+        base_offset = self.index.find(bytes.fromhex(base))
+        base_type = self.info(base_offset)[0] if base_offset is not None else self._repository.object_info(base)[0]
+        return base_type, target_size
+
+
+class _SimilarityScorer:
+    """Rename scores for one diff_trees() call, within RENAME_WORK_LIMIT.
+
+    Each blob is reduced once to a signature (chunk → bytes), so scoring a
+    pair costs one pass over the smaller signature rather than a line diff.
+    """
+
+    def __init__(self, repository: "Repository"):
+        self.repository = repository
+        self.work = 0
+        self._sizes: Dict[str, int] = {}
+        self._signatures: Dict[str, Dict[bytes, int]] = {}
+
+    def _spend(self, amount: int):
+        self.work += amount
+        if self.work > RENAME_WORK_LIMIT:
+            raise GitObjectError("rename detection exceeds the in-process work limit")
+
+    def _size(self, sha: str) -> int:
+        if sha not in self._sizes:
+            self._sizes[sha] = self.repository.object_info(sha)[1]
+        return self._sizes[sha]
+
+    def _signature(self, sha: str) -> Dict[bytes, int]:
+        signature = self._signatures.get(sha)
+        if signature is None:
+            if self._size(sha) > RENAME_MAX_BLOB_BYTES:
+                raise GitObjectError(f"blob {sha} is too large for in-process rename detection")
+            chunks = _CHUNK_RE.findall(self.repository.read_blob(sha))
+            self._spend(len(chunks))
+            signature = {}
+            for chunk in chunks:
+                signature[chunk] = signature.get(chunk, 0) + len(chunk)
+            self._signatures[sha] = signature
+        return signature
+
+    def score(self, old_sha: str, new_sha: str) -> int:
+        """Percentage of content kept, as git scores renames (copied / larger size)."""
+        old_size, new_size = self._size(old_sha), self._size(new_sha)
+        larger = max(old_size, new_size)
+        if not larger or min(old_size, new_size) * 100 < larger * RENAME_THRESHOLD:
+            return 0
+        smaller, other = sorted((self._signature(old_sha), self._signature(new_sha)), key=len)
+        self._spend(len(smaller))
+        copied = sum(min(count, other.get(chunk, 0)) for chunk, count in smaller.items())
+        return copied * 100 // larger
+
+
+def find_git_dir(path: Path) -> Path:
+    """The .git directory for a work tree (handles `gitdir:` files)."""
+    path = Path(path).resolve()
+    for candidate in (path, *path.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir:"):
+                return (candidate / content[len("gitdir:"):].strip()).resolve()
+        if (candidate / "HEAD").is_file() and (candidate / "objects").is_dir():
+            return candidate
+    raise GitObjectError(f"not a git repository: {path}")
+
+
+class Repository:
+    """Read-only view of a repository's refs and objects."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.git_dir = find_git_dir(path)
+        common = self.git_dir / "commondir"
+        self.common_dir = (self.git_dir / common.read_text().strip()).resolve() if common.is_file() else self.git_dir
+        self._check_config()
+        self._object_dirs = [self.common_dir / "objects"]
+        alternates = self.common_dir / "objects" / "info" / "alternates"
+        if alternates.is_file():
+            for line in alternates.read_text().splitlines():
+                if line.strip() and not line.startswith("#"):
+                    self._object_dirs.append((self.common_dir / "objects" / line.strip()).resolve())
+        self._packs: Optional[List[Pack]] = None
+        self._packed_refs: Optional[Dict[str, str]] = None
+        self._commits: Dict[str, Commit] = {}
+
+    def _check_config(self):
+        try:
+            config = (self.common_dir / "config").read_text()
+        except OSError:
+            return
+        if re.search(r"^\s*objectformat\s*=\s*sha256", config, re.MULTILINE | re.IGNORECASE):
+            raise GitObjectError("SHA-256 repositories are not supported")
+
+    # -- objects -------------------------------------------------------------
+
+    @property
+    def packs(self) -> List[Pack]:
+        if self._packs is None:
+            packs = []
+            for objects in self._object_dirs:
+                for pack_path in sorted((objects / "pack").glob("*.pack")):
+                    if pack_path.with_suffix(".idx").is_file():
+                        try:
+                            packs.append(Pack(pack_path, self))
+                        except (OSError, ValueError) as e:
+                            raise GitObjectError(f"cannot map {pack_path.name}: {e}")
+            self._packs = packs
+        return self._packs
+
+    def _loose(self, sha: str) -> Optional[bytes]:
+        for objects in self._object_dirs:
+            try:
+                with open(objects / sha[:2] / sha[2:], "rb") as f:
+                    return zlib.decompress(f.read())
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _packed(self, sha: str) -> Optional[Tuple[Pack, int]]:
+        binsha = bytes.fromhex(sha)
+        for pack in self.packs:
+            offset = pack.index.find(binsha)
+            if offset is not None:
+                return pack, offset
+        return None
+
+    def read_object(self, sha: str) -> Tuple[str, bytes]:
+        """(type, content) of an object."""
+        try:
+            return self._read_object(sha)
+        except (zlib.error, IndexError, ValueError) as e:
+            raise GitObjectError(f"corrupt object {sha}: {e}")
+
+    def _read_object(self, sha: str) -> Tuple[str, bytes]:
+        raw = self._loose(sha)
+        if raw is not None:
+            header, _, content = raw.partition(b"\0")
+            return header.split(b" ", 1)[0].decode(), content
+        found = self._packed(sha)
+        if found is None:
+            raise GitObjectError(f"object {sha} not found")
+        pack, offset = found
+        return pack.read(offset)
+
+    def object_info(self, sha: str) -> Tuple[str, int]:
+        """(type, size) of an object."""
+        try:
+            return self._object_info(sha)
+        except (zlib.error, IndexError, ValueError) as e:
+            raise GitObjectError(f"corrupt object {sha}: {e}")
+
+    def _object_info(self, sha: str) -> Tuple[str, int]:
+        for objects in self._object_dirs:
+            try:
+                with open(objects / sha[:2] / sha[2:], "rb") as f:
+                    decompressor = zlib.decompressobj()
+                    head = b""
+                    while b"\0" not in head:
+                        chunk = f.read(64)
+                        if not chunk:
+                            break
+                        head += decompressor.decompress(chunk, 64)
+                kind, size = head.partition(b"\0")[0].split(b" ", 1)
+                return kind.decode(), int(size)
+            except FileNotFoundError:
+                continue
+        found = self._packed(sha)
+        if found is None:
+            raise GitObjectError(f"object {sha} not found")
+        pack, offset = found
+        return pack.info(offset)
+
+    def read_blob(self, sha: str) -> bytes:
+        kind, content = self.read_object(sha)
+        if kind != "blob":
+            raise GitObjectError(f"{sha} is a {kind}, not a blob")
+        return content
+
+    def commit(self, sha: str) -> Commit:
+        """Parsed commit (annotated tags are peeled)."""
+        cached = self._commits.get(sha)
+        if cached is not None:
+            return cached
+        kind, content = self.read_object(sha)
+        while kind == "tag":
+            target = content.split(b"\n", 1)[0].split(b" ", 1)[1].decode()
+            kind, content = self.read_object(target)
+        if kind != "commit":
+            raise GitObjectError(f"{sha} is a {kind}, not a commit")
+        tree, parents, committed = "", [], 0
+        for line in content.split(b"\n\n", 1)[0].split(b"\n"):
+            key, _, value = line.partition(b" ")
+            if key == b"tree":
+                tree = value.decode()
+            elif key == b"parent":
+                parents.append(value.decode())
+            elif key == b"committer":
+                committed = int(value.rsplit(b" ", 2)[1])
+        commit = Commit(sha, tree, tuple(parents), committed)
+        self._commits[sha] = commit
+        return commit
+
+    def tree(self, sha: str) -> List[TreeEntry]:
+        """Entries of a tree object, in git's order."""
+        kind, content = self.read_object(sha)
+        if kind != "tree":
+            raise GitObjectError(f"{sha} is a {kind}, not a tree")
+        entries = []
+        position = 0
+        while position < len(content):
+            space = content.index(b" ", position)
+            nul = content.index(b"\0", space)
+            entries.append(TreeEntry(
+                content[position:space].decode(),
+                content[space + 1:nul].decode("utf-8", errors="surrogateescape"),
+                content[nul + 1:nul + 21].hex(),
+            ))
+            position = nul + 21
+        return entries
+
+    # -- refs ----------------------------------------------------------------
+
+    def _packed_ref_map(self) -> Dict[str, str]:
+        if self._packed_refs is None:
+            refs = {}
+            try:
+                lines = (self.common_dir / "packed-refs").read_text().splitlines()
+            except OSError:
+                lines = []
+            for line in lines:
+                if line and line[0] not in "#^":
+                    sha, _, name = line.partition(" ")
+                    refs[name] = sha
+            self._packed_refs = refs
+        return self._packed_refs
+
+    def read_ref(self, name: str, depth: int = 0) -> Optional[str]:
+        """SHA a ref points to (following symbolic refs), or None."""
+        if depth > 5:
+            raise GitObjectError(f"symbolic ref loop at {name}")
+        for base in (self.git_dir, self.common_dir):
+            try:
+                value = (base / name).read_text().strip()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if value.startswith("ref:"):
+                return self.read_ref(value[4:].strip(), depth + 1)
+            if _SHA_RE.match(value):
+                return value
+        return self._packed_ref_map().get(name)
+
+    def refs(self) -> Dict[str, str]:
+        """Every ref under refs/ → SHA."""
+        refs = dict(self._packed_ref_map())
+        root = self.common_dir / "refs"
+        for directory, _, files in os.walk(root):
+            for name in files:
+                ref = Path(directory, name).relative_to(self.common_dir).as_posix()
+                sha = self.read_ref(ref)
+                if sha:
+                    refs[ref] = sha
+        return refs
+
+    def resolve(self, rev: str) -> str:
+        """SHA for a ref name or SHA with optional `^n` / `~n` suffixes."""
+        name, suffix = _REV_RE.match(rev).groups()
+        if not name:
+            raise GitObjectError(f"cannot resolve {rev!r}")
+
+        if _SHA_RE.match(name):
+            sha = name
+        else:
+            sha = None
+            candidates = [name] if name.startswith("refs/") or name == "HEAD" else [
+                name, f"refs/{name}", f"refs/tags/{name}", f"refs/heads/{name}",
+                f"refs/remotes/{name}", f"refs/remotes/{name}/HEAD",
+            ]
+            for candidate in candidates:
+                sha = self.read_ref(candidate)
+                if sha:
+                    break
+            if sha is None:
+                raise GitObjectError(f"unknown revision {name!r}")
+
+        for operator, count in _REV_SUFFIX_RE.findall(suffix):
+            count = int(count) if count else 1
+            commit = self.commit(sha)
+            if operator == "^":
+                if count == 0:
+                    sha = commit.sha
+                    continue
+                if count > len(commit.parents):
+                    raise GitObjectError(f"{rev!r}: no parent {count}")
+                sha = commit.parents[count - 1]
+            else:
+                for _ in range(count):
+                    if not commit.parents:
+                        raise GitObjectError(f"{rev!r}: history too short")
+                    commit = self.commit(commit.parents[0])
+                sha = commit.sha
+        return sha
+
+    # -- history -------------------------------------------------------------
+
+    def _walk(self, tips: Sequence[str]) -> Iterator[Commit]:
+        """Commits reachable from `tips`, newest committer date first."""
+        seen: Set[str] = set()
+        heap = []
+        for tip in tips:
+            commit = self.commit(tip)
+            if commit.sha not in seen:
+                seen.add(commit.sha)
+                heapq.heappush(heap, (-commit.committed, commit.sha))
+        while heap:
+            _, sha = heapq.heappop(heap)
+            commit = self.commit(sha)
+            yield commit
+            for parent in commit.parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    heapq.heappush(heap, (-self.commit(parent).committed, parent))
+
+    def ancestors(self, tips: Sequence[str]) -> Set[str]:
+        return {commit.sha for commit in self._walk(tips)}
+
+    def merge_base(self, a: str, b: str) -> str:
+        """Most recent common ancestor of two commits (like `git merge-base`)."""
+        reachable = self.ancestors([a])
+        for commit in self._walk([b]):
+            if commit.sha in reachable:
+                return commit.sha
+        raise GitObjectError(f"no merge base between {a} and {b}")
+
+    def iter_objects(self, include: Sequence[str], exclude: Sequence[str] = ()) -> Iterator[Tuple[str, str, str]]:
+        """(sha, type, path) of objects reachable from `include` but not `exclude`.
+
+        Mirrors `git rev-list --objects`: every object once, at the first path
+        it is seen under, walking commits newest first.
+        """
+        hidden = self.ancestors(exclude) if exclude else set()
+        seen: Set[str] = set()
+        # Objects already present at the excluded boundary are not new
+        for sha in exclude:
+            self._mark_tree(self.commit(sha).tree, seen)
+        for commit in self._walk(include):
+            if commit.sha in hidden:
+                continue
+            yield commit.sha, "commit", ""
+            if commit.tree in seen:
+                continue
+            seen.add(commit.tree)
+            yield commit.tree, "tree", ""
+            # Depth-first in entry order, like rev-list's tree traversal
+            stack = [(iter(self.tree(commit.tree)), "")]
+            while stack:
+                entries, prefix = stack[-1]
+                entry = next(entries, None)
+                if entry is None:
+                    stack.pop()
+                    continue
+                if entry.sha in seen or entry.mode == SUBMODULE_MODE:
+                    continue
+                seen.add(entry.sha)
+                path = f"{prefix}{entry.name}"
+                if entry.mode == TREE_MODE:
+                    yield entry.sha, "tree", path
+                    stack.append((iter(self.tree(entry.sha)), path + "/"))
+                else:
+                    yield entry.sha, "blob", path
+
+    def iter_blob_paths(self, include: Sequence[str], exclude: Sequence[str] = ()) -> Iterator[Tuple[str, str]]:
+        """(sha, path) for every path a blob new in `include` (not in `exclude`) is stored at.
+
+        Unlike iter_objects, a blob found under several paths is listed under
+        each of them: trees are walked once per (tree, directory) pair rather
+        than once per tree.
+        """
+        hidden = self.ancestors(exclude) if exclude else set()
+        old: Set[str] = set()
+        for sha in exclude:
+            self._mark_tree(self.commit(sha).tree, old)
+        walked: Set[Tuple[str, str]] = set()
+        listed: Set[Tuple[str, str]] = set()
+        for commit in self._walk(include):
+            if commit.sha in hidden:
+                continue
+            stack = [(commit.tree, "")]
+            while stack:
+                tree_sha, prefix = stack.pop()
+                # Everything under a tree present at the excluded boundary is old
+                if tree_sha in old or (tree_sha, prefix) in walked:
+                    continue
+                walked.add((tree_sha, prefix))
+                for entry in self.tree(tree_sha):
+                    path = f"{prefix}{entry.name}"
+                    if entry.mode == TREE_MODE:
+                        stack.append((entry.sha, path + "/"))
+                    elif entry.mode != SUBMODULE_MODE and entry.sha not in old and (entry.sha, path) not in listed:
+                        listed.add((entry.sha, path))
+                        yield entry.sha, path
+
+    def _mark_tree(self, tree_sha: str, seen: Set[str]):
+        stack = [tree_sha]
+        while stack:
+            sha = stack.pop()
+            if sha in seen:
+                continue
+            seen.add(sha)
+            for entry in self.tree(sha):
+                if entry.mode == TREE_MODE:
+                    stack.append(entry.sha)
+                elif entry.mode != SUBMODULE_MODE:
+                    seen.add(entry.sha)
+
+    # -- diffs ---------------------------------------------------------------
+
+    def diff_trees(self, old_tree: Optional[str], new_tree: Optional[str]) -> List[TreeChange]:
+        """Name-status changes between two trees, sorted by path.
+
+        Deleted and added blobs pair up as renames: identical content first,
+        then pairs at least RENAME_THRESHOLD percent similar, best first.
+        """
+        changes: List[TreeChange] = []
+        self._diff_tree(old_tree, new_tree, "", changes)
+        deleted = [i for i, change in enumerate(changes) if change.status == "D"]
+        added = [i for i, change in enumerate(changes) if change.status == "A"]
+        if not deleted or not added:
+            return changes
+
+        pairs = []
+        by_content: Dict[str, List[int]] = {}
+        for i in added:
+            by_content.setdefault(changes[i].new_sha, []).append(i)
+        for i in deleted:
+            if by_content.get(changes[i].old_sha):
+                pairs.append((100, i, by_content[changes[i].old_sha].pop(0)))
+        paired = {i for _, source, target in pairs for i in (source, target)}
+        sources = [i for i in deleted if i not in paired]
+        targets = [i for i in added if i not in paired]
+        if sources and targets:
+            scored = []
+            similarity = _SimilarityScorer(self)
+            for source in sources:
+                for target in targets:
+                    score = similarity.score(changes[source].old_sha, changes[target].new_sha)
+                    if score >= RENAME_THRESHOLD:
+                        scored.append((score, source, target))
+            scored.sort(key=lambda item: (-item[0], changes[item[2]].path))
+            for score, source, target in scored:
+                if source not in paired and target not in paired:
+                    pairs.append((score, source, target))
+                    paired.update((source, target))
+
+        result: List[Optional[TreeChange]] = list(changes)
+        for score, source, target in pairs:
+            old, new = changes[source], changes[target]
+            result[target] = TreeChange(
+                "R", new.path, old.path, old.old_mode, new.new_mode, old.old_sha, new.new_sha, score
+            )
+            result[source] = None
+        return sorted((change for change in result if change is not None), key=lambda change: change.path)
+
+    def _diff_tree(self, old_tree: Optional[str], new_tree: Optional[str], prefix: str, changes: List[TreeChange]):
+        old = {entry.name: entry for entry in self.tree(old_tree)} if old_tree else {}
+        new = {entry.name: entry for entry in self.tree(new_tree)} if new_tree else {}
+        for name in sorted(old.keys() | new.keys()):
+            before, after = old.get(name), new.get(name)
+            path = f"{prefix}{name}"
+            if before and after and before.sha == after.sha and before.mode == after.mode:
+                continue
+            before_tree = before is not None and before.mode == TREE_MODE
+            after_tree = after is not None and after.mode == TREE_MODE
+            if before_tree or after_tree:
+                self._diff_tree(
+                    before.sha if before_tree else None, after.sha if after_tree else None, path + "/", changes
+                )
+            if before is not None and not before_tree and (after is None or after_tree):
+                changes.append(TreeChange("D", path, None, _raw_mode(before.mode), "000000", before.sha, NULL_SHA))
+            elif after is not None and not after_tree and (before is None or before_tree):
+                changes.append(TreeChange("A", path, None, "000000", _raw_mode(after.mode), NULL_SHA, after.sha))
+            elif before is not None and after is not None and not before_tree and not after_tree:
+                status = "M" if (int(before.mode, 8) & 0o170000) == (int(after.mode, 8) & 0o170000) else "T"
+                changes.append(TreeChange(
+                    status, path, None, _raw_mode(before.mode), _raw_mode(after.mode), before.sha, after.sha
+                ))
+
+
+def open_repository(path: Path) -> Repository:
+    """In-process repository reader, or GitObjectError when the CLI must be used."""
+    if GIT_OBJECT_BACKEND == "cli":
+        raise GitObjectError("GIT_OBJECT_BACKEND=cli")
+    try:
+        return Repository(path)
+    except (OSError, ValueError) as e:
+        raise GitObjectError(str(e))
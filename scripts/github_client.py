@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+GitHub API Client — shared HTTP layer for the board member scripts
+
+Wraps GitHub REST/GraphQL access behind a single pooled session:
+- Connections are reused across calls (no TLS handshake per request)
+- GET responses are cached on disk keyed by URL and revalidated with
+  If-None-Match / If-Modified-Since, so unchanged data is served from a 304
+- Cache hit/miss counts are tracked per run for reporting
+- List endpoints are streamed page by page following `Link: rel="next"`
+- A rate-limit scheduler paces requests from X-RateLimit-* headers, honors
+  Retry-After, retries throttled/5xx responses with jittered backoff and
+  accounts for the calls spent per run
+- Traffic can be recorded to a gzip archive and replayed offline
+- Blocking calls can be fanned out on an asyncio loop with bounded concurrency
+
+Dependencies: Python 3.6+, requests (installed in GitHub Actions)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONCURRENCY = 8
+
+# Rate-limit scheduling defaults
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_CAP = 60.0
+DEFAULT_MAX_WAIT = 900.0  # never sleep longer than this for a reset
+DEFAULT_RESERVE = 50  # calls left untouched for other automation on the token
+DEFAULT_PACE_FRACTION = 0.1  # start pacing below this fraction of the limit
+RETRYABLE_STATUS = {500, 502, 503, 504}
+
+# Record/replay archive format
+REPLAY_FORMAT = "github-replay"
+REPLAY_VERSION = 1
+RECORDED_HEADERS = [
+    "ETag",
+    "Last-Modified",
+    "Link",
+    "Retry-After",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+    "X-RateLimit-Resource",
+]
+
+_LINK_NEXT_RE = re.compile(r'<([^>]+)>\s*;\s*rel="?next"?')
+
+
+def parse_next_link(link_header: Optional[str]) -> Optional[str]:
+    """Extract the rel="next" URL from a Link header, if any."""
+    if not link_header:
+        return None
+    match = _LINK_NEXT_RE.search(link_header)
+    return match.group(1) if match else None
+
+
+class GraphQLError(RuntimeError):
+    """Raised when a GraphQL response carries an `errors` payload."""
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when the run budget is spent or a reset is too far away."""
+
+
+class RateLimitScheduler:
+    """Paces and retries GitHub requests based on rate-limit feedback.
+
+    State is tracked per rate-limit resource (core, graphql, ...) from the
+    X-RateLimit-* headers of every response. Before each call the scheduler
+    enforces the optional run budget, and once `remaining` drops below
+    `pace_fraction` of the limit it spreads the remaining calls (minus a
+    reserve) over the time left until reset.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        reserve: int = DEFAULT_RESERVE,
+        pace_fraction: float = DEFAULT_PACE_FRACTION,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.budget = budget
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self.pace_fraction = pace_fraction
+        self._sleep = sleep
+        self._clock = clock
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.not_modified = 0
+        self.retries = 0
+        self.waited = 0.0
+        # resource -> {"limit", "remaining", "reset"}
+        self.limits: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def resource_for(url: str) -> str:
+        return "graphql" if url.rstrip("/").endswith("/graphql") else "core"
+
+    def before_request(self, resource: str):
+        """Enforce the run budget and pace calls when the limit runs low."""
+        with self._lock:
+            if self.budget is not None and self.calls >= self.budget:
+                raise RateLimitExceeded(f"API budget of {self.budget} calls spent")
+            delay = self._pacing_delay(resource)
+            self.calls += 1
+        if delay > 0:
+            self.wait(delay)
+
+    def _pacing_delay(self, resource: str) -> float:
+        state = self.limits.get(resource)
+        if not state:
+            return 0.0
+        window = state["reset"] - self._clock()
+        if window <= 0:
+            return 0.0
+        spare = state["remaining"] - self.reserve
+        if spare <= 0:
+            if window > self.max_wait:
+                raise RateLimitExceeded(
+                    f"{resource} rate limit exhausted, resets in {int(window)}s"
+                )
+            return window
+        if state["remaining"] < state["limit"] * self.pace_fraction:
+            return window / spare
+        return 0.0
+
+    def observe(self, response: Any, resource: str):
+        """Record rate-limit headers from a response."""
+        headers = response.headers
+        if response.status_code == 304:
+            with self._lock:
+                self.not_modified += 1
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        resource = headers.get("X-RateLimit-Resource", resource)
+        try:
+            state = {
+                "limit": float(headers.get("X-RateLimit-Limit", remaining)),
+                "remaining": float(remaining),
+                "reset": float(reset),
+            }
+        except ValueError:
+            return
+        with self._lock:
+            self.limits[resource] = state
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with equal jitter."""
+        cap = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        return cap / 2 + self._jitter() * cap / 2
+
+    def retry_delay(self, response: Any, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the response is final."""
+        if attempt >= self.max_retries:
+            return None
+        status = response.status_code
+        headers = response.headers
+        if status in (403, 429):
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+            if headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+                return max(0.0, float(headers["X-RateLimit-Reset"]) - self._clock()) + 1
+            text = getattr(response, "text", "") or ""
+            if status == 429 or "rate limit" in text.lower():
+                return self.backoff(attempt)
+            return None
+        if status in RETRYABLE_STATUS:
+            return self.backoff(attempt)
+        return None
+
+    def wait(self, delay: float):
+        """Sleep for a scheduler-imposed delay, refusing overly long waits."""
+        if delay > self.max_wait:
+            raise RateLimitExceeded(f"refusing to wait {int(delay)}s for rate limit reset")
+        with self._lock:
+            self.waited += delay
+        self._sleep(delay)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def summary(self) -> str:
+        charged = self.calls - self.not_modified
+        parts = [
+            f"{self.calls} calls sent",
+            f"{charged} charged",
+            f"{self.retries} retries",
+            f"{self.waited:.1f}s waited",
+        ]
+        for resource, state in sorted(self.limits.items()):
+            parts.append(f"{resource} {int(state['remaining'])}/{int(state['limit'])} remaining")
+        return ", ".join(parts)
+
+
+class CacheStats:
+    """Per-run counters for the conditional-request cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        return f"{self.hits} hits, {self.misses} misses ({total} GET requests)"
+
+
+class ResponseCache:
+    """On-disk cache of GitHub GET responses keyed by URL.
+
+    Each entry stores the validators (ETag / Last-Modified), the decoded
+    JSON body and the Link header so that a 304 Not Modified can be
+    answered locally, including pagination.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _entry_path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def load(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a URL, or None if absent/corrupt."""
+        path = self._entry_path(url)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url:
+            return None
+        return entry
+
+    def store(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body: Any,
+        link: Optional[str] = None,
+    ):
+        """Persist a response atomically (safe with concurrent writers)."""
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "link": link,
+            "body": body,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, str(self._entry_path(url)))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Build revalidation headers for a cached entry."""
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+def create_pooled_session(pool_size: int = DEFAULT_POOL_SIZE):
+    """Create a requests.Session whose connection pool fits `pool_size` workers."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class GitHubClient:
+    """Pooled GitHub API client with an optional conditional-request cache."""
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        cache: Optional[ResponseCache] = None,
+        session: Any = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        scheduler: Optional[RateLimitScheduler] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers)
+        self.cache = cache
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.stats = CacheStats()
+        self.scheduler = scheduler or RateLimitScheduler()
+        self._session = session
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Lazily create the shared requests.Session with a sized pool."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = create_pooled_session(self.pool_size)
+        return self._session
+
+    def close(self):
+        """Close the underlying session (flushes a recording archive)."""
+        if self._session is not None:
+            self._session.close()
+
+    def url_for(self, endpoint: str) -> str:
+        """Resolve an endpoint path (or absolute URL) against the API base."""
+        if endpoint.startswith("http://") or endpoint.startswith("https://"):
+            return endpoint
+        return f"{self.base_url}{endpoint}"
+
+    def _send(self, method: str, url: str, **kwargs) -> Any:
+        """Send a request through the rate-limit scheduler, retrying as advised."""
+        resource = RateLimitScheduler.resource_for(url)
+        send = getattr(self.session, method)
+        attempt = 0
+        while True:
+            self.scheduler.before_request(resource)
+            try:
+                response = send(url, timeout=self.timeout, **kwargs)
+            except OSError:
+                # Connection errors and timeouts (requests' exceptions are OSErrors)
+                if attempt >= self.scheduler.max_retries:
+                    raise
+                delay = self.scheduler.backoff(attempt)
+            else:
+                self.scheduler.observe(response, resource)
+                delay = self.scheduler.retry_delay(response, attempt)
+                if delay is None:
+                    return response
+            self.scheduler.record_retry()
+            self.scheduler.wait(delay)
+            attempt += 1
+
+    def get(self, endpoint: str) -> Any:
+        """GET an endpoint and return decoded JSON.
+
+        Raises on HTTP errors; callers decide how to surface them.
+        """
+        body, _ = self.get_page(endpoint)
+        return body
+
+    def get_page(self, endpoint: str) -> Tuple[Any, Optional[str]]:
+        """GET one page and return (decoded JSON, next page URL or None)."""
+        url = self.url_for(endpoint)
+        entry = self.cache.load(url) if self.cache else None
+
+        headers = dict(self.headers)
+        headers.update(ResponseCache.conditional_headers(entry))
+
+        response = self._send("get", url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.stats.record_hit()
+            return entry["body"], parse_next_link(entry.get("link"))
+
+        response.raise_for_status()
+        body = response.json()
+        self.stats.record_miss()
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        link = response.headers.get("Link")
+        if self.cache and (etag or last_modified):
+            self.cache.store(url, etag, last_modified, body, link)
+        return body, parse_next_link(link)
+
+    def paginate(self, endpoint: str, limit: Optional[int] = None) -> Iterator[Any]:
+        """Stream items from a list endpoint, following Link rel="next".
+
+        Only one page is held in memory at a time. Stops after `limit`
+        items when given, without requesting further pages.
+        """
+        if limit is not None and limit <= 0:
+            return
+        yielded = 0
+        next_url: Optional[str] = endpoint
+        while next_url:
+            page, next_url = self.get_page(next_url)
+            if not isinstance(page, list):
+                return
+            for item in page:
+                yield item
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+
+    def post(self, endpoint: str, payload: Dict) -> Any:
+        """POST a JSON payload (e.g. a GraphQL query) and return decoded JSON."""
+        response = self._send("post", self.url_for(endpoint), headers=self.headers, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def graphql(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """Run a GraphQL query and return its `data` object."""
+        body = self.post("/graphql", {"query": query, "variables": variables or {}})
+        if body.get("errors"):
+            messages = "; ".join(e.get("message", str(e)) for e in body["errors"])
+            raise GraphQLError(messages)
+        return body.get("data") or {}
+
+
+async def _gather_bounded(
+    func: Callable[[Any], Any],
+    items: List[Any],
+    concurrency: int,
+    executor: ThreadPoolExecutor,
+) -> List[Any]:
+    """Run func over items on the executor with at most `concurrency` in flight."""
+    loop = asyncio.get_event_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(item):
+        async with semaphore:
+            return await loop.run_in_executor(executor, func, item)
+
+    return await asyncio.gather(*(run_one(item) for item in items))
+
+
+def map_concurrent(func: Callable[[Any], Any], items: Iterable[Any], concurrency: int = DEFAULT_CONCURRENCY) -> List[Any]:
+    """Apply a blocking function to items concurrently, preserving input order.
+
+    Drives a private asyncio event loop, so it can be called from ordinary
+    synchronous code such as a script's main(). With concurrency <= 1 the
+    calls run serially in the calling thread.
+    """
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(_gather_bounded(func, items, concurrency, executor))
+    finally:
+        loop.close()
+        executor.shutdown(wait=True)
+
+
+def _request_key(method: str, url: str, payload: Optional[Dict]) -> str:
+    """Stable lookup key for a request: method, URL and canonical JSON body."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":")) if payload is not None else ""
+    return f"{method.upper()} {url} {body}"
+
+
+class ReplayResponse:
+    """Response object rebuilt from an archive entry."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], body: Any):
+        self.status_code = status_code
+        self.headers = headers
+        self._body = body
+        self.text = json.dumps(body) if body is not None else ""
+
+    def json(self) -> Any:
+        if self._body is None:
+            raise ValueError("Recorded response has no JSON body")
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code} (replayed)")
+
+
+class RecordingSession:
+    """Session wrapper that appends every exchange to a gzip JSON-lines archive.
+
+    The first line is a header carrying the capture time; each following line
+    holds one request key with the response status, selected headers and body.
+    """
+
+    def __init__(self, inner: Any, archive_path: Path, captured_at: str):
+        self.inner = inner
+        self.archive_path = Path(archive_path)
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._out = gzip.open(str(self.archive_path), "wt", encoding="utf-8")
+        self._write({"format": REPLAY_FORMAT, "version": REPLAY_VERSION, "captured_at": captured_at})
+
+    def _write(self, record: Dict):
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._out.write(line + "\n")
+
+    def _record(self, method: str, url: str, payload: Optional[Dict], response: Any) -> Any:
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        headers = {h: response.headers[h] for h in RECORDED_HEADERS if response.headers.get(h) is not None}
+        self._write({
+            "key": _request_key(method, url, payload),
+            "status": response.status_code,
+            "headers": headers,
+            "body": body,
+        })
+        return response
+
+    def get(self, url, headers=None, timeout=None):
+        return self._record("GET", url, None, self.inner.get(url, headers=headers, timeout=timeout))
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        return self._record("POST", url, json, self.inner.post(url, headers=headers, json=json, timeout=timeout))
+
+    def close(self):
+        with self._lock:
+            self._out.close()
+
+
+class ReplayMissError(LookupError):
+    """Raised when replaying a request that is not in the archive."""
+
+
+class ReplaySession:
+    """Offline session that answers requests from a recorded archive.
+
+    Repeated requests are answered in recorded order; once exhausted, the
+    last recorded response for that key keeps being returned.
+    """
+
+    def __init__(self, archive_path: Path):
+        self.archive_path = Path(archive_path)
+        self.captured_at: Optional[str] = None
+        self._responses: Dict[str, List[Dict]] = {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        with gzip.open(str(self.archive_path), "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != REPLAY_FORMAT:
+                raise ValueError(f"{self.archive_path} is not a {REPLAY_FORMAT} archive")
+            self.captured_at = header.get("captured_at")
+            for line in f:
+                entry = json.loads(line)
+                self._responses.setdefault(entry["key"], []).append(entry)
+
+    def _replay(self, method: str, url: str, payload: Optional[Dict]) -> ReplayResponse:
+        key = _request_key(method, url, payload)
+        with self._lock:
+            self.requests += 1
+            entries = self._responses.get(key)
+            if not entries:
+                raise ReplayMissError(f"No recorded response for {method} {url}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            entry = entries[min(position, len(entries) - 1)]
+        return ReplayResponse(entry["status"], dict(entry.get("headers") or {}), entry.get("body"))
+
+    def get(self, url, headers=None, timeout=None):
+        return self._replay("GET", url, None)
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        return self._replay("POST", url, json)
+
+    def close(self):
+        pass
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+GitHub GraphQL Data Source — batched open-PR and project fetch for the daily brief
+
+Fetches open pull requests page by page with everything the brief needs in
+the same round trip: labels, body, head commit statusCheckRollup and changed
+file paths. Nodes are normalized to the REST pull request shape so the
+renderers do not care which backend produced them. For incremental runs a
+light index pass lists open PRs with `updatedAt`/`headRefOid`, and only the
+PRs that changed are fetched in full by node id.
+
+Project v2 items are synced incrementally: a light cursor-paginated pass
+reads only item ids and `updatedAt`, and full details (content + Status
+field) are fetched by id only for items that changed since the local snapshot.
+
+Dependencies: Python 3.6+, requests (installed in GitHub Actions)
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from github_client import GitHubClient
+
+DEFAULT_PR_PAGE_SIZE = 50
+FILES_PAGE_SIZE = 100
+PROJECT_ITEMS_PAGE_SIZE = 100
+NODES_BATCH_SIZE = 100
+PROJECT_STATUS_FIELD = "Status"
+
+# Every PR field the brief renders, shared by the listing and by-id queries
+PULL_REQUEST_FIELDS = """
+fragment BriefPullRequest on PullRequest {
+  id
+  number
+  title
+  url
+  body
+  createdAt
+  updatedAt
+  headRefOid
+  author { login }
+  labels(first: 50) { nodes { name } }
+  files(first: 100) {
+    pageInfo { hasNextPage endCursor }
+    nodes { path }
+  }
+  commits(last: 1) {
+    nodes {
+      commit {
+        statusCheckRollup {
+          state
+          contexts(first: 100) {
+            totalCount
+            nodes {
+              __typename
+              ... on CheckRun { status conclusion }
+              ... on StatusContext { state }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+OPEN_PULL_REQUESTS_QUERY = """
+query($owner: String!, $repo: String!, $pageSize: Int!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequests(states: OPEN, first: $pageSize, after: $cursor,
+                 orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...BriefPullRequest }
+    }
+  }
+}
+""" + PULL_REQUEST_FIELDS
+
+OPEN_PULL_REQUEST_INDEX_QUERY = """
+query($owner: String!, $repo: String!, $pageSize: Int!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequests(states: OPEN, first: $pageSize, after: $cursor,
+                 orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { id number updatedAt headRefOid }
+    }
+  }
+}
+"""
+
+PULL_REQUEST_NODES_QUERY = """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) { ...BriefPullRequest }
+}
+""" + PULL_REQUEST_FIELDS
+
+PULL_REQUEST_FILES_QUERY = """
+query($owner: String!, $repo: String!, $number: Int!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequest(number: $number) {
+      files(first: 100, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes { path }
+      }
+    }
+  }
+}
+"""
+
+PROJECT_ITEM_INDEX_QUERY = """
+query($owner: String!, $repo: String!, $projectNumber: Int!, $pageSize: Int!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    projectV2(number: $projectNumber) {
+      items(first: $pageSize, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          id
+          updatedAt
+          content {
+            ... on Issue { updatedAt }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+PROJECT_ITEM_DETAILS_QUERY = """
+query($ids: [ID!]!, $statusField: String!) {
+  nodes(ids: $ids) {
+    ... on ProjectV2Item {
+      id
+      content {
+        ... on Issue {
+          number
+          title
+          state
+          url
+        }
+      }
+      fieldValueByName(name: $statusField) {
+        ... on ProjectV2ItemFieldSingleSelectValue { name }
+      }
+    }
+  }
+}
+"""
+
+# CheckRun conclusions that count as passing / failing
+_CHECK_RUN_SUCCESS = {"SUCCESS", "NEUTRAL", "SKIPPED"}
+_CHECK_RUN_FAILURE = {"FAILURE", "TIMED_OUT", "CANCELLED", "ACTION_REQUIRED", "STARTUP_FAILURE", "STALE"}
+
+
+def normalize_pull_request(node: Dict) -> Dict:
+    """Map a GraphQL PullRequest node to the REST pull request shape."""
+    author = node.get("author") or {}
+    return {
+        "node_id": node.get("id"),
+        "number": node.get("number"),
+        "title": node.get("title"),
+        "html_url": node.get("url"),
+        "body": node.get("body") or "",
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "user": {"login": author.get("login", "ghost")},
+        "labels": [{"name": label.get("name", "")} for label in (node.get("labels") or {}).get("nodes", [])],
+        "head": {"sha": node.get("headRefOid")},
+    }
+
+
+def rollup_counts(node: Dict) -> Tuple[str, int, int, int, int]:
+    """Summarize the head commit's statusCheckRollup.
+
+    Returns (state, total, passed, failed, pending) with REST-style lowercase
+    state, so callers can format it exactly like the combined status API.
+    """
+    commits = (node.get("commits") or {}).get("nodes") or []
+    rollup = None
+    if commits:
+        rollup = (commits[-1].get("commit") or {}).get("statusCheckRollup")
+    if not rollup:
+        return "pending", 0, 0, 0, 0
+
+    contexts = rollup.get("contexts") or {}
+    passed = failed = pending = 0
+    for ctx in contexts.get("nodes") or []:
+        if ctx.get("__typename") == "CheckRun":
+            if ctx.get("status") != "COMPLETED":
+                pending += 1
+            elif ctx.get("conclusion") in _CHECK_RUN_SUCCESS:
+                passed += 1
+            elif ctx.get("conclusion") in _CHECK_RUN_FAILURE:
+                failed += 1
+        else:
+            state = (ctx.get("state") or "").upper()
+            if state == "SUCCESS":
+                passed += 1
+            elif state in ("FAILURE", "ERROR"):
+                failed += 1
+            elif state in ("PENDING", "EXPECTED"):
+                pending += 1
+
+    total = contexts.get("totalCount", passed + failed + pending)
+    return (rollup.get("state") or "pending").lower(), total, passed, failed, pending
+
+
+def _remaining_files(client: GitHubClient, owner: str, repo: str, number: int, cursor: Optional[str]) -> List[str]:
+    """Page through the rest of a PR's files beyond the first batch."""
+    paths = []
+    while cursor:
+        data = client.graphql(
+            PULL_REQUEST_FILES_QUERY,
+            {"owner": owner, "repo": repo, "number": number, "cursor": cursor},
+        )
+        files = ((data.get("repository") or {}).get("pullRequest") or {}).get("files") or {}
+        paths.extend(f.get("path", "") for f in files.get("nodes") or [])
+        page_info = files.get("pageInfo") or {}
+        cursor = page_info.get("endCursor") if page_info.get("hasNextPage") else None
+    return paths
+
+
+def _complete_files(client: GitHubClient, owner: str, repo: str, node: Dict):
+    """Extend a node's first page of files in place when more pages exist."""
+    files = node.get("files") or {}
+    page_info = files.get("pageInfo") or {}
+    if page_info.get("hasNextPage"):
+        extra = _remaining_files(client, owner, repo, node.get("number"), page_info.get("endCursor"))
+        files["nodes"] = list(files.get("nodes") or []) + [{"path": p} for p in extra]
+        files["pageInfo"] = {"hasNextPage": False, "endCursor": None}
+
+
+def iter_open_pull_requests(
+    client: GitHubClient,
+    owner: str,
+    repo: str,
+    page_size: int = DEFAULT_PR_PAGE_SIZE,
+) -> Iterator[Tuple[Dict, Dict]]:
+    """Yield (raw_node, normalized_pr) for every open PR, one page at a time.
+
+    The node's `files` list is completed with follow-up queries when a PR
+    changes more than one page of files, so `file_paths(node)` is exhaustive.
+    """
+    cursor = None
+    while True:
+        data = client.graphql(
+            OPEN_PULL_REQUESTS_QUERY,
+            {"owner": owner, "repo": repo, "pageSize": page_size, "cursor": cursor},
+        )
+        connection = (data.get("repository") or {}).get("pullRequests") or {}
+        for node in connection.get("nodes") or []:
+            _complete_files(client, owner, repo, node)
+            yield node, normalize_pull_request(node)
+
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        cursor = page_info.get("endCursor")
+
+
+def iter_open_pull_request_versions(
+    client: GitHubClient,
+    owner: str,
+    repo: str,
+) -> Iterator[Dict]:
+    """Yield {id, number, updatedAt, headRefOid} for every open PR.
+
+    A light pass used to decide which PRs changed since the last run.
+    """
+    cursor = None
+    while True:
+        data = client.graphql(
+            OPEN_PULL_REQUEST_INDEX_QUERY,
+            {"owner": owner, "repo": repo, "pageSize": NODES_BATCH_SIZE, "cursor": cursor},
+        )
+        connection = (data.get("repository") or {}).get("pullRequests") or {}
+        for node in connection.get("nodes") or []:
+            if node and node.get("id"):
+                yield node
+
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        cursor = page_info.get("endCursor")
+
+
+def fetch_pull_requests(
+    client: GitHubClient,
+    owner: str,
+    repo: str,
+    node_ids: List[str],
+    batch_size: int = DEFAULT_PR_PAGE_SIZE,
+) -> Iterator[Tuple[Dict, Dict]]:
+    """Yield (raw_node, normalized_pr) for specific PRs, batched by node id."""
+    for start in range(0, len(node_ids), batch_size):
+        data = client.graphql(PULL_REQUEST_NODES_QUERY, {"ids": node_ids[start:start + batch_size]})
+        for node in data.get("nodes") or []:
+            if node and node.get("number") is not None:
+                _complete_files(client, owner, repo, node)
+                yield node, normalize_pull_request(node)
+
+
+def file_paths(node: Dict) -> Tuple[str, ...]:
+    """Changed file paths from a PullRequest node."""
+    return tuple(f.get("path", "") for f in ((node.get("files") or {}).get("nodes") or []))
+
+
+def _item_version(node: Dict) -> str:
+    """Change marker for a project item: its own and its issue's updatedAt."""
+    content = node.get("content") or {}
+    return f"{node.get('updatedAt')}|{content.get('updatedAt', '')}"
+
+
+def iter_project_item_versions(
+    client: GitHubClient,
+    owner: str,
+    repo: str,
+    project_number: int,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (item_id, version) for every project item, following cursors."""
+    cursor = None
+    while True:
+        data = client.graphql(
+            PROJECT_ITEM_INDEX_QUERY,
+            {
+                "owner": owner,
+                "repo": repo,
+                "projectNumber": project_number,
+                "pageSize": PROJECT_ITEMS_PAGE_SIZE,
+                "cursor": cursor,
+            },
+        )
+        project = (data.get("repository") or {}).get("projectV2") or {}
+        items = project.get("items") or {}
+        for node in items.get("nodes") or []:
+            if node and node.get("id"):
+                yield node["id"], _item_version(node)
+
+        page_info = items.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        cursor = page_info.get("endCursor")
+
+
+def parse_project_item(node: Dict) -> Optional[Dict]:
+    """Map a ProjectV2Item node to a brief item; None for non-issue content."""
+    content = node.get("content") or {}
+    if content.get("number") is None:
+        return None
+    status = (node.get("fieldValueByName") or {}).get("name")
+    return {
+        "number": content.get("number"),
+        "title": content.get("title"),
+        "state": content.get("state"),
+        "url": content.get("url"),
+        "status": status,
+    }
+
+
+def fetch_project_item_details(client: GitHubClient, item_ids: List[str]) -> Dict[str, Optional[Dict]]:
+    """Fetch content + Status for specific items, batched by node id."""
+    details = {}
+    for start in range(0, len(item_ids), NODES_BATCH_SIZE):
+        batch = item_ids[start:start + NODES_BATCH_SIZE]
+        data = client.graphql(
+            PROJECT_ITEM_DETAILS_QUERY,
+            {"ids": batch, "statusField": PROJECT_STATUS_FIELD},
+        )
+        for node in data.get("nodes") or []:
+            if node and node.get("id"):
+                details[node["id"]] = parse_project_item(node)
+    return details
+
+
+def _load_snapshot(snapshot_path: Path, scope: str) -> Dict[str, Dict]:
+    try:
+        with open(snapshot_path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if snapshot.get("scope") != scope:
+        return {}
+    return snapshot.get("items") or {}
+
+
+def _save_snapshot(snapshot_path: Path, scope: str, items: Dict[str, Dict]):
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(snapshot_path.parent), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump({"scope": scope, "items": items}, f)
+    os.replace(tmp_path, str(snapshot_path))
+
+
+def sync_project_items(
+    client: GitHubClient,
+    owner: str,
+    repo: str,
+    project_number: int,
+    snapshot_path: Path,
+) -> Tuple[List[Dict], int]:
+    """Return all issue items of a project, refetching only changed ones.
+
+    Items are deduplicated by node id and kept in board order. The snapshot
+    is rewritten after each sync so removed items drop out. Returns the
+    items and the number of item details that had to be fetched.
+    """
+    scope = f"{owner}/{repo}#{project_number}"
+    previous = _load_snapshot(Path(snapshot_path), scope)
+
+    versions = {}
+    for item_id, version in iter_project_item_versions(client, owner, repo, project_number):
+        versions[item_id] = version
+
+    changed = [
+        item_id for item_id, version in versions.items()
+        if item_id not in previous or previous[item_id].get("version") != version
+    ]
+    details = fetch_project_item_details(client, changed) if changed else {}
+
+    current = {}
+    for item_id, version in versions.items():
+        if item_id in details:
+            current[item_id] = {"version": version, "item": details[item_id]}
+        elif item_id in previous and item_id not in changed:
+            current[item_id] = previous[item_id]
+
+    _save_snapshot(Path(snapshot_path), scope, current)
+    items = [entry["item"] for entry in current.values() if entry.get("item")]
+    return items, len(changed)
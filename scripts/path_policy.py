@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Path Policy — compiled path classification shared by the validator and the brief
+
+Protected paths are documented as root-anchored globs (`GOVERNANCE/**`,
+`.github/workflows/**`, ...; see GOVERNANCE/GUARDRAILS.md). PathPolicy
+compiles such patterns into a trie of path segments:
+- A pattern without wildcards is a prefix: it matches the path itself and
+  everything under it (`STATE` matches `STATE/STATUS_LEDGER.md`)
+- A pattern with wildcards hangs its glob tail off the trie node of its
+  literal leading segments (`*` and `?` stay within a segment, `**` spans
+  any number of segments)
+- Classifying a path walks the trie once, segment by segment, and reports
+  which pattern matched, so a whole PR's file list costs one dictionary
+  lookup per path segment however many patterns there are
+
+Dependencies: Python 3.7+
+"""
+
+import re
+from pathlib import PurePath
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+# Root-anchored protected paths (GOVERNANCE/GUARDRAILS.md, Check 1)
+PROTECTED_PATHS = ["GOVERNANCE", "AGENTS", "COCKPIT", ".github/workflows", "STATE"]
+
+PathLike = Union[str, PurePath]
+
+_WILDCARDS = re.compile(r"[*?\[]")
+
+
+def _segment_regex(segment: str) -> str:
+    """Regex for one glob segment (wildcards never cross a `/`)."""
+    out = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape(char))
+            else:
+                body = segment[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+def _tail_regex(segments: List[str]) -> Pattern:
+    parts = []
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            parts.append(".*" if last else "(?:[^/]+/)*")
+        else:
+            parts.append(_segment_regex(segment) + ("" if last else "/"))
+    return re.compile("".join(parts) + r"(?:/.*)?\Z")
+
+
+def normalize_path(path: PathLike) -> str:
+    """Repo-relative POSIX form of a path (`./` and trailing `/` dropped)."""
+    text = path.as_posix() if isinstance(path, PurePath) else str(path).replace("\\", "/")
+    while text.startswith("./"):
+        text = text[2:]
+    return text.strip("/")
+
+
+class _Node:
+    __slots__ = ("children", "rule", "globs")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.rule: Optional[str] = None
+        self.globs: List[Tuple[Pattern, str]] = []
+
+
+class PathPolicy:
+    """Root-anchored path patterns compiled into a segment trie."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self._root = _Node()
+        for pattern in self.patterns:
+            self._add(pattern)
+
+    def _add(self, pattern: str):
+        segments = [segment for segment in normalize_path(pattern).split("/") if segment]
+        # Matches cover everything below them, so a trailing `/**` adds nothing
+        while segments and segments[-1] == "**":
+            segments.pop()
+        if not segments:
+            self._root.globs.append((re.compile(".*"), pattern))
+            return
+        node = self._root
+        for index, segment in enumerate(segments):
+            if _WILDCARDS.search(segment):
+                node.globs.append((_tail_regex(segments[index:]), pattern))
+                return
+            node = node.children.setdefault(segment, _Node())
+        if node.rule is None:
+            node.rule = pattern
+
+    def match(self, path: PathLike) -> Optional[str]:
+        """The pattern that matches `path` (shallowest first), or None."""
+        text = normalize_path(path)
+        node = self._root
+        start = 0
+        while True:
+            for regex, pattern in node.globs:
+                if regex.match(text, start):
+                    return pattern
+            if start >= len(text):
+                return None
+            end = text.find("/", start)
+            if end < 0:
+                end = len(text)
+            node = node.children.get(text[start:end])
+            if node is None:
+                return None
+            if node.rule is not None:
+                return node.rule
+            start = end + 1
+
+    def __contains__(self, path: PathLike) -> bool:
+        return self.match(path) is not None
+
+    def classify(self, paths: Iterable[PathLike]) -> Dict[str, Optional[str]]:
+        """Matching pattern (or None) for each path, in one pass."""
+        return {normalize_path(path): self.match(path) for path in paths}
+
+    def matching(self, paths: Iterable[PathLike]) -> List[PathLike]:
+        """The paths that match, in input order."""
+        return [path for path in paths if self.match(path) is not None]
+
+    def any_match(self, paths: Iterable[PathLike]) -> bool:
+        """True at the first matching path (stops consuming `paths`)."""
+        return any(self.match(path) is not None for path in paths)
+
+
+PROTECTED_POLICY = PathPolicy(PROTECTED_PATHS)
@@ -0,0 +1,666 @@
+#!/usr/bin/env python3
+"""
+Secret Scanner — streaming scan of added diff lines for forbidden patterns
+
+Checks only added (`+`) lines of a diff, one line at a time, so memory stays
+flat however large the diff is and removed or context lines never produce
+findings:
+- DiffLineScanner plugs into git_diff.read_diff, so the governance validator
+  scans the same single `git diff` pass every other check reads
+- scan_diff_lines() takes plain unified diff text, tracking the current file
+  from `+++ b/<path>` headers and line numbers from `@@` hunk headers
+- Reports every finding with path, line number and matching rule
+
+Rules come from a JSON rule pack (scripts/secret_rules.json, or the file named
+by SECRET_RULES_FILE) and fall back to SECRET_PATTERNS when there is none.
+All rules are compiled into one alternation of named groups, so each line is
+matched once however many rules are loaded; the few lines it matches are
+re-checked rule by rule, so overlapping rules are all reported. Rule packs may allowlist paths
+(globs) and findings (regexes matched from where the finding starts to the
+end of its line, so an anchored `...$` exempts only a whole value, not any
+line that merely contains it). Per-rule hit counts are kept for the
+results JSON; SECRET_SCAN_PROFILE=1 also times every rule on its own.
+
+audit_history() scans a commit range or the whole history instead of one
+diff: every reachable blob is listed with every path it is stored at, each
+unique blob SHA is scanned exactly once (whatever number of commits contain
+it) and its findings are reported under each path the allowlist does not
+exempt. Batches are read in a process pool, blobs over AUDIT_MAX_BLOB_BYTES
+are streamed line by line rather than read whole, and a cache of scanned blob
+SHAs, keyed by the rule pack fingerprint, lets later audits touch only new
+objects. Objects are listed and read in-process by git_objects (mmap'd packs
+shared by every worker) and through `git rev-list` / `git log --raw` /
+`git cat-file --batch` when the object store cannot be read in-process.
+
+Rule pack format:
+    {
+      "rules": [{"id": "aws-access-key", "pattern": "AKIA[0-9A-Z]{16}",
+                 "ignore_case": false, "description": "..."}],
+      "allowlist": {"paths": ["tests/fixtures/*"], "regexes": ["[A-Za-z_]+ = EXAMPLE[A-Z]*$"]}
+    }
+
+Dependencies: Python 3.7+, git
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from git_diff import read_diff
+from git_objects import GitObjectError, Repository, open_repository
+
+# Default rules when no rule pack is available (case-insensitive)
+SECRET_PATTERNS = [
+    r"password\s*=\s*['\"]?[^'\"]+['\"]?",  # password assigned a value
+    r"api_key\s*=\s*['\"]?[^'\"]+['\"]?",    # API key assigned a value
+    r"secret\s*=\s*['\"]?[^'\"]+['\"]?",     # secret assigned a value
+    r"BEGIN\s+PRIVATE\s+KEY",                # RSA private key marker
+]
+
+# Rule pack location (override with SECRET_RULES_FILE)
+SECRET_RULES_FILE = Path(os.getenv("SECRET_RULES_FILE", Path(__file__).parent / "secret_rules.json"))
+
+# Time each rule separately as well (slower; for finding expensive rules)
+SECRET_SCAN_PROFILE = os.getenv("SECRET_SCAN_PROFILE", "") == "1"
+
+# Characters of the offending line kept in a finding
+EXCERPT_LENGTH = 80
+
+# History audit: blobs larger than this are streamed, blobs per worker task
+AUDIT_MAX_BLOB_BYTES = int(os.getenv("SECRET_AUDIT_MAX_BLOB_BYTES", str(5 * 1024 * 1024)))
+AUDIT_BATCH_SIZE = 256
+AUDIT_CACHE_VERSION = 2
+
+# Bytes inspected for a NUL when deciding a blob is binary
+_BINARY_SNIFF_BYTES = 8000
+
+_HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
+
+class SecretFinding(NamedTuple):
+    """One rule match on an added line."""
+
+    path: str
+    line: int
+    rule: str
+    excerpt: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: [{self.rule}] {self.excerpt}"
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class SecretRule(NamedTuple):
+    id: str
+    pattern: str
+    ignore_case: bool = True
+    description: str = ""
+
+
+class RuleSet:
+    """Compiled rule pack: one combined matcher plus allowlists and stats.
+
+    Raises ValueError for an invalid rule (bad regex, duplicate id, or a named
+    group that would clash with the combined matcher).
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[SecretRule],
+        allow_paths: Sequence[str] = (),
+        allow_regexes: Sequence[str] = (),
+    ):
+        self.rules = list(rules)
+        self.allow_paths = list(allow_paths)
+        self.allow_regexes = list(allow_regexes)
+        self._group_to_rule: Dict[str, str] = {}
+        self._separate = []
+        branches = []
+        for number, rule in enumerate(self.rules):
+            if rule.id in {r.id for r in self.rules[:number]}:
+                raise ValueError(f"duplicate secret rule id '{rule.id}'")
+            try:
+                compiled = re.compile(rule.pattern, re.IGNORECASE if rule.ignore_case else 0)
+            except re.error as e:
+                raise ValueError(f"secret rule '{rule.id}' has an invalid pattern: {e}") from e
+            if compiled.groupindex:
+                raise ValueError(f"secret rule '{rule.id}' must not use named groups")
+            group = f"r{number}"
+            self._group_to_rule[group] = rule.id
+            self._separate.append((rule.id, compiled))
+            flags = "i" if rule.ignore_case else "-i"
+            branches.append(f"(?P<{group}>(?{flags}:{rule.pattern}))")
+        self._matcher = re.compile("|".join(branches)) if branches else None
+        self._allow = re.compile("|".join(f"(?:{p})" for p in self.allow_regexes)) if self.allow_regexes else None
+        self.profile = SECRET_SCAN_PROFILE
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.lines_scanned = 0
+        self.seconds = 0.0
+        self.hits: Dict[str, int] = {rule.id: 0 for rule in self.rules}
+        self.rule_seconds: Dict[str, float] = {rule.id: 0.0 for rule in self.rules}
+
+    def spec(self) -> Tuple[list, list, list]:
+        """Constructor arguments (picklable, for worker processes)."""
+        return self.rules, self.allow_paths, self.allow_regexes
+
+    @property
+    def fingerprint(self) -> str:
+        """Identity of the rules and allowlists; caches are invalid when it changes."""
+        payload = json.dumps([[list(rule) for rule in self.rules], self.allow_paths, self.allow_regexes])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[str] = SECRET_PATTERNS) -> "RuleSet":
+        """Rule set from bare case-insensitive patterns (the pattern is the id)."""
+        return cls([SecretRule(pattern, pattern) for pattern in patterns])
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "RuleSet":
+        """Load a rule pack; SECRET_PATTERNS when the file does not exist."""
+        path = Path(path or SECRET_RULES_FILE)
+        try:
+            with open(path) as f:
+                pack = json.load(f)
+        except FileNotFoundError:
+            return cls.from_patterns()
+        except (OSError, ValueError) as e:
+            raise ValueError(f"cannot read secret rule pack {path}: {e}") from e
+
+        rules = []
+        for entry in pack.get("rules", []):
+            if not entry.get("id") or not entry.get("pattern"):
+                raise ValueError(f"secret rule without id or pattern in {path}: {entry}")
+            rules.append(SecretRule(
+                entry["id"],
+                entry["pattern"],
+                bool(entry.get("ignore_case", True)),
+                entry.get("description", ""),
+            ))
+        allowlist = pack.get("allowlist") or {}
+        return cls(rules, allowlist.get("paths", []), allowlist.get("regexes", []))
+
+    def allows_path(self, path: str) -> bool:
+        """True when findings in `path` are allowlisted."""
+        return any(fnmatch.fnmatch(path, pattern) for pattern in self.allow_paths)
+
+    def match_line(self, text: str) -> List[str]:
+        """Ids of every rule matching a line (each at most once).
+
+        The combined matcher reports one rule per position, so on the rare
+        line where it matches anything the remaining rules are checked on
+        their own; rules overlapping an earlier match are still found.
+        """
+        self.lines_scanned += 1
+        if self._matcher is None:
+            return []
+        start = time.perf_counter()
+        matched = []
+        any_match = False
+        for match in self._matcher.finditer(text):
+            any_match = True
+            rule_id = self._group_to_rule[match.lastgroup]
+            if rule_id in matched:
+                continue
+            if self._allow is not None and self._allow.match(text, match.start()):
+                continue
+            matched.append(rule_id)
+            self.hits[rule_id] += 1
+        if any_match and len(matched) < len(self._separate):
+            for rule_id, compiled in self._separate:
+                if rule_id in matched:
+                    continue
+                for match in compiled.finditer(text):
+                    if self._allow is None or not self._allow.match(text, match.start()):
+                        matched.append(rule_id)
+                        self.hits[rule_id] += 1
+                        break
+        self.seconds += time.perf_counter() - start
+        if self.profile:
+            for rule_id, compiled in self._separate:
+                rule_start = time.perf_counter()
+                compiled.search(text)
+                self.rule_seconds[rule_id] += time.perf_counter() - rule_start
+        return matched
+
+    def stats(self) -> Dict:
+        """Scan statistics for the results JSON."""
+        rules = {}
+        for rule in self.rules:
+            entry = {"hits": self.hits[rule.id]}
+            if self.profile:
+                entry["seconds"] = round(self.rule_seconds[rule.id], 6)
+            rules[rule.id] = entry
+        return {"lines_scanned": self.lines_scanned, "seconds": round(self.seconds, 6), "rules": rules}
+
+
+def _diff_path(header: str) -> Optional[str]:
+    """Path from a `+++ b/<path>` header (None for deletions)."""
+    path = header[4:].rstrip("\n").split("\t", 1)[0]
+    if path == "/dev/null":
+        return None
+    if path.startswith('"') and path.endswith('"'):
+        path = path[1:-1]
+    return path[2:] if path.startswith("b/") else path
+
+
+def scan_diff_lines(
+    lines: Iterable[str], rules: Union[RuleSet, Sequence[str]] = SECRET_PATTERNS
+) -> Iterator[SecretFinding]:
+    """Yield findings for added lines of a unified diff, one line at a time."""
+    if not isinstance(rules, RuleSet):
+        rules = RuleSet.from_patterns(rules)
+    path: Optional[str] = None
+    skip_file = False
+    line_number = 0
+    in_hunk = False
+
+    for raw in lines:
+        if not in_hunk or raw.startswith("diff --git "):
+            if raw.startswith("diff --git "):
+                path, skip_file, in_hunk = None, False, False
+            elif raw.startswith("+++ "):
+                path = _diff_path(raw)
+                skip_file = path is not None and rules.allows_path(path)
+            elif raw.startswith("@@"):
+                match = _HUNK_RE.match(raw)
+                line_number = int(match.group(1)) if match else 0
+                in_hunk = True
+            continue
+
+        marker = raw[:1]
+        if marker == "+":
+            if not skip_file:
+                text = raw[1:].rstrip("\r\n")
+                for rule_id in rules.match_line(text):
+                    yield SecretFinding(path or "?", line_number, rule_id, text.strip()[:EXCERPT_LENGTH])
+            line_number += 1
+        elif marker == " ":
+            line_number += 1
+        elif marker == "@":
+            match = _HUNK_RE.match(raw)
+            line_number = int(match.group(1)) if match else 0
+        elif marker not in ("-", "\\"):
+            # Anything else ends the hunk (next file's extended headers)
+            in_hunk = False
+
+
+class DiffLineScanner:
+    """`on_added_line` callback for git_diff.read_diff that collects findings.
+
+    Lets the secret scan ride along the single diff read shared by all
+    governance checks instead of running its own `git diff`.
+    """
+
+    def __init__(self, rules: Union[RuleSet, Sequence[str]] = SECRET_PATTERNS):
+        self.rules = rules if isinstance(rules, RuleSet) else RuleSet.from_patterns(rules)
+        self.findings: List[SecretFinding] = []
+        self._path: Optional[str] = None
+        self._skip = False
+
+    def __call__(self, path: str, line_number: int, text: str):
+        if path != self._path:
+            self._path, self._skip = path, self.rules.allows_path(path)
+        if self._skip:
+            return
+        for rule_id in self.rules.match_line(text):
+            self.findings.append(SecretFinding(path, line_number, rule_id, text.strip()[:EXCERPT_LENGTH]))
+
+
+def scan_git_diff(
+    base_ref: str, cwd: Path, rules: Union[RuleSet, Sequence[str]] = SECRET_PATTERNS
+) -> List[SecretFinding]:
+    """All findings in lines added by `base_ref...HEAD`.
+
+    Raises subprocess.CalledProcessError when git exits non-zero.
+    """
+    scanner = DiffLineScanner(rules)
+    read_diff([f"{base_ref}...HEAD"], cwd, scanner)
+    return scanner.findings
+
+
+class AuditReport(NamedTuple):
+    """Result of a history audit."""
+
+    findings: List[SecretFinding]
+    stats: Dict
+
+
+def _git_lines(args: Sequence[str], cwd: Path) -> Iterator[str]:
+    """Lines of a git command's stdout, streamed."""
+    command = ["git", *args]
+    process = subprocess.Popen(
+        command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        universal_newlines=True, encoding="utf-8", errors="replace",
+    )
+    try:
+        for line in process.stdout:
+            yield line.rstrip("\n")
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+
+
+def _git_records(args: Sequence[str], cwd: Path) -> Iterator[str]:
+    """NUL-terminated records of a git command's stdout, streamed."""
+    command = ["git", *args]
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    pending = b""
+    try:
+        for chunk in iter(lambda: process.stdout.read(65536), b""):
+            records = (pending + chunk).split(b"\0")
+            pending = records.pop()
+            for record in records:
+                yield record.decode("utf-8", errors="surrogateescape")
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+
+
+def iter_history_blobs(cwd: Path, rev_range: Optional[str] = None) -> Iterator[Tuple[str, str, int]]:
+    """(sha, path, size) for every path of every blob new in `rev_range` (default: all refs).
+
+    A blob stored at several paths is listed once per path.
+    """
+    try:
+        repository = open_repository(cwd)
+        blobs = list(_iter_repository_blobs(repository, rev_range))
+    except GitObjectError:
+        blobs = None
+    if blobs is not None:
+        yield from blobs
+        return
+
+    revisions = rev_range.split() if rev_range else ["--all"]
+    candidates = []
+    for line in _git_lines(["rev-list", "--objects", *revisions], cwd):
+        sha, _, path = line.partition(" ")
+        if path:
+            candidates.append((sha, path))
+    if not candidates:
+        return
+
+    # Keep blobs only (rev-list also lists trees under their directory names)
+    result = subprocess.run(
+        ["git", "cat-file", "--batch-check=%(objectname) %(objecttype) %(objectsize)"],
+        cwd=cwd,
+        input="".join(f"{sha}\n" for sha, _ in candidates),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        universal_newlines=True,
+        check=True,
+    )
+    sizes = {}
+    for (sha, _), line in zip(candidates, result.stdout.splitlines()):
+        parts = line.split()
+        if len(parts) == 3 and parts[1] == "blob":
+            sizes[sha] = int(parts[2])
+
+    # rev-list names each object once; every path a new blob was written to
+    # appears in some commit's raw diff (-m: merges against each parent)
+    listed = set()
+    records = _git_records(
+        ["log", "-z", "--format=", "--raw", "-r", "-m", "--root", "--no-renames", "--no-abbrev", *revisions], cwd
+    )
+    for record in records:
+        if not record.startswith(":"):
+            continue
+        sha = record.split()[3]
+        path = next(records, "")
+        if sha in sizes and (sha, path) not in listed:
+            listed.add((sha, path))
+            yield sha, path, sizes[sha]
+
+
+def _iter_repository_blobs(repository: Repository, rev_range: Optional[str]) -> Iterator[Tuple[str, str, int]]:
+    """In-process iter_history_blobs for `A..B`, `^A B` and plain revisions."""
+    include, exclude = [], []
+    for arg in (rev_range.split() if rev_range else []):
+        if arg.startswith("-") or "..." in arg:
+            raise GitObjectError(f"unsupported revision {arg!r}")
+        if ".." in arg:
+            left, right = arg.split("..", 1)
+            exclude.append(repository.resolve(left or "HEAD"))
+            include.append(repository.resolve(right or "HEAD"))
+        elif arg.startswith("^"):
+            exclude.append(repository.resolve(arg[1:]))
+        else:
+            include.append(repository.resolve(arg))
+    if not rev_range:
+        tips = set(repository.refs().values())
+        head = repository.read_ref("HEAD")
+        if head:
+            tips.add(head)
+        include = []
+        for sha in sorted(tips):
+            # --all also names tags of trees and blobs; only commits are walked
+            try:
+                include.append(repository.commit(sha).sha)
+            except GitObjectError:
+                continue
+    sizes: Dict[str, int] = {}
+    for sha, path in repository.iter_blob_paths(include, exclude):
+        if sha not in sizes:
+            sizes[sha] = repository.object_info(sha)[1]
+        yield sha, path, sizes[sha]
+
+
+_worker_rules: Optional[RuleSet] = None
+_worker_repository: Optional[Repository] = None
+
+
+def _init_worker(spec):
+    global _worker_rules
+    _worker_rules = RuleSet(*spec)
+
+
+def _scan_blob(data: bytes, rules: RuleSet) -> list:
+    findings = []
+    if b"\0" not in data[:_BINARY_SNIFF_BYTES]:
+        text = data.decode("utf-8", errors="replace")
+        for number, line in enumerate(text.splitlines(), 1):
+            for rule_id in rules.match_line(line):
+                findings.append([number, rule_id, line.strip()[:EXCERPT_LENGTH]])
+    return findings
+
+
+def _scan_stream(stream: BinaryIO, size: int, rules: RuleSet) -> list:
+    """_scan_blob for `size` bytes of `stream`, holding one line at a time."""
+    findings = []
+    head = stream.read(min(size, _BINARY_SNIFF_BYTES))
+    remaining = size - len(head)
+    if b"\0" in head:
+        # Binary: skip the rest of the object
+        while remaining > 0:
+            chunk = stream.read(min(remaining, 65536))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        return findings
+    number = 0
+    pending = head
+    while True:
+        chunk = stream.read(min(remaining, 65536)) if remaining > 0 else b""
+        remaining -= len(chunk)
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop() if chunk else b""
+        if not chunk and lines and lines[-1] == b"":
+            lines.pop()
+        for raw in lines:
+            # Number lines as str.splitlines() does for a whole blob
+            for line in raw.decode("utf-8", errors="replace").splitlines() or [""]:
+                number += 1
+                for rule_id in rules.match_line(line):
+                    findings.append([number, rule_id, line.strip()[:EXCERPT_LENGTH]])
+        if not chunk:
+            return findings
+
+
+def _worker_repo(cwd: Path) -> Optional[Repository]:
+    """This process's in-process reader for `cwd` (None when the CLI is needed)."""
+    global _worker_repository
+    if _worker_repository is None or _worker_repository.path != Path(cwd):
+        try:
+            _worker_repository = open_repository(cwd)
+        except GitObjectError:
+            return None
+    return _worker_repository
+
+
+def _scan_blob_batch(cwd: Path, shas: List[str], rules: Optional[RuleSet] = None) -> Tuple[Dict[str, list], Dict]:
+    """Scan a batch of blobs; returns findings per SHA and stats.
+
+    Blobs are read in-process when possible, otherwise with one
+    `git cat-file --batch`.
+    """
+    rules = rules or _worker_rules
+    # Workers reuse one RuleSet; report this batch's counts only
+    rules.reset_stats()
+    results: Dict[str, list] = {}
+    repository = _worker_repo(cwd)
+    if repository is not None:
+        try:
+            streamed = []
+            for sha in shas:
+                if repository.object_info(sha)[1] > AUDIT_MAX_BLOB_BYTES:
+                    streamed.append(sha)
+                else:
+                    results[sha] = _scan_blob(repository.read_blob(sha), rules)
+        except GitObjectError:
+            rules.reset_stats()
+            results = {}
+        else:
+            if not streamed:
+                return results, rules.stats()
+            shas = streamed
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch"], cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for sha in shas:
+            # One object at a time: bounded memory and no pipe deadlock
+            process.stdin.write(sha.encode() + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                continue
+            size = int(header[2])
+            if size > AUDIT_MAX_BLOB_BYTES:
+                results[sha] = _scan_stream(process.stdout, size, rules)
+            else:
+                results[sha] = _scan_blob(process.stdout.read(size), rules)
+            process.stdout.read(1)
+    finally:
+        process.stdin.close()
+        process.stdout.close()
+        process.wait()
+    return results, rules.stats()
+
+
+def _load_audit_cache(path: Optional[Path], fingerprint: str) -> Dict[str, list]:
+    if path is None:
+        return {}
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != AUDIT_CACHE_VERSION or cache.get("fingerprint") != fingerprint:
+        return {}
+    return cache.get("blobs") or {}
+
+
+def _save_audit_cache(path: Path, fingerprint: str, blobs: Dict[str, list]):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": AUDIT_CACHE_VERSION, "fingerprint": fingerprint, "blobs": blobs}, f)
+        os.replace(tmp_path, str(path))
+    except OSError:
+        pass
+
+
+def _merge_stats(total: Dict, part: Dict):
+    total["lines_scanned"] += part["lines_scanned"]
+    total["seconds"] += part["seconds"]
+    for rule_id, entry in part["rules"].items():
+        merged = total["rules"].setdefault(rule_id, {key: 0 for key in entry})
+        for key, value in entry.items():
+            merged[key] += value
+
+
+def audit_history(
+    cwd: Path,
+    rules: Optional[RuleSet] = None,
+    rev_range: Optional[str] = None,
+    cache_path: Optional[Path] = None,
+    jobs: Optional[int] = None,
+) -> AuditReport:
+    """Scan every unique blob in `rev_range` (default: all refs) once.
+
+    Findings are reported under every path of the blob that the allowlist
+    does not exempt; blobs with no such path are not read. Blobs already in
+    the cache for this rule pack are not read again either.
+    jobs=1 scans in-process; otherwise batches go to a process pool.
+    """
+    rules = rules or RuleSet.load()
+    start = time.perf_counter()
+    fingerprint = rules.fingerprint
+    cache = _load_audit_cache(cache_path, fingerprint)
+
+    # Blob SHA -> paths the allowlist does not exempt (empty: skip the blob)
+    paths: Dict[str, List[str]] = {}
+    for sha, path, _ in iter_history_blobs(cwd, rev_range):
+        scanned_paths = paths.setdefault(sha, [])
+        if not rules.allows_path(path):
+            scanned_paths.append(path)
+    scannable = [sha for sha, blob_paths in paths.items() if blob_paths]
+    pending = [sha for sha in scannable if sha not in cache]
+
+    stats = {"lines_scanned": 0, "seconds": 0.0, "rules": {}}
+    batches = [pending[i:i + AUDIT_BATCH_SIZE] for i in range(0, len(pending), AUDIT_BATCH_SIZE)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(batches) <= 1:
+        local = RuleSet(*rules.spec())
+        parts = [_scan_blob_batch(cwd, batch, local) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(rules.spec(),)) as pool:
+            parts = list(pool.map(_scan_blob_batch, [cwd] * len(batches), batches))
+    for results, part_stats in parts:
+        cache.update(results)
+        _merge_stats(stats, part_stats)
+    if cache_path is not None and pending:
+        _save_audit_cache(cache_path, fingerprint, cache)
+
+    findings = []
+    for sha in scannable:
+        for number, rule_id, excerpt in cache.get(sha, []):
+            findings.extend(SecretFinding(path, number, rule_id, excerpt) for path in paths[sha])
+    findings.sort()
+
+    stats.update({
+        "blobs": len(paths),
+        "scanned": len(pending),
+        "cached": len(scannable) - len(pending),
+        "skipped": {"allowlisted": len(paths) - len(scannable)},
+        "seconds": round(time.perf_counter() - start, 3),
+        "matcher_seconds": round(stats["seconds"], 6),
+    })
+    return AuditReport(findings, stats)
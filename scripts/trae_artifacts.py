@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Trae Artifact Index — shared lookup of TRAE_REVIEW artifacts by PR number
+
+Scans COCKPIT/artifacts/TRAE_REVIEW once and keeps a PR number → artifacts
+mapping, each list sorted by `created_at` (oldest first), so "latest review"
+no longer depends on filesystem glob order. Used by:
+- generate_daily_brief.py (every section of the brief and approvals queue)
+- governance_validator.py (Trae review check for protected paths)
+
+The index is rebuilt when the directory's mtime changes (artifact added,
+removed or renamed). Lookups are dictionary reads guarded by a lock so the
+index can be shared by concurrent enrichment workers. When given an
+ArtifactCatalog, rebuilds read parsed rows from it instead of the files.
+
+Artifacts are loaded as YAML (libyaml CSafeLoader when available, else the
+pure-Python SafeLoader), checked against TRAE_REVIEW_SCHEMA and normalized
+into a TraeArtifact record. Only the leading YAML document is read: free-text
+notes may follow a `---` line. Text that is not valid YAML yields an error and
+no fields; only without PyYAML is a single-pass regex scan used instead.
+Parsed results can be cached by content hash in a marshal file so unchanged
+artifacts are never reparsed.
+
+Dependencies: Python 3.6+, PyYAML (optional)
+"""
+
+import hashlib
+import marshal
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import yaml
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:  # pragma: no cover - PyYAML is optional
+    yaml = None
+
+# Artifact file names: TRAE-<YYYYMMDD>-<pr number>.yml
+ARTIFACT_NAME_RE = re.compile(r"^TRAE-.+-(\d+)\.yml$")
+
+# Document start (`---`) or end (`...`) marker line
+_DOCUMENT_MARKER_RE = re.compile(r"^(?:---|\.\.\.)(?:[ \t]|$)", re.MULTILINE)
+
+# Timestamp format used by Trae artifacts
+CREATED_AT_FORMAT = "%Y-%m-%d %H:%M UTC"
+
+# Verdicts that satisfy the Trae review gate
+APPROVED_VERDICTS = ("APPROVE", "EMERGENCY_OVERRIDE")
+
+# Review validity when the artifact does not declare `expiry_days`
+DEFAULT_EXPIRY_DAYS = 7
+
+# Declared TRAE_REVIEW schema: field -> (accepted types, required)
+TRAE_REVIEW_SCHEMA = {
+    "pr_number": ((int, str), True),
+    "verdict": ((str,), True),
+    "created_at": ((str, datetime), True),
+    "expiry_days": ((int,), False),
+    "BEST_PRACTICE_ALIGNMENT": ((dict,), False),
+}
+VERDICTS = ("APPROVE", "REJECT", "REQUEST_CHANGES", "EMERGENCY_OVERRIDE")
+BEST_PRACTICE_VALUES = {
+    "PLAN_QUALITY": ("PASS", "CONCERN"),
+    "CHANGE_SIZE": ("OK", "TOO_LARGE"),
+    "OWNERSHIP_CLEAR": ("YES", "NO"),
+}
+BEST_PRACTICE_FIELDS = ("plan_quality", "change_size", "ownership_clear")
+
+# Bump when parsing rules change so cached results are discarded
+LOADER_VERSION = 3
+
+# Regex fallback (no PyYAML): all fields in
+# one pattern, a single finditer pass, the field name comes back as `lastgroup`.
+_FIELDS_RE = re.compile(
+    r"""^pr_number:\s*["']?(?P<pr_number>\d+)"""
+    r"""|^verdict:\s*["']?(?P<verdict>[^"'\s]+)"""
+    r"""|^created_at:\s*["']?(?P<created_at>[^"'\n]+)"""
+    r"""|^expiry_days:\s*(?P<expiry_days>\d+)"""
+    r"""|(?i:PLAN_QUALITY:\s*(?P<plan_quality>PASS|CONCERN))"""
+    r"""|(?i:CHANGE_SIZE:\s*(?P<change_size>OK|TOO_LARGE))"""
+    r"""|(?i:OWNERSHIP_CLEAR:\s*(?P<ownership_clear>YES|NO))"""
+    r"""|(?P<alignment>BEST_PRACTICE_ALIGNMENT)""",
+    re.MULTILINE,
+)
+_FIELD_COUNT = len(_FIELDS_RE.groupindex)
+
+
+class TraeArtifact:
+    """Parsed Trae review: gate fields plus BEST_PRACTICE_ALIGNMENT values."""
+
+    __slots__ = (
+        "file_path", "pr_number", "verdict", "created_at",
+        "plan_quality", "change_size", "ownership_clear", "expiry_days", "errors",
+    )
+
+    def __init__(
+        self,
+        file_path: Path,
+        pr_number: Optional[int] = None,
+        verdict: Optional[str] = None,
+        created_at: Optional[str] = None,
+        plan_quality: Optional[str] = None,
+        change_size: Optional[str] = None,
+        ownership_clear: Optional[str] = None,
+        expiry_days: Optional[int] = None,
+        errors: Tuple[str, ...] = (),
+    ):
+        self.file_path = Path(file_path)
+        self.pr_number = pr_number
+        self.verdict = verdict
+        self.created_at = created_at
+        self.plan_quality = plan_quality
+        self.change_size = change_size
+        self.ownership_clear = ownership_clear
+        self.expiry_days = expiry_days
+        # Schema violations; empty for a well-formed artifact
+        self.errors = tuple(errors)
+
+    @property
+    def approved(self) -> bool:
+        return self.verdict in APPROVED_VERDICTS
+
+    @property
+    def expires_at(self) -> Optional[datetime]:
+        """created_at + expiry_days (default 7); None when created_at is unparseable."""
+        try:
+            created = datetime.strptime(self.created_at or "", CREATED_AT_FORMAT)
+        except ValueError:
+            return None
+        days = self.expiry_days if self.expiry_days is not None else DEFAULT_EXPIRY_DAYS
+        return created + timedelta(days=days)
+
+    def is_expired(self, now: datetime) -> bool:
+        expires_at = self.expires_at
+        return expires_at is not None and expires_at < now
+
+    def __repr__(self) -> str:
+        return f"TraeArtifact({self.file_path.name!r}, pr={self.pr_number}, verdict={self.verdict!r})"
+
+
+# Record fields stored in the parse cache (everything but the path)
+_RECORD_FIELDS = TraeArtifact.__slots__[1:]
+
+
+def _regex_document(content: str) -> Dict:
+    """Document-shaped dict from the single-pass regex fallback."""
+    found: Dict[str, str] = {}
+    for match in _FIELDS_RE.finditer(content):
+        name = match.lastgroup
+        if name not in found:
+            found[name] = match.group(name)
+            if len(found) == _FIELD_COUNT:
+                break
+
+    doc: Dict = {}
+    for key in ("pr_number", "expiry_days"):
+        if key in found:
+            doc[key] = int(found[key])
+    for key in ("verdict", "created_at"):
+        if key in found:
+            doc[key] = found[key].strip()
+    if "alignment" in found:
+        doc["BEST_PRACTICE_ALIGNMENT"] = {
+            field.upper(): found[field] for field in BEST_PRACTICE_FIELDS if field in found
+        }
+    return doc
+
+
+def leading_document(content: str) -> str:
+    """Text of the first YAML document; anything after its end is notes.
+
+    A `---` before any content opens the first document rather than ending it.
+    """
+    start = 0
+    for marker in _DOCUMENT_MARKER_RE.finditer(content):
+        lines = content[start:marker.start()].splitlines()
+        if any(line.strip() and not line.lstrip().startswith("#") for line in lines):
+            return content[:marker.start()]
+        start = marker.end()
+    return content
+
+
+def _load_document(content: str) -> Tuple[Dict, List[str]]:
+    """Parse the leading YAML document (C loader when available).
+
+    Invalid YAML, or a document that is not a mapping, gives an empty
+    document and an error; the regex scan is used only without PyYAML.
+    """
+    content = leading_document(content)
+    if yaml is None:
+        return _regex_document(content), []
+    try:
+        doc = yaml.load(content, Loader=_YAML_LOADER)
+    except yaml.YAMLError as e:
+        mark = getattr(e, "problem_mark", None) or getattr(e, "context_mark", None)
+        problem = getattr(e, "problem", None) or str(e).splitlines()[0]
+        if mark is not None:
+            problem = f"{mark.line + 1}:{mark.column + 1}: {problem}"
+        return {}, [f"invalid YAML: {problem}"]
+    if not isinstance(doc, dict):
+        return {}, ["invalid YAML: top level is not a mapping"]
+    return doc, []
+
+
+def validate_trae_document(doc: Dict) -> List[str]:
+    """Check a loaded artifact against TRAE_REVIEW_SCHEMA."""
+    errors = []
+    for field, (types, required) in TRAE_REVIEW_SCHEMA.items():
+        value = doc.get(field)
+        if value is None:
+            if required:
+                errors.append(f"missing required field '{field}'")
+        elif isinstance(value, bool) or not isinstance(value, types):
+            errors.append(f"'{field}' has unexpected type {type(value).__name__}")
+
+    pr_number = doc.get("pr_number")
+    if isinstance(pr_number, str) and not pr_number.isdigit():
+        errors.append(f"'pr_number' is not a number: {pr_number!r}")
+    verdict = doc.get("verdict")
+    if isinstance(verdict, str) and verdict not in VERDICTS:
+        errors.append(f"unknown verdict '{verdict}'")
+    alignment = doc.get("BEST_PRACTICE_ALIGNMENT")
+    if isinstance(alignment, dict):
+        for key, allowed in BEST_PRACTICE_VALUES.items():
+            value = _alignment_value(alignment.get(key))
+            if value is not None and value not in allowed:
+                errors.append(f"BEST_PRACTICE_ALIGNMENT.{key} must be one of {', '.join(allowed)}")
+    return errors
+
+
+def _alignment_value(value) -> Optional[str]:
+    # YAML 1.1 reads bare YES/NO as booleans
+    if isinstance(value, bool):
+        return "YES" if value else "NO"
+    return str(value).upper() if value is not None else None
+
+
+def _created_at_text(value) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.strftime(CREATED_AT_FORMAT)
+    return str(value).strip() if value is not None else None
+
+
+def parse_trae_content(content: str, artifact_path: Path) -> TraeArtifact:
+    """Load, validate and normalize Trae artifact text into a record."""
+    doc, errors = _load_document(content)
+    if not errors:
+        errors.extend(validate_trae_document(doc))
+
+    pr_number = doc.get("pr_number")
+    alignment = doc.get("BEST_PRACTICE_ALIGNMENT")
+    alignment = alignment if isinstance(alignment, dict) else {}
+    verdict = doc.get("verdict")
+    expiry_days = doc.get("expiry_days")
+    return TraeArtifact(
+        artifact_path,
+        pr_number=int(pr_number) if str(pr_number).isdigit() else None,
+        verdict=str(verdict) if verdict is not None else None,
+        created_at=_created_at_text(doc.get("created_at")),
+        plan_quality=_alignment_value(alignment.get("PLAN_QUALITY")),
+        change_size=_alignment_value(alignment.get("CHANGE_SIZE")),
+        ownership_clear=_alignment_value(alignment.get("OWNERSHIP_CLEAR")),
+        expiry_days=expiry_days if isinstance(expiry_days, int) and not isinstance(expiry_days, bool) else None,
+        errors=errors,
+    )
+
+
+class TraeArtifactLoader:
+    """Loads artifacts, caching parsed results by content hash.
+
+    The cache is a single marshal file: unchanged artifacts skip YAML parsing
+    and validation entirely on later runs. Call flush() to persist it.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[bytes, tuple]] = None
+        self._dirty = False
+
+    def _cache(self) -> Dict[bytes, tuple]:
+        if self._entries is None:
+            self._entries = {}
+            if self.cache_path is not None:
+                try:
+                    with open(self.cache_path, "rb") as f:
+                        payload = marshal.load(f)
+                    if payload.get("version") == LOADER_VERSION:
+                        self._entries = payload["entries"]
+                except (OSError, EOFError, ValueError, TypeError, AttributeError, KeyError):
+                    pass
+        return self._entries
+
+    def parse(self, raw: bytes, artifact_path: Path) -> TraeArtifact:
+        """Parse artifact bytes, reusing a cached result for identical content."""
+        digest = hashlib.sha256(raw).digest()
+        with self._lock:
+            cached = self._cache().get(digest)
+        if cached is not None:
+            self.hits += 1
+            return TraeArtifact(artifact_path, **dict(zip(_RECORD_FIELDS, cached)))
+
+        self.misses += 1
+        artifact = parse_trae_content(raw.decode("utf-8", errors="replace"), artifact_path)
+        with self._lock:
+            self._cache()[digest] = tuple(getattr(artifact, field) for field in _RECORD_FIELDS)
+            self._dirty = True
+        return artifact
+
+    def load(self, artifact_path: Path) -> Optional[TraeArtifact]:
+        """Read and parse one artifact file; None when it cannot be read."""
+        try:
+            with open(artifact_path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        return self.parse(raw, Path(artifact_path))
+
+    def flush(self):
+        """Write the cache if anything was added (atomic replace)."""
+        with self._lock:
+            if not self._dirty or self.cache_path is None:
+                return
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_path.parent), suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    marshal.dump({"version": LOADER_VERSION, "entries": self._entries}, f)
+                os.replace(tmp_path, str(self.cache_path))
+                self._dirty = False
+            except OSError:
+                pass
+
+
+def parse_trae_artifact(artifact_path: Path) -> Optional[TraeArtifact]:
+    """Parse Trae review artifact (YAML, validated against the schema).
+
+    Returns None when the file cannot be read.
+    """
+    return TraeArtifactLoader().load(artifact_path)
+
+
+def _sort_key(artifact: TraeArtifact):
+    """Order by created_at; unparseable timestamps sort first, then by name."""
+    try:
+        created = datetime.strptime(artifact.created_at or "", CREATED_AT_FORMAT)
+    except ValueError:
+        created = datetime.min
+    return created, artifact.file_path.name
+
+
+class ReviewExpiryIndex:
+    """Approved reviews ordered by expiry time, for range queries by bisection.
+
+    Built from the latest artifact of each PR; artifacts that are not approved
+    or have no parseable created_at are left out.
+    """
+
+    def __init__(self, artifacts: Iterable[TraeArtifact]):
+        entries = []
+        for artifact in artifacts:
+            expires_at = artifact.expires_at
+            if artifact.approved and expires_at is not None:
+                entries.append((expires_at, artifact.pr_number or 0, artifact))
+        entries.sort(key=lambda entry: entry[:2])
+        self._times = [entry[0] for entry in entries]
+        self._artifacts = [entry[2] for entry in entries]
+
+    def __len__(self) -> int:
+        return len(self._artifacts)
+
+    def between(self, start: datetime, end: datetime) -> List[TraeArtifact]:
+        """Reviews expiring in [start, end), soonest first."""
+        lo = bisect_left(self._times, start)
+        hi = bisect_left(self._times, end, lo)
+        return self._artifacts[lo:hi]
+
+    def expiring_within(self, now: datetime, days: float) -> List[TraeArtifact]:
+        """Reviews still valid at `now` that lapse within `days`."""
+        return self.between(now, now + timedelta(days=days))
+
+    def expired_since(self, since: datetime, now: datetime) -> List[TraeArtifact]:
+        """Reviews valid at `since` that have lapsed by `now`."""
+        return self.between(since, now)
+
+
+class TraeArtifactIndex:
+    """PR number → TRAE_REVIEW artifacts, rebuilt when the directory changes."""
+
+    def __init__(self, directory: Path, catalog=None, loader: Optional[TraeArtifactLoader] = None):
+        self.directory = Path(directory)
+        self.catalog = catalog
+        self.loader = loader or TraeArtifactLoader()
+        self.scans = 0
+        self._lock = threading.Lock()
+        self._mtime_ns: Optional[int] = None
+        self._by_pr: Dict[int, List[TraeArtifact]] = {}
+        self._expiry: Optional[ReviewExpiryIndex] = None
+
+    def _directory_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _scan(self) -> Dict[int, List[TraeArtifact]]:
+        if self.catalog is not None:
+            try:
+                self.catalog.refresh(["TRAE_REVIEW"])
+                by_pr: Dict[int, List[TraeArtifact]] = {}
+                # Rows come back ordered by PR number, then created_at
+                for artifact in self.catalog.trae_reviews():
+                    by_pr.setdefault(artifact.pr_number, []).append(artifact)
+                return by_pr
+            except (sqlite3.Error, OSError):
+                # Unusable catalog (read-only or corrupt cache): parse the files directly
+                self.catalog = None
+
+        by_pr = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                match = ARTIFACT_NAME_RE.match(entry.name)
+                if not match or not entry.is_file():
+                    continue
+                artifact = self.loader.load(Path(entry.path))
+                if artifact is not None:
+                    by_pr.setdefault(int(match.group(1)), []).append(artifact)
+        for artifacts in by_pr.values():
+            artifacts.sort(key=_sort_key)
+        self.loader.flush()
+        return by_pr
+
+    def refresh(self) -> bool:
+        """Rescan if the directory changed since the last scan; True if rescanned."""
+        mtime = self._directory_mtime()
+        with self._lock:
+            if mtime == self._mtime_ns:
+                return False
+            self._by_pr = self._scan() if mtime is not None else {}
+            self._expiry = None
+            self._mtime_ns = mtime
+            self.scans += 1
+            return True
+
+    @property
+    def exists(self) -> bool:
+        return self.directory.is_dir()
+
+    def artifacts_for(self, pr_number: Union[int, str]) -> List[TraeArtifact]:
+        """All artifacts for a PR, oldest first ([] for unknown or non-numeric PRs)."""
+        try:
+            key = int(pr_number)
+        except (TypeError, ValueError):
+            return []
+        self.refresh()
+        with self._lock:
+            return list(self._by_pr.get(key, []))
+
+    def latest(self, pr_number: Union[int, str]) -> Optional[TraeArtifact]:
+        """Most recently created artifact for a PR, or None."""
+        artifacts = self.artifacts_for(pr_number)
+        return artifacts[-1] if artifacts else None
+
+    def expiry(self) -> ReviewExpiryIndex:
+        """Expiry-ordered index of each PR's latest review (rebuilt after a rescan)."""
+        self.refresh()
+        with self._lock:
+            if self._expiry is None:
+                self._expiry = ReviewExpiryIndex(artifacts[-1] for artifacts in self._by_pr.values())
+            return self._expiry
+
+    def pr_numbers(self) -> List[int]:
+        """PR numbers that have at least one artifact."""
+        self.refresh()
+        with self._lock:
+            return sorted(self._by_pr)
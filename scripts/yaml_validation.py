@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+YAML Validation — parse-based checks for workflows, TRAE reviews and other YAML
+
+Replaces the tab heuristic with a real parse (libyaml CSafeLoader when
+available, else the pure-Python SafeLoader). Errors carry `line:column`
+positions so the validator can print `file:line:column: problem`:
+- Every YAML file: must parse (multi-document files allowed) and must not
+  repeat a key within one mapping (PyYAML keeps the last silently; GitHub
+  Actions rejects the workflow)
+- .github/workflows/*.yml: one document with `on` and a non-empty `jobs`
+  mapping whose jobs each declare `runs-on` or `uses`
+- COCKPIT/artifacts/TRAE_REVIEW/*.yml: only the leading document is parsed,
+  free-text notes may follow its `---` end line
+- COCKPIT/artifacts/TRAE_REVIEW/TRAE-<date>-<pr>.yml: TRAE_REVIEW_SCHEMA
+
+Structure is checked on the composed node graph, so `on:` is seen as the
+key GitHub reads rather than YAML 1.1's boolean True. Without PyYAML only the
+tab-indentation heuristic runs.
+
+Files are parsed on framework_validation's thread pool and results are
+cached by content hash there.
+
+Dependencies: Python 3.7+, PyYAML (optional; C loader used when built with libyaml)
+"""
+
+import re
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional
+
+from trae_artifacts import ARTIFACT_NAME_RE, leading_document, validate_trae_document
+
+try:
+    import yaml
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:  # pragma: no cover - exercised only without PyYAML
+    yaml = None
+
+WORKFLOW_DIR = ".github/workflows"
+TRAE_REVIEW_DIR = "COCKPIT/artifacts/TRAE_REVIEW"
+
+_WORKFLOW_NAME_RE = re.compile(r"\.ya?ml$")
+
+
+def yaml_kind(path: str) -> str:
+    """Which YAML checks apply: "workflow", "trae_review", "trae_other" or "yaml"."""
+    posix = PurePosixPath(path)
+    parent = posix.parent.as_posix()
+    if parent == WORKFLOW_DIR and _WORKFLOW_NAME_RE.search(posix.name):
+        return "workflow"
+    if parent == TRAE_REVIEW_DIR and _WORKFLOW_NAME_RE.search(posix.name):
+        return "trae_review" if ARTIFACT_NAME_RE.match(posix.name) else "trae_other"
+    return "yaml"
+
+
+def _at(mark, message: str) -> str:
+    return f"{mark.line + 1}:{mark.column + 1}: {message}" if mark is not None else message
+
+
+def _parse_error(error) -> str:
+    mark = getattr(error, "problem_mark", None) or getattr(error, "context_mark", None)
+    problem = getattr(error, "problem", None) or str(error).splitlines()[0]
+    return _at(mark, problem)
+
+
+def _tab_errors(text: str) -> List[str]:
+    for number, line in enumerate(text.split("\n"), 1):
+        # Check for mixed tabs and spaces
+        if line.strip() and "\t" in line and line.startswith(" "):
+            return [f"{number}:{line.index(chr(9)) + 1}: tab in space-indented line"]
+    return []
+
+
+def _duplicate_keys(node) -> List[str]:
+    """Repeated keys in any mapping of a composed document."""
+    errors = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, yaml.MappingNode):
+            seen = set()
+            for key, value in current.value:
+                if isinstance(key, yaml.ScalarNode):
+                    if key.value in seen:
+                        errors.append(_at(key.start_mark, f"duplicate key '{key.value}'"))
+                    seen.add(key.value)
+                stack.append(value)
+        elif isinstance(current, yaml.SequenceNode):
+            stack.extend(current.value)
+    return sorted(errors, key=lambda e: [int(n) for n in e.split(":", 2)[:2]])
+
+
+def _mapping(node) -> Dict[str, tuple]:
+    """Scalar key → (key node, value node) of a mapping node."""
+    return {
+        key.value: (key, value)
+        for key, value in node.value
+        if isinstance(key, yaml.ScalarNode)
+    }
+
+
+def _workflow_errors(node) -> List[str]:
+    if not isinstance(node, yaml.MappingNode):
+        return [_at(node.start_mark if node is not None else None, "workflow must be a mapping")]
+    errors = []
+    top = _mapping(node)
+    if "on" not in top:
+        errors.append(_at(node.start_mark, "workflow has no 'on' trigger"))
+    if "jobs" not in top:
+        errors.append(_at(node.start_mark, "workflow has no 'jobs'"))
+        return errors
+    jobs_key, jobs = top["jobs"]
+    if not isinstance(jobs, yaml.MappingNode) or not jobs.value:
+        errors.append(_at(jobs_key.start_mark, "'jobs' must be a non-empty mapping"))
+        return errors
+    for name, (job_key, job) in _mapping(jobs).items():
+        if not isinstance(job, yaml.MappingNode):
+            errors.append(_at(job_key.start_mark, f"job '{name}' must be a mapping"))
+        elif "runs-on" not in _mapping(job) and "uses" not in _mapping(job):
+            errors.append(_at(job_key.start_mark, f"job '{name}' needs 'runs-on' or 'uses'"))
+    return errors
+
+
+def check_yaml_file(path: str, content: bytes) -> Dict:
+    """Errors (`line:column: problem` where known) for one YAML file."""
+    text = content.decode("utf-8", errors="replace")
+    kind = yaml_kind(path)
+    if kind in ("trae_review", "trae_other"):
+        text = leading_document(text)
+    if yaml is None:
+        return {"errors": _tab_errors(text)}
+
+    # One loader composes every document; a TRAE review is then constructed
+    # from its composed node rather than parsed a second time
+    loader = _YAML_LOADER(text)
+    try:
+        try:
+            documents = []
+            while loader.check_node():
+                documents.append(loader.get_node())
+        except yaml.YAMLError as e:
+            return {"errors": [_parse_error(e)]}
+
+        errors = []
+        for document in documents:
+            errors.extend(_duplicate_keys(document))
+        if kind == "workflow":
+            if len(documents) != 1:
+                errors.append("workflow must be a single YAML document")
+            else:
+                errors.extend(_workflow_errors(documents[0]))
+        elif kind == "trae_review":
+            doc: Optional[Dict] = None
+            if len(documents) == 1:
+                try:
+                    doc = loader.construct_document(documents[0])
+                except yaml.YAMLError as e:
+                    return {"errors": errors + [_parse_error(e)]}
+            if not isinstance(doc, dict):
+                errors.append("TRAE review must be a YAML mapping")
+            else:
+                errors.extend(validate_trae_document(doc))
+        return {"errors": errors}
+    finally:
+        loader.dispose()
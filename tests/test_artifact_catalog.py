@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite artifact catalog in artifact_catalog.py
+
+These tests validate:
+- TRAE_REVIEW and PLAN artifacts are parsed into queryable rows
+- Refresh skips unchanged files and reparses only changed content
+- Deleted artifacts drop out and the catalog persists across instances
+- The Trae index can be served from the catalog
+"""
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from artifact_catalog import ArtifactCatalog, find_plan_fields
+from trae_artifacts import TraeArtifactIndex
+
+TRAE_TEMPLATE = """ARTIFACT_TYPE: TRAE_REVIEW
+created_at: "{created_at}"
+pr_number: {pr}
+verdict: "{verdict}"
+
+BEST_PRACTICE_ALIGNMENT:
+  PLAN_QUALITY: CONCERN
+  CHANGE_SIZE: OK
+  OWNERSHIP_CLEAR: YES
+"""
+
+PLAN_CONTENT = """## Objective
+Ship it
+
+## Files
+- a.py
+
+**Rollback:** revert
+"""
+
+
+def make_root(tmp_path: Path) -> Path:
+    root = tmp_path / "COCKPIT" / "artifacts"
+    for kind in ("TRAE_REVIEW", "PLAN"):
+        (root / kind).mkdir(parents=True)
+    return root
+
+
+def write_trae(root: Path, pr: int, verdict: str = "APPROVE", created_at: str = "2026-01-01 09:00 UTC", day: str = "20260101"):
+    path = root / "TRAE_REVIEW" / f"TRAE-{day}-{pr}.yml"
+    path.write_text(TRAE_TEMPLATE.format(pr=pr, verdict=verdict, created_at=created_at))
+    return path
+
+
+def bump_mtime(path: Path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestArtifactCatalog:
+    """Test catalog parsing and incremental refresh."""
+
+    def test_parses_trae_and_plan(self, tmp_path):
+        """Test that parsed fields are stored and queryable."""
+        root = make_root(tmp_path)
+        write_trae(root, 7)
+        (root / "PLAN" / "plan-x.md").write_text(PLAN_CONTENT)
+        catalog = ArtifactCatalog(root, tmp_path / "catalog.sqlite3")
+        assert catalog.refresh() == {"seen": 2, "parsed": 2, "removed": 0}
+
+        review = catalog.artifacts("TRAE_REVIEW", pr_number=7)[0]
+        assert review["verdict"] == "APPROVE"
+        assert review["plan_quality"] == "CONCERN"
+        assert review["ownership_clear"] == "YES"
+
+        plan = catalog.get("COCKPIT/artifacts/PLAN/plan-x.md")
+        assert plan["plan_fields"] == ["Objective", "Files", "Rollback"]
+
+    def test_unchanged_files_not_reparsed(self, tmp_path):
+        """Test that a second refresh and a touch with same content parse nothing."""
+        root = make_root(tmp_path)
+        path = write_trae(root, 1)
+        catalog = ArtifactCatalog(root, tmp_path / "catalog.sqlite3")
+        catalog.refresh()
+        assert catalog.refresh()["parsed"] == 0
+        bump_mtime(path)
+        assert catalog.refresh()["parsed"] == 0
+
+    def test_changed_and_deleted_files(self, tmp_path):
+        """Test that edits are reparsed and deleted files are removed."""
+        root = make_root(tmp_path)
+        path = write_trae(root, 1)
+        other = write_trae(root, 2)
+        catalog = ArtifactCatalog(root, tmp_path / "catalog.sqlite3")
+        catalog.refresh()
+
+        path.write_text(TRAE_TEMPLATE.format(pr=1, verdict="REJECT", created_at="2026-01-01 09:00 UTC"))
+        bump_mtime(path)
+        other.unlink()
+        assert catalog.refresh() == {"seen": 1, "parsed": 1, "removed": 1}
+        assert [a["verdict"] for a in catalog.artifacts("TRAE_REVIEW")] == ["REJECT"]
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that a new catalog on the same file starts warm."""
+        root = make_root(tmp_path)
+        write_trae(root, 1)
+        ArtifactCatalog(root, tmp_path / "catalog.sqlite3").refresh()
+        assert ArtifactCatalog(root, tmp_path / "catalog.sqlite3").refresh()["parsed"] == 0
+
+    def test_plan_field_change_rebuilds(self, tmp_path):
+        """Test that a different PLAN field list discards stored rows."""
+        root = make_root(tmp_path)
+        (root / "PLAN" / "plan-x.md").write_text(PLAN_CONTENT)
+        ArtifactCatalog(root, tmp_path / "catalog.sqlite3").refresh()
+        catalog = ArtifactCatalog(root, tmp_path / "catalog.sqlite3", plan_fields=["Objective"])
+        assert catalog.refresh()["parsed"] == 1
+        assert catalog.get("PLAN/plan-x.md")["plan_fields"] == ["Objective"]
+
+    def test_old_schema_table_recreated(self, tmp_path):
+        """Test that a catalog from an older schema version gains the new columns."""
+        root = make_root(tmp_path)
+        write_trae(root, 7)
+        db_path = tmp_path / "catalog.sqlite3"
+        conn = sqlite3.connect(str(db_path))
+        conn.executescript(
+            "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE artifacts (path TEXT PRIMARY KEY, kind TEXT NOT NULL);"
+            "INSERT INTO meta VALUES ('fingerprint', 'old');"
+        )
+        conn.close()
+        catalog = ArtifactCatalog(root, db_path)
+        assert catalog.refresh()["parsed"] == 1
+        assert catalog.artifacts("TRAE_REVIEW", pr_number=7)[0]["verdict"] == "APPROVE"
+
+    def test_trae_index_from_catalog(self, tmp_path):
+        """Test that the Trae index orders catalog rows by created_at."""
+        root = make_root(tmp_path)
+        write_trae(root, 4, verdict="APPROVE", created_at="2026-01-05 09:00 UTC", day="20260101")
+        write_trae(root, 4, verdict="REJECT", created_at="2026-01-02 09:00 UTC", day="20260102")
+        catalog = ArtifactCatalog(root, tmp_path / "catalog.sqlite3")
+        index = TraeArtifactIndex(root / "TRAE_REVIEW", catalog=catalog)
+        assert index.latest(4).verdict == "APPROVE"
+        assert index.latest(4).file_path.name == "TRAE-20260101-4.yml"
+        assert index.latest(4).plan_quality == "CONCERN"
+
+
+class TestFindPlanFields:
+    """Test PLAN field detection."""
+
+    def test_heading_styles(self):
+        """Test headings, bold labels and list items are recognized."""
+        content = "# Objective\n*Non-Goals:*\n - files\n"
+        assert find_plan_fields(content) == ["Objective", "Non-Goals", "Files"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
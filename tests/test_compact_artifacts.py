@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for artifact compaction in compact_artifacts.py
+
+These tests validate:
+- Only artifacts older than the cutoff are archived, grouped by kind and month
+- Archived content round-trips through extract, with or without the index
+- Re-running appends to an existing monthly archive without duplicates
+- A dry run changes nothing
+"""
+
+import sys
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import compact_artifacts as ca
+
+TODAY = datetime(2026, 3, 15)
+
+
+def make_artifacts(tmp_path: Path, days) -> Path:
+    root = tmp_path / "artifacts"
+    for kind, prefix in (("DAILY_BRIEF", "BRIEF"), ("APPROVALS_QUEUE", "APPROVALS")):
+        (root / kind).mkdir(parents=True)
+        for day in days:
+            (root / kind / f"{prefix}-{day}.md").write_text(f"# {prefix} {day}\n")
+    (root / "DAILY_BRIEF" / "README.md").write_text("not an artifact\n")
+    return root
+
+
+class TestCompact:
+    """Test rolling old artifacts into monthly archives."""
+
+    def test_archives_old_files_by_month(self, tmp_path):
+        """Test that files past the cutoff move into per-kind monthly zips."""
+        root = make_artifacts(tmp_path, ["20260110", "20260201", "20260310"])
+        stats = ca.compact(root, older_than_days=30, today=TODAY)
+        assert stats["archived"] == 4
+        archive_dir = root / "ARCHIVE"
+        assert sorted(p.name for p in archive_dir.glob("*.zip")) == [
+            "APPROVALS_QUEUE-2026-01.zip",
+            "APPROVALS_QUEUE-2026-02.zip",
+            "DAILY_BRIEF-2026-01.zip",
+            "DAILY_BRIEF-2026-02.zip",
+        ]
+        assert sorted(p.name for p in (root / "DAILY_BRIEF").iterdir()) == ["BRIEF-20260310.md", "README.md"]
+        with zipfile.ZipFile(archive_dir / "DAILY_BRIEF-2026-01.zip") as archive:
+            assert archive.getinfo("BRIEF-20260110.md").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_extract_round_trip(self, tmp_path):
+        """Test that an archived brief is read back from the indexed archive."""
+        root = make_artifacts(tmp_path, ["20260110"])
+        ca.compact(root, older_than_days=30, today=TODAY)
+        assert ca.read_archived("BRIEF-20260110.md", root) == b"# BRIEF 20260110\n"
+        assert [name for name, _ in ca.list_archived(root, kind="DAILY_BRIEF")] == ["BRIEF-20260110.md"]
+        assert ca.read_archived("BRIEF-20260111.md", root) is None
+
+    def test_extract_without_index(self, tmp_path):
+        """Test that extraction falls back to the archive named after the date."""
+        root = make_artifacts(tmp_path, ["20260110"])
+        ca.compact(root, older_than_days=30, today=TODAY)
+        (root / "ARCHIVE" / ca.INDEX_NAME).unlink()
+        assert ca.read_archived("APPROVALS-20260110.md", root) == b"# APPROVALS 20260110\n"
+
+    def test_rerun_appends_to_month(self, tmp_path):
+        """Test that a later run adds to the existing monthly archive."""
+        root = make_artifacts(tmp_path, ["20260105"])
+        ca.compact(root, older_than_days=30, today=TODAY)
+        (root / "DAILY_BRIEF" / "BRIEF-20260106.md").write_text("# later\n")
+        # A restored copy of an archived file is dropped, not duplicated
+        (root / "DAILY_BRIEF" / "BRIEF-20260105.md").write_text("# BRIEF 20260105\n")
+        ca.compact(root, older_than_days=30, today=TODAY)
+        with zipfile.ZipFile(root / "ARCHIVE" / "DAILY_BRIEF-2026-01.zip") as archive:
+            assert archive.namelist() == ["BRIEF-20260105.md", "BRIEF-20260106.md"]
+        assert not (root / "DAILY_BRIEF" / "BRIEF-20260105.md").exists()
+
+    def test_conflicting_copy_left_in_place(self, tmp_path):
+        """Test that a file differing from its archived copy is not deleted."""
+        root = make_artifacts(tmp_path, ["20260105"])
+        ca.compact(root, older_than_days=30, today=TODAY)
+        (root / "DAILY_BRIEF" / "BRIEF-20260105.md").write_text("# edited\n")
+        ca.compact(root, older_than_days=30, today=TODAY)
+        assert (root / "DAILY_BRIEF" / "BRIEF-20260105.md").exists()
+        assert ca.read_archived("BRIEF-20260105.md", root) == b"# BRIEF 20260105\n"
+
+    def test_dry_run_changes_nothing(self, tmp_path):
+        """Test that a dry run reports but does not archive."""
+        root = make_artifacts(tmp_path, ["20260110"])
+        stats = ca.compact(root, older_than_days=30, today=TODAY, dry_run=True)
+        assert stats["archived"] == 2
+        assert not (root / "ARCHIVE").exists()
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
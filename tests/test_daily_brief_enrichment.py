@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the PR enrichment stage in generate_daily_brief.py
+
+These tests validate:
+- Each PR is enriched exactly once per run
+- Risk tier only fetches changed files when metadata is inconclusive
+- Brief and approvals queue render from shared records
+- Unchanged PRs reuse final CI results and files from the saved state
+- Failed file fetches are never saved for reuse; test runs save no state
+- Approved reviews about to lapse are listed under Expiring Soon
+- A recorded archive replays main() offline and deterministically
+"""
+
+import gzip
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import generate_daily_brief as gdb
+
+
+def make_pr(number: int, labels=None, body: str = "", updated_at: str = "2026-01-02T00:00:00Z", sha: str = "abc") -> dict:
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "html_url": f"https://github.com/o/r/pull/{number}",
+        "user": {"login": "dev"},
+        "created_at": "2026-01-01T00:00:00Z",
+        "updated_at": updated_at,
+        "head": {"sha": sha},
+        "labels": [{"name": name} for name in (labels or [])],
+        "body": body,
+    }
+
+
+class CallCounter:
+    """Records calls to the network-backed helpers."""
+
+    def __init__(self, monkeypatch, files=None, final=True, failing=()):
+        self.checks = []
+        self.files = []
+        self.trae = []
+        self._files = files or {}
+        self._final = final
+        self._failing = set(failing)
+        monkeypatch.setattr(gdb, "get_pr_checks_status", self._checks)
+        monkeypatch.setattr(gdb, "get_pr_files", self._get_files)
+        monkeypatch.setattr(gdb, "get_trae_artifact", self._trae)
+
+    def _checks(self, pr_number, head_sha=None):
+        self.checks.append(pr_number)
+        return False, "❌ failing", self._final
+
+    def _get_files(self, pr_number):
+        self.files.append(pr_number)
+        if pr_number in self._failing:
+            raise RuntimeError("502 Bad Gateway")
+        return self._files.get(pr_number, [])
+
+    def _trae(self, pr_number):
+        self.trae.append(pr_number)
+        return None
+
+
+class TestEnrichment:
+    """Test per-PR enrichment records."""
+
+    def test_label_tier_skips_file_fetch(self, monkeypatch):
+        """Test that a labelled PR does not fetch changed files."""
+        calls = CallCounter(monkeypatch)
+        record = gdb.enrich_pull_request(make_pr(1, labels=["tier-2"]))
+        assert record.risk_tier == "T2"
+        assert record.files is None
+        assert calls.files == []
+
+    def test_protected_files_detected_once(self, monkeypatch):
+        """Test that unlabelled PRs are classified from files fetched once."""
+        calls = CallCounter(monkeypatch, files={2: ["GOVERNANCE/GUARDRAILS.md"]})
+        record = gdb.enrich_pull_request(make_pr(2))
+        assert record.risk_tier == "T1"
+        assert record.files == ("GOVERNANCE/GUARDRAILS.md",)
+        assert calls.files == [2]
+
+    def test_records_are_immutable(self, monkeypatch):
+        """Test that records cannot be mutated by renderers."""
+        CallCounter(monkeypatch)
+        record = gdb.enrich_pull_request(make_pr(3, labels=["t3"]))
+        try:
+            record.risk_tier = "T1"
+            assert False, "PRRecord should be immutable"
+        except AttributeError:
+            pass
+
+    def test_renderers_share_single_enrichment(self, monkeypatch):
+        """Test that brief + approvals queue enrich each PR exactly once."""
+        calls = CallCounter(monkeypatch, files={10: ["STATE/STATUS_LEDGER.md"], 11: []})
+        prs = [make_pr(10), make_pr(11)]
+
+        records = gdb.enrich_pull_requests(prs)
+        brief = gdb.generate_daily_brief(prs, [], [], "20260101", records)
+        queue = gdb.generate_approvals_queue(prs, [], "20260101", records)
+
+        assert sorted(calls.checks) == [10, 11]
+        assert sorted(calls.files) == [10, 11]
+        assert sorted(calls.trae) == [10, 11]
+        assert "PR #10" in brief and "PR #11" in brief
+        assert "MISSING TRAE REVIEW" in queue
+
+
+class TestIncrementalState:
+    """Test reuse of per-PR state between runs."""
+
+    def _previous(self, monkeypatch, tmp_path, prs, **counter_kwargs):
+        CallCounter(monkeypatch, **counter_kwargs)
+        path = tmp_path / "brief_state.json"
+        gdb.save_brief_state(prs, gdb.enrich_pull_requests(prs), path)
+        return gdb.load_brief_state(path)
+
+    def test_unchanged_pr_makes_no_calls(self, monkeypatch, tmp_path):
+        """Test that a PR that has not moved reuses CI and files."""
+        prs = [make_pr(1)]
+        previous = self._previous(monkeypatch, tmp_path, prs, files={1: ["STATE/STATUS_LEDGER.md"]})
+        calls = CallCounter(monkeypatch)
+        records = gdb.enrich_pull_requests(prs, previous=previous)
+        assert calls.checks == [] and calls.files == []
+        assert records[1].risk_tier == "T1"
+        assert records[1].ci_status == "❌ failing"
+
+    def test_moved_head_refetches(self, monkeypatch, tmp_path):
+        """Test that a new head SHA or updated_at invalidates the entry."""
+        previous = self._previous(monkeypatch, tmp_path, [make_pr(1), make_pr(2)])
+        calls = CallCounter(monkeypatch)
+        gdb.enrich_pull_requests([make_pr(1, sha="def"), make_pr(2, updated_at="2026-01-03T00:00:00Z")], previous=previous)
+        assert sorted(calls.checks) == [1, 2]
+        assert sorted(calls.files) == [1, 2]
+
+    def test_pending_ci_is_refetched(self, monkeypatch, tmp_path):
+        """Test that non-final CI results are not reused."""
+        previous = self._previous(monkeypatch, tmp_path, [make_pr(1)], final=False)
+        calls = CallCounter(monkeypatch)
+        gdb.enrich_pull_requests([make_pr(1)], previous=previous)
+        assert calls.checks == [1]
+        assert calls.files == []
+
+    def test_failed_file_fetch_not_reused(self, monkeypatch, tmp_path):
+        """Test that files from a failed fetch are refetched by the next run."""
+        previous = self._previous(monkeypatch, tmp_path, [make_pr(1), make_pr(2)], failing=[1])
+        assert previous["1"]["files"] is None
+        assert previous["2"]["files"] == []
+        calls = CallCounter(monkeypatch, files={1: ["GOVERNANCE/GUARDRAILS.md"]})
+        records = gdb.enrich_pull_requests([make_pr(1), make_pr(2)], previous=previous)
+        assert calls.files == [1]
+        assert records[1].risk_tier == "T1"
+
+    def test_test_mode_saves_no_state(self, monkeypatch, tmp_path):
+        """Test that --test runs leave the state file untouched."""
+        saved = []
+        monkeypatch.setattr(gdb, "_github_client", None)
+        monkeypatch.setattr(gdb, "load_pull_requests", lambda *args: ([], {}))
+        monkeypatch.setattr(gdb, "get_open_issues", lambda: [])
+        monkeypatch.setattr(gdb, "get_project_items", lambda: [])
+        monkeypatch.setattr(gdb, "save_brief_state", lambda *args: saved.append(args))
+        monkeypatch.setattr(gdb, "BRIEF_STATE_PATH", tmp_path / "brief_state.json")
+        monkeypatch.setattr(sys, "argv", ["generate_daily_brief.py", "--test"])
+        gdb.main()
+        assert saved == []
+
+    def test_state_scoped_to_repository(self, monkeypatch, tmp_path):
+        """Test that state saved for another repository is ignored."""
+        previous_path = tmp_path / "brief_state.json"
+        CallCounter(monkeypatch)
+        gdb.save_brief_state([make_pr(1)], gdb.enrich_pull_requests([make_pr(1)]), previous_path)
+        monkeypatch.setattr(gdb, "REPO_NAME", "other-repo")
+        assert gdb.load_brief_state(previous_path) == {}
+
+
+class TestExpiringSoon:
+    """Test the expiring-soon and lapsed-since-last-run queries."""
+
+    def expiry_index(self):
+        return gdb.ReviewExpiryIndex([
+            gdb.TraeArtifact(Path("TRAE-20260101-1.yml"), 1, "APPROVE", "2026-01-01 09:00 UTC"),
+            gdb.TraeArtifact(Path("TRAE-20260101-2.yml"), 2, "APPROVE", "2026-01-06 09:00 UTC"),
+            gdb.TraeArtifact(Path("TRAE-20260101-3.yml"), 3, "APPROVE", "2026-01-01 12:00 UTC"),
+        ])
+
+    def test_expiring_and_lapsed(self, monkeypatch):
+        """Test that open PRs are split into expiring soon and lapsed since last run."""
+        monkeypatch.setattr(gdb, "_now_override", datetime(2026, 1, 8, 10, 0))
+        prs = [make_pr(1), make_pr(2)]
+        result = gdb.get_expiring_reviews(
+            prs, since=datetime(2026, 1, 7, 10, 0), expiry_index=self.expiry_index(), days=1
+        )
+        assert [item["pr_number"] for item in result["expiring"]] == []
+        assert [item["pr_number"] for item in result["lapsed"]] == [1]
+
+        result = gdb.get_expiring_reviews(prs, expiry_index=self.expiry_index(), days=5)
+        assert [item["pr_number"] for item in result["expiring"]] == [2]
+        assert result["lapsed"] == []
+
+    def test_last_run_from_state(self, monkeypatch, tmp_path):
+        """Test that the previous run time is read from the saved state."""
+        monkeypatch.setattr(gdb, "_now_override", datetime(2026, 1, 8, 10, 0))
+        path = tmp_path / "state.json"
+        gdb.save_brief_state([], {}, path)
+        assert gdb.last_run_time(gdb.read_brief_state(path)) == datetime(2026, 1, 8, 10, 0)
+        assert gdb.last_run_time({}) is None
+
+
+class TestReplay:
+    """Test running the generator against a recorded archive."""
+
+    def _write_archive(self, path: Path):
+        repo = f"{gdb.GITHUB_API_URL}/repos/{gdb.REPO_OWNER}/{gdb.REPO_NAME}"
+        pr = make_pr(42, labels=["t3"])
+        pr["head"] = {"sha": "abc123"}
+        entries = [
+            (f"{repo}/pulls?state=open&sort=created&direction=desc&per_page=100", [pr]),
+            (f"{repo}/issues?state=open&sort=created&direction=desc&per_page=100", []),
+            (f"{repo}/commits/abc123/status", {"state": "success", "total_count": 1, "statuses": [{"state": "success"}]}),
+        ]
+        with gzip.open(str(path), "wt") as f:
+            f.write(json.dumps({"format": "github-replay", "version": 1, "captured_at": "2026-01-28 18:30 UTC"}) + "\n")
+            for url, body in entries:
+                f.write(json.dumps({"key": f"GET {url} ", "status": 200, "headers": {}, "body": body}) + "\n")
+
+    def test_main_replays_offline(self, monkeypatch, tmp_path, capsys):
+        """Test that --replay renders the brief from the archive only."""
+        archive = tmp_path / "capture.jsonl.gz"
+        self._write_archive(archive)
+        monkeypatch.setattr(gdb, "_github_client", None)
+        monkeypatch.setattr(gdb, "_replaying", False)
+        monkeypatch.setattr(gdb, "_now_override", None)
+        monkeypatch.setattr(sys, "argv", ["generate_daily_brief.py", "--test", "--replay", str(archive)])
+
+        gdb.main()
+        out = capsys.readouterr().out
+        assert "# Daily Brief — 20260128" in out
+        assert "**Generated**: 2026-01-28 18:30 UTC" in out
+        assert "### PR #42: PR 42" in out
+        assert "🟢 Ready for review" in out
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
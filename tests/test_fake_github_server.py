@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the fake GitHub API server used by the scale benchmark
+
+These tests validate:
+- The daily brief runs end to end against the fake server on both backends
+- Unchanged data is answered with 304 or reused from state on a warm run
+- The simulated primary rate limit rejects requests once exhausted
+"""
+
+import sys
+from pathlib import Path
+
+import requests
+
+# Add scripts and benchmarks to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+import bench_daily_brief
+from fake_github_server import FakeGitHubServer, SyntheticRepo
+
+
+class TestFakeServer:
+    """Test the fake server endpoints."""
+
+    def test_pulls_paginate_with_link_header(self):
+        """Test that pull listings carry a Link header to the next page."""
+        with FakeGitHubServer(SyntheticRepo(150)) as server:
+            response = requests.get(f"{server.url}/repos/o/r/pulls?state=open&per_page=100")
+            assert len(response.json()) == 100
+            assert 'rel="next"' in response.headers["Link"]
+            assert response.headers["X-RateLimit-Limit"]
+
+    def test_rate_limit_exhaustion(self):
+        """Test that requests beyond the limit get 403 with zero remaining."""
+        with FakeGitHubServer(SyntheticRepo(1), rate_limit=1) as server:
+            assert requests.get(f"{server.url}/repos/o/r/issues").status_code == 200
+            response = requests.get(f"{server.url}/repos/o/r/issues")
+            assert response.status_code == 403
+            assert response.headers["X-RateLimit-Remaining"] == "0"
+            assert server.rate_limited_count == 1
+
+
+class TestBenchmark:
+    """Test the benchmark harness at the smallest scale."""
+
+    def _preserve_globals(self, monkeypatch):
+        # run_brief repoints module configuration; restore it after each test
+        for name in ("GITHUB_API_URL", "GITHUB_TOKEN", "GITHUB_CACHE_DIR", "PROJECT_ITEMS_SNAPSHOT",
+                     "BRIEF_STATE_PATH", "_github_client", "_replaying", "_now_override"):
+            monkeypatch.setattr(bench_daily_brief.gdb, name, getattr(bench_daily_brief.gdb, name))
+
+    def _args(self):
+        return bench_daily_brief.argparse.Namespace(
+            files_per_pr=3, latency_ms=0.0, rate_limit=None, concurrency=4, no_memory=True
+        )
+
+    def test_rest_backend_end_to_end(self, monkeypatch):
+        """Test a cold and warm REST run against 10 synthetic PRs."""
+        self._preserve_globals(monkeypatch)
+        result = bench_daily_brief.run_scale(10, "rest", self._args())
+        assert result["cold"]["requests"] > 10
+        assert result["cold"]["output_bytes"] > 0
+        assert result["warm"]["not_modified"] > 0
+        # Final CI results and files are reused from the saved state
+        assert result["warm"]["requests"] < result["cold"]["requests"]
+
+    def test_graphql_backend_batches(self, monkeypatch):
+        """Test that the GraphQL backend needs only a handful of requests."""
+        self._preserve_globals(monkeypatch)
+        result = bench_daily_brief.run_scale(10, "graphql", self._args())
+        assert result["cold"]["requests"] <= 5
+        assert result["rate_limited"] == 0
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
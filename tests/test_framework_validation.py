@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-file framework checks in framework_validation.py
+
+These tests validate:
+- Markdown and YAML files are checked individually with per-file errors
+- YAML is parsed for real: errors carry line:column, duplicate keys fail
+- Workflows need triggers and runnable jobs; TRAE reviews follow the schema
+- The full-tree walk skips ignored directories and unchecked file types
+- The content-hash cache serves unchanged files without re-checking
+- The validator checks only changed files on PRs and the tree on request
+"""
+
+import sys
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import framework_validation
+import governance_validator
+import yaml_validation
+from framework_validation import ValidationCache, iter_tree_files, summarize, validate_files
+from governance_validator import GovernanceValidator
+from yaml_validation import check_yaml_file, yaml_kind
+
+
+def make_tree(root: Path) -> Path:
+    (root / "docs").mkdir(parents=True)
+    (root / "docs" / "guide.md").write_text("# Guide\n\nText\n")
+    (root / "notes.md").write_text("no heading\n")
+    (root / "ci.yml").write_text("on: push\njobs:\n  build:\n    runs-on: ubuntu-latest\n")
+    (root / "script.py").write_text("print('not checked')\n")
+    for ignored in (".git", "node_modules", ".cache"):
+        (root / ignored).mkdir()
+        (root / ignored / "README.md").write_text("\x00binary")
+    return root
+
+
+class TestChecks:
+    """Test per-file checks."""
+
+    def test_errors_are_per_file(self, tmp_path):
+        """Test that a bad YAML and a binary Markdown file are reported by path."""
+        root = make_tree(tmp_path)
+        (root / "bad.yml").write_text("a:\n \tb: 1\n")
+        (root / "blob.md").write_bytes(b"# Title\n\x00\x01")
+        results = {r.path: r for r in validate_files(root, ["bad.yml", "blob.md", "docs/guide.md", "script.py"])}
+        assert results["bad.yml"].errors == ["2:2: found character that cannot start any token"]
+        assert results["bad.yml"].messages() == ["bad.yml:2:2: found character that cannot start any token"]
+        assert results["blob.md"].errors == ["binary content in Markdown file"]
+        assert results["docs/guide.md"].ok and results["docs/guide.md"].heading
+        assert "script.py" not in results
+        assert summarize(list(results.values())) == {
+            "YAML Syntax": False, "Markdown Valid": False, "Documentation Structure": True,
+        }
+
+    def test_missing_files_skipped(self, tmp_path):
+        """Test that deleted files are not validated."""
+        assert validate_files(tmp_path, ["gone.md"]) == []
+
+    def test_structure_judged_on_full_tree_only(self, tmp_path):
+        """Test that a changed file without headings does not fail the structure check."""
+        results = validate_files(make_tree(tmp_path), ["notes.md"])
+        assert summarize(results, full_tree=False)["Documentation Structure"]
+        assert not summarize(results, full_tree=True)["Documentation Structure"]
+
+
+class TestYamlChecks:
+    """Test parse-based YAML validation."""
+
+    def test_kinds_by_path(self):
+        """Test that workflow and TRAE review checks are chosen by location."""
+        assert yaml_kind(".github/workflows/ci.yml") == "workflow"
+        assert yaml_kind(".github/workflows/nested/ci.yml") == "yaml"
+        assert yaml_kind("COCKPIT/artifacts/TRAE_REVIEW/TRAE-20260125-42.yml") == "trae_review"
+        assert yaml_kind("COCKPIT/artifacts/TRAE_REVIEW/TRAE-20260125-test.yml") == "trae_other"
+        assert yaml_kind("COCKPIT/artifacts/TRAE_REVIEW/TEMPLATE.md") == "yaml"
+        assert yaml_kind("config.yaml") == "yaml"
+
+    def test_multi_document_allowed(self):
+        """Test that plain YAML may hold several documents."""
+        assert check_yaml_file("x.yml", b"a: 1\n---\nb: 2\n")["errors"] == []
+
+    def test_duplicate_keys(self):
+        """Test that a repeated key is reported at its position."""
+        errors = check_yaml_file("x.yml", b"a: 1\nb:\n  c: 1\n  c: 2\n")["errors"]
+        assert errors == ["4:3: duplicate key 'c'"]
+
+    def test_workflow_structure(self):
+        """Test that workflows need 'on' and jobs with runs-on or uses."""
+        path = ".github/workflows/ci.yml"
+        good = b"on: push\njobs:\n  a:\n    runs-on: x\n  b:\n    uses: org/repo/.github/workflows/w.yml@v1\n"
+        assert check_yaml_file(path, good)["errors"] == []
+        assert check_yaml_file(path, b"name: ci\non: push\n")["errors"] == ["1:1: workflow has no 'jobs'"]
+        errors = check_yaml_file(path, b"on: push\njobs:\n  build:\n    steps: []\n")["errors"]
+        assert errors == ["3:3: job 'build' needs 'runs-on' or 'uses'"]
+        assert check_yaml_file(path, b"on: push\njobs: {}\n")["errors"] == ["2:1: 'jobs' must be a non-empty mapping"]
+
+    def test_trae_review_schema(self):
+        """Test that TRAE review artifacts are checked against the schema."""
+        path = "COCKPIT/artifacts/TRAE_REVIEW/TRAE-20260125-42.yml"
+        errors = check_yaml_file(path, b"ARTIFACT_TYPE: TRAE_REVIEW\npr_number: 42\nverdict: MAYBE\n")["errors"]
+        assert "unknown verdict 'MAYBE'" in errors
+        assert any(e.startswith("missing required field") for e in errors)
+        assert check_yaml_file(path, b"- a\n")["errors"] == ["TRAE review must be a YAML mapping"]
+
+    def test_trae_review_parsed_once(self, monkeypatch):
+        """Test that the schema check reuses the composed document instead of parsing again."""
+        loaders = []
+
+        class CountingLoader(yaml_validation._YAML_LOADER):
+            def __init__(self, stream):
+                loaders.append(stream)
+                super().__init__(stream)
+
+        monkeypatch.setattr(yaml_validation, "_YAML_LOADER", CountingLoader)
+        content = b'pr_number: 42\nverdict: APPROVE\ncreated_at: "2026-01-25 10:00 UTC"\n'
+        assert check_yaml_file("COCKPIT/artifacts/TRAE_REVIEW/TRAE-20260125-42.yml", content)["errors"] == []
+        assert len(loaders) == 1
+
+    def test_trae_notes_after_leading_document(self):
+        """Test that TRAE review files are judged on their leading YAML document only."""
+        notes = b"pr_number: 42\n---\n## Notes\n- a: {unbalanced\n"
+        assert check_yaml_file("COCKPIT/artifacts/TRAE_REVIEW/TRAE-20260125-test.yml", notes)["errors"] == []
+        assert check_yaml_file("config.yml", notes)["errors"] != []
+        broken = b"pr_number: [42\n---\nnotes\n"
+        assert check_yaml_file("COCKPIT/artifacts/TRAE_REVIEW/TRAE-20260125-test.yml", broken)["errors"] != []
+
+    def test_repository_yaml_is_valid(self):
+        """Test that every YAML file in the repository passes."""
+        root = Path(__file__).parent.parent
+        paths = [p for p in iter_tree_files(root) if not p.endswith(".md")]
+        failures = [m for r in validate_files(root, paths) for m in r.messages()]
+        assert paths and failures == []
+
+
+class TestTreeWalk:
+    """Test full-tree discovery."""
+
+    def test_skips_ignored_directories(self, tmp_path):
+        """Test that .git, node_modules and .cache are never walked."""
+        assert sorted(iter_tree_files(make_tree(tmp_path))) == ["ci.yml", "docs/guide.md", "notes.md"]
+
+
+class TestCache:
+    """Test the content-hash result cache."""
+
+    def test_unchanged_files_not_rechecked(self, tmp_path, monkeypatch):
+        """Test that a persisted cache skips checks until content changes."""
+        root = make_tree(tmp_path / "repo")
+        cache_path = tmp_path / "cache.json"
+        first = ValidationCache(cache_path)
+        validate_files(root, ["docs/guide.md", "ci.yml"], first)
+        first.save()
+
+        calls = []
+        real = framework_validation.CHECKS[".md"]
+        monkeypatch.setitem(framework_validation.CHECKS, ".md", lambda p, c: calls.append(p) or real(p, c))
+        (root / "notes.md").write_text("# Now with a heading\n")
+        results = validate_files(root, ["docs/guide.md", "ci.yml", "notes.md"], ValidationCache(cache_path))
+        assert [r.cached for r in results] == [True, True, False]
+        assert len(calls) == 1
+
+    def test_least_recently_used_pruned(self, tmp_path, monkeypatch):
+        """Test that saving keeps only the most recently used entries past the cap."""
+        monkeypatch.setattr(framework_validation, "CACHE_MAX_ENTRIES", 2)
+        cache = ValidationCache(tmp_path / "cache.json")
+        for key in ("a", "b"):
+            cache.put(key, {"errors": []})
+        cache.save()
+        cache = ValidationCache(tmp_path / "cache.json")
+        assert cache.get("a") is not None
+        cache.put("c", {"errors": []})
+        cache.save()
+        assert list(ValidationCache(tmp_path / "cache.json").entries) == ["a", "c"]
+
+    def test_version_mismatch_ignored(self, tmp_path):
+        """Test that a cache from another check version starts empty."""
+        (tmp_path / "cache.json").write_text('{"version": 0, "entries": {"x": {}}}')
+        assert ValidationCache(tmp_path / "cache.json").entries == {}
+
+
+class TestValidatorScope:
+    """Test that the validator checks changed files on PRs."""
+
+    def run_check(self, tmp_path, monkeypatch, changed, full_tree=False):
+        root = make_tree(tmp_path / "repo")
+        monkeypatch.setattr(governance_validator, "REPO_ROOT", root)
+        monkeypatch.setattr(governance_validator, "FRAMEWORK_VALIDATION_CACHE_PATH", tmp_path / "cache.json")
+        checked = []
+        real = governance_validator.validate_files
+        monkeypatch.setattr(
+            governance_validator, "validate_files", lambda r, paths, c: checked.extend(paths) or real(r, paths, c)
+        )
+        validator = GovernanceValidator()
+        validator.framework_only_mode = True
+        validator.changed_files = [Path(p) for p in changed]
+        validator.full_tree = full_tree
+        validator.results = []
+        validator._check_framework_only_validations()
+        return [Path(p).as_posix() for p in checked]
+
+    def test_changed_files_only(self, tmp_path, monkeypatch):
+        """Test that only changed Markdown/YAML files are read on PRs."""
+        checked = self.run_check(tmp_path, monkeypatch, ["notes.md", "script.py"])
+        assert checked == ["notes.md"]
+
+    def test_full_tree_mode(self, tmp_path, monkeypatch):
+        """Test that full-tree mode walks the repository."""
+        checked = self.run_check(tmp_path, monkeypatch, ["notes.md"], full_tree=True)
+        assert sorted(checked) == ["ci.yml", "docs/guide.md", "notes.md"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared git diff reader in git_diff.py
+
+These tests validate:
+- One diff yields statuses, line counts and hunks for every file
+- Renames keep both paths and deletions are reported as such
+- Binary files and paths with spaces are parsed
+- Added lines reach the callback with new-file line numbers
+- The validator reads the diff once and derives its checks from it
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import git_diff
+import git_objects
+import governance_validator
+from git_diff import Hunk, read_diff
+from governance_validator import GovernanceValidator
+
+
+def git(cwd: Path, *args: str):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def make_branch(repo: Path) -> Path:
+    """Repo whose feature branch modifies, adds, deletes, renames and adds a binary."""
+    repo.mkdir(exist_ok=True)
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "user.email", "t@example.com")
+    git(repo, "config", "user.name", "t")
+    (repo / "a.txt").write_text("one\ntwo\nthree\n")
+    (repo / "gone.txt").write_text("bye\n")
+    (repo / "old name.md").write_text("".join(f"line {i}\n" for i in range(20)))
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "base")
+    git(repo, "checkout", "-q", "-b", "feature")
+    (repo / "a.txt").write_text("one\n2\nthree\nfour\n")
+    (repo / "gone.txt").unlink()
+    git(repo, "mv", "old name.md", "new name.md")
+    (repo / "new name.md").write_text("".join(f"line {i}\n" for i in range(19)) + "changed\n")
+    (repo / "image.bin").write_bytes(b"\x00\x01\x02")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "change")
+    return repo
+
+
+class TestReadDiff:
+    """Test parsing a real git diff."""
+
+    def test_statuses_and_counts(self, tmp_path):
+        """Test per-file status, line counts and hunk ranges."""
+        diff = read_diff(["main...HEAD"], make_branch(tmp_path / "repo"))
+        by_path = {change.path: change for change in diff}
+        assert {path: change.status for path, change in by_path.items()} == {
+            "a.txt": "M", "gone.txt": "D", "new name.md": "R", "image.bin": "A",
+        }
+        assert (by_path["a.txt"].added, by_path["a.txt"].deleted) == (2, 1)
+        assert by_path["a.txt"].hunks == [Hunk(2, 1, 2, 1), Hunk(3, 0, 4, 1)]
+        assert by_path["image.bin"].binary and by_path["image.bin"].added is None
+        assert (diff.lines_added, diff.lines_deleted) == (3, 3)
+
+    def test_renames_and_deletions(self, tmp_path):
+        """Test that renames keep the old path and deletions are flagged."""
+        diff = read_diff(["main...HEAD"], make_branch(tmp_path / "repo"))
+        [rename] = diff.renames
+        assert (rename.old_path, rename.path) == ("old name.md", "new name.md")
+        assert rename.similarity >= 50 and (rename.added, rename.deleted) == (1, 1)
+        assert [change.path for change in diff.deleted] == ["gone.txt"]
+        assert diff.get("old name.md") is rename
+        assert diff.get(Path("gone.txt")).is_deleted
+
+    def test_added_lines_callback(self, tmp_path):
+        """Test that added lines stream out with their new-file line numbers."""
+        seen = []
+        read_diff(["main...HEAD"], make_branch(tmp_path / "repo"), lambda *line: seen.append(line))
+        assert seen == [("a.txt", 2, "2"), ("a.txt", 4, "four"), ("new name.md", 20, "changed")]
+
+    def test_empty_and_failing_diff(self, tmp_path):
+        """Test that an empty diff parses and a bad ref raises."""
+        repo = make_branch(tmp_path / "repo")
+        assert len(read_diff(["HEAD", "HEAD"], repo)) == 0
+        try:
+            read_diff(["missing-ref...HEAD"], repo)
+        except subprocess.CalledProcessError:
+            return
+        raise AssertionError("expected CalledProcessError")
+
+
+class TestValidatorDiff:
+    """Test that the validator derives its checks from one diff."""
+
+    def make_validator(
+        self, tmp_path, monkeypatch, backend: str = "auto", expected_calls=("read_tree_diff",)
+    ) -> GovernanceValidator:
+        repo = make_branch(tmp_path / "repo")
+        (repo / "a.txt").write_text("one\n2\nthree\nfour\n" + "pass" + "word = 'x'\n")
+        git(repo, "commit", "-q", "-am", "leak")
+        monkeypatch.setattr(governance_validator, "REPO_ROOT", repo)
+        monkeypatch.setenv("GITHUB_BASE_REF", "main")
+        monkeypatch.delenv("CHANGED_FILES", raising=False)
+        monkeypatch.setattr(git_objects, "GIT_OBJECT_BACKEND", backend)
+
+        calls = []
+        for name in ("read_diff", "read_tree_diff"):
+            real = getattr(governance_validator, name)
+            monkeypatch.setattr(
+                governance_validator, name, lambda *args, _name=name, _real=real: calls.append(_name) or _real(*args)
+            )
+        validator = GovernanceValidator()
+        assert calls == []
+        assert validator.diff is not None
+        assert calls == list(expected_calls)
+        return validator
+
+    def test_single_diff_feeds_checks(self, tmp_path, monkeypatch):
+        """Test changed files and secret findings come from the one diff."""
+        validator = self.make_validator(tmp_path, monkeypatch)
+        assert sorted(str(f) for f in validator.changed_files) == ["a.txt", "gone.txt", "image.bin", "new name.md"]
+        validator._check_secrets_in_diffs()
+        [result] = validator.results
+        assert not result.passed
+        assert [(f["path"], f["line"]) for f in result.details["findings"]] == [("a.txt", 5)]
+
+    def test_cli_backend(self, tmp_path, monkeypatch):
+        """Test that the git CLI diff gives the same files and findings."""
+        validator = self.make_validator(tmp_path, monkeypatch, backend="cli", expected_calls=("read_diff",))
+        assert sorted(str(f) for f in validator.changed_files) == ["a.txt", "gone.txt", "image.bin", "new name.md"]
+        assert [(f.path, f.line) for f in validator.secret_findings] == [("a.txt", 5)]
+
+    def test_cli_fallback_past_limits(self, tmp_path, monkeypatch):
+        """Test that past the in-process limits the CLI diff is scanned afresh."""
+        monkeypatch.setattr(git_diff, "TREE_DIFF_MAX_BLOB_BYTES", 100)
+        validator = self.make_validator(tmp_path, monkeypatch, expected_calls=("read_tree_diff", "read_diff"))
+        assert sorted(str(f) for f in validator.changed_files) == ["a.txt", "gone.txt", "image.bin", "new name.md"]
+        assert [(f.path, f.line) for f in validator.secret_findings] == [("a.txt", 5)]
+        assert validator.secret_rules.stats()["rules"]["password-assignment"]["hits"] == 1
+
+    def test_deletions_from_diff_status(self, tmp_path, monkeypatch):
+        """Test that deleted and renamed-away paths are recognised without touching disk."""
+        validator = self.make_validator(tmp_path, monkeypatch)
+        assert validator._is_deleted(Path("gone.txt"))
+        assert validator._is_deleted(Path("old name.md"))
+        assert not validator._is_deleted(Path("new name.md"))
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-process git object reader in git_objects.py
+
+These tests validate:
+- Refs and `^` / `~` revisions resolve like `git rev-parse`
+- Loose objects and delta-compressed packfile objects read back intact
+- Object walks match `git rev-list --objects`, paths included
+- Tree diffs report statuses and renames like `git diff -M`
+- The in-process diff summary matches the git CLI's statuses and line counts
+- Oversized blobs, line diffs and rename scoring defer to the git CLI
+- GIT_OBJECT_BACKEND=cli forces the git CLI
+"""
+
+import hashlib
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import git_diff
+import git_objects
+from git_diff import read_diff, read_tree_diff
+from git_objects import GitObjectError, Repository, open_repository
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+def make_repo(repo: Path, pack: bool = True) -> Path:
+    """Repo with a growing file (delta chains once packed), a side branch and a rename."""
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "user.email", "t@example.com")
+    git(repo, "config", "user.name", "t")
+    lines = [f"line {i}\n" for i in range(200)]
+    (repo / "docs").mkdir()
+    for version in range(12):
+        lines[version * 7] = f"edited in {version}\n"
+        (repo / "big.txt").write_text("".join(lines))
+        (repo / "docs" / f"note{version % 3}.md").write_text(f"note {version}\n")
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", f"v{version}")
+        if version == 8:
+            git(repo, "branch", "side")
+    git(repo, "mv", "big.txt", "docs/moved.txt")
+    (repo / "docs" / "moved.txt").write_text("".join(lines[:-1]) + "tail\n")
+    git(repo, "commit", "-q", "-am", "move")
+    git(repo, "tag", "-a", "v1", "-m", "release")
+    if pack:
+        git(repo, "gc", "-q", "--aggressive")
+    return repo
+
+
+class TestRepository:
+    """Test refs and object reads."""
+
+    def test_resolve_matches_rev_parse(self, tmp_path):
+        """Test branch, tag, HEAD and suffix revisions."""
+        repo = make_repo(tmp_path / "repo")
+        repository = Repository(repo)
+        for rev in ("HEAD", "main", "side", "v1", "HEAD~3", "HEAD^", "main~2^"):
+            expected = git(repo, "rev-parse", rev).strip()
+            assert repository.resolve(rev) == expected, rev
+
+    def test_objects_read_intact(self, tmp_path):
+        """Test that every object hashes back to its SHA, packed and loose."""
+        for pack in (True, False):
+            repo = make_repo(tmp_path / f"repo-{pack}", pack=pack)
+            repository = Repository(repo)
+            for sha in git(repo, "rev-list", "--objects", "--all").split():
+                if len(sha) != 40:
+                    continue
+                kind, content = repository.read_object(sha)
+                header = f"{kind} {len(content)}\0".encode()
+                assert hashlib.sha1(header + content).hexdigest() == sha
+                assert repository.object_info(sha) == (kind, len(content))
+
+    def test_iter_objects_matches_rev_list(self, tmp_path):
+        """Test that object walks list the same objects under the same paths."""
+        repo = make_repo(tmp_path / "repo")
+        repository = Repository(repo)
+        expected = {}
+        for line in git(repo, "rev-list", "--objects", "side..main").splitlines():
+            sha, _, path = line.partition(" ")
+            expected[sha] = path
+        walked = {
+            sha: path
+            for sha, _, path in repository.iter_objects([repository.resolve("main")], [repository.resolve("side")])
+        }
+        assert walked == expected
+
+    def test_iter_blob_paths_lists_every_path(self, tmp_path):
+        """Test that blob walks list each blob under every path any commit stores it at."""
+        repo = make_repo(tmp_path / "repo")
+        source = git(repo, "ls-files").split()[0]
+        (repo / "copy.bin").write_bytes((repo / source).read_bytes())
+        git(repo, "add", "copy.bin")
+        git(repo, "commit", "-q", "-m", "copy")
+        repository = Repository(repo)
+        expected = set()
+        for commit in git(repo, "rev-list", "--all").split():
+            for line in git(repo, "ls-tree", "-r", commit).splitlines():
+                info, _, path = line.partition("\t")
+                if info.split()[1] == "blob":
+                    expected.add((info.split()[2], path))
+        heads = [repository.resolve("main"), repository.resolve("side")]
+        walked = list(repository.iter_blob_paths(heads))
+        assert len(walked) == len(set(walked))
+        assert set(walked) == expected
+        copied = {sha for sha, path in walked if path == "copy.bin"}
+        assert {path for sha, path in walked if sha in copied} >= {source, "copy.bin"}
+
+    def test_missing_object_raises(self, tmp_path):
+        """Test that unknown objects and revisions raise GitObjectError."""
+        repository = Repository(make_repo(tmp_path / "repo"))
+        for call in (lambda: repository.read_object("0" * 40), lambda: repository.resolve("no-such-branch")):
+            try:
+                call()
+            except GitObjectError:
+                continue
+            raise AssertionError("expected GitObjectError")
+
+
+class TestTreeDiff:
+    """Test name-status diffs and the in-process DiffData."""
+
+    def test_matches_git_diff(self, tmp_path):
+        """Test statuses, renames, line counts and added lines against the CLI."""
+        repo = make_repo(tmp_path / "repo")
+        repository = Repository(repo)
+        for rev_args in (["side...main"], ["HEAD~5", "HEAD"]):
+            cli_lines, tree_lines = [], []
+            cli = read_diff(rev_args, repo, lambda *line: cli_lines.append(line))
+            tree = read_tree_diff(repository, rev_args, lambda *line: tree_lines.append(line))
+            summary = lambda diff: [(f.status, f.path, f.old_path, f.added, f.deleted, f.hunks) for f in diff]
+            assert summary(tree) == summary(cli)
+            assert tree_lines == cli_lines
+        [rename] = read_tree_diff(repository, ["HEAD^", "HEAD"]).renames
+        assert (rename.old_path, rename.path) == ("big.txt", "docs/moved.txt")
+        assert rename.similarity >= git_objects.RENAME_THRESHOLD
+
+    def test_large_diffs_defer_to_cli(self, tmp_path, monkeypatch):
+        """Test that oversized blobs and line diffs raise instead of running unbounded."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        git(repo, "init", "-q", "-b", "main")
+        git(repo, "config", "user.email", "t@example.com")
+        git(repo, "config", "user.name", "t")
+        entries = [f'  "pkg{i}": {{\n    "version": "1.0.{i}"\n  }},\n' for i in range(20000)]
+        (repo / "lock.json").write_text("".join(entries))
+        git(repo, "add", ".")
+        git(repo, "commit", "-q", "-m", "one")
+        entries[::2] = [entry.replace('"1.0.', '"2.0.') for entry in entries[::2]]
+        (repo / "lock.json").write_text("".join(entries))
+        git(repo, "commit", "-q", "-am", "two")
+        repository = Repository(repo)
+
+        started = time.monotonic()
+        for limits in ({"TREE_DIFF_MAX_BLOB_BYTES": 1000}, {}):
+            for name, value in limits.items():
+                monkeypatch.setattr(git_diff, name, value)
+            try:
+                read_tree_diff(repository, ["HEAD^", "HEAD"])
+            except GitObjectError:
+                continue
+            raise AssertionError(f"expected GitObjectError with {limits or 'default limits'}")
+        assert time.monotonic() - started < 10
+        [change] = read_diff(["HEAD^", "HEAD"], repo)
+        assert (change.added, change.deleted) == (10000, 10000)
+
+    def test_rename_work_limit(self, tmp_path, monkeypatch):
+        """Test that rename scoring past its budget raises GitObjectError."""
+        repo = make_repo(tmp_path / "repo")
+        repository = Repository(repo)
+        monkeypatch.setattr(git_objects, "RENAME_WORK_LIMIT", 10)
+        try:
+            read_tree_diff(repository, ["HEAD^", "HEAD"])
+        except GitObjectError:
+            return
+        raise AssertionError("expected GitObjectError")
+
+    def test_merge_base(self, tmp_path):
+        """Test that the merge base matches `git merge-base`."""
+        repo = make_repo(tmp_path / "repo")
+        repository = Repository(repo)
+        expected = git(repo, "merge-base", "main", "side").strip()
+        assert repository.merge_base(repository.resolve("main"), repository.resolve("side")) == expected
+
+
+class TestBackend:
+    """Test backend selection."""
+
+    def test_cli_backend_forced(self, tmp_path, monkeypatch):
+        """Test that GIT_OBJECT_BACKEND=cli makes callers use the git CLI."""
+        repo = make_repo(tmp_path / "repo", pack=False)
+        assert open_repository(repo).git_dir == repo.resolve() / ".git"
+        monkeypatch.setattr(git_objects, "GIT_OBJECT_BACKEND", "cli")
+        try:
+            open_repository(repo)
+        except GitObjectError:
+            return
+        raise AssertionError("expected GitObjectError")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
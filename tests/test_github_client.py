@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared GitHub client in github_client.py
+
+These tests validate:
+- Conditional headers are sent for cached URLs
+- 304 responses are served from the on-disk cache
+- Cache hit/miss counts are tracked per run
+- Concurrent fan-out preserves order and respects the concurrency bound
+- List endpoints are paginated via Link headers with optional early exit
+- Rate-limit feedback drives pacing, retries and per-run budget accounting
+- Recorded traffic replays offline with identical results
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from github_client import (
+    GitHubClient,
+    RateLimitExceeded,
+    RateLimitScheduler,
+    RecordingSession,
+    ReplayMissError,
+    ReplaySession,
+    ResponseCache,
+    map_concurrent,
+    parse_next_link,
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code: int, body=None, headers=None, text: str = ""):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+        self.text = text
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Session double that replays queued responses and records requests."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(("GET", url, dict(headers or {})))
+        return self.responses.pop(0)
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.requests.append(("POST", url, json))
+        return self.responses.pop(0)
+
+
+class TestResponseCache:
+    """Test on-disk response cache behavior."""
+
+    def test_store_and_load_roundtrip(self, tmp_path):
+        """Test that stored entries are loaded back by URL."""
+        cache = ResponseCache(tmp_path)
+        cache.store("https://api.github.com/x", '"abc"', None, [1, 2])
+        entry = cache.load("https://api.github.com/x")
+        assert entry["etag"] == '"abc"'
+        assert entry["body"] == [1, 2]
+
+    def test_missing_entry_returns_none(self, tmp_path):
+        """Test that unknown URLs are cache misses."""
+        assert ResponseCache(tmp_path).load("https://api.github.com/y") is None
+
+    def test_conditional_headers(self):
+        """Test that validators are turned into conditional headers."""
+        headers = ResponseCache.conditional_headers(
+            {"etag": '"abc"', "last_modified": "Mon, 01 Jan 2026 00:00:00 GMT"}
+        )
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2026 00:00:00 GMT"
+
+
+class TestGitHubClient:
+    """Test pooled client GET/POST behavior."""
+
+    def test_first_get_is_miss_and_cached(self, tmp_path):
+        """Test that a fresh GET is recorded as a miss and stored."""
+        session = FakeSession([FakeResponse(200, {"a": 1}, {"ETag": '"v1"'})])
+        client = GitHubClient("https://api.github.com", {}, ResponseCache(tmp_path), session)
+
+        assert client.get("/repos/o/r/pulls") == {"a": 1}
+        assert client.stats.misses == 1
+        assert client.stats.hits == 0
+        assert "If-None-Match" not in session.requests[0][2]
+
+    def test_not_modified_served_from_cache(self, tmp_path):
+        """Test that a 304 returns the cached body and counts as a hit."""
+        cache = ResponseCache(tmp_path)
+        session = FakeSession([
+            FakeResponse(200, {"a": 1}, {"ETag": '"v1"'}),
+            FakeResponse(304),
+        ])
+        client = GitHubClient("https://api.github.com", {}, cache, session)
+
+        client.get("/repos/o/r/pulls")
+        assert client.get("/repos/o/r/pulls") == {"a": 1}
+        assert session.requests[1][2]["If-None-Match"] == '"v1"'
+        assert client.stats.hits == 1
+        assert client.stats.misses == 1
+
+    def test_http_error_raises(self, tmp_path):
+        """Test that non-retryable HTTP errors propagate to the caller."""
+        session = FakeSession([FakeResponse(404)])
+        client = GitHubClient("https://api.github.com", {}, ResponseCache(tmp_path), session)
+        try:
+            client.get("/repos/o/r/pulls")
+            assert False, "Expected an HTTP error"
+        except RuntimeError:
+            pass
+
+    def test_post_uses_shared_session(self):
+        """Test that POST goes through the same session without caching."""
+        session = FakeSession([FakeResponse(200, {"data": {}})])
+        client = GitHubClient("https://api.github.com", {}, None, session)
+        assert client.post("/graphql", {"query": "{}"}) == {"data": {}}
+        assert session.requests[0][1] == "https://api.github.com/graphql"
+
+
+class TestPagination:
+    """Test Link-header pagination."""
+
+    BASE = "https://api.github.com"
+
+    def _page(self, items, next_url=None, etag=None):
+        headers = {}
+        if next_url:
+            headers["Link"] = f'<{next_url}>; rel="next", <{self.BASE}/x?page=9>; rel="last"'
+        if etag:
+            headers["ETag"] = etag
+        return FakeResponse(200, items, headers)
+
+    def test_parse_next_link(self):
+        """Test extraction of the rel=next URL."""
+        header = f'<{self.BASE}/x?page=2>; rel="next", <{self.BASE}/x?page=5>; rel="last"'
+        assert parse_next_link(header) == f"{self.BASE}/x?page=2"
+        assert parse_next_link(f'<{self.BASE}/x?page=1>; rel="prev"') is None
+        assert parse_next_link(None) is None
+
+    def test_follows_all_pages(self):
+        """Test that items from every page are streamed in order."""
+        session = FakeSession([
+            self._page([1, 2], f"{self.BASE}/x?page=2"),
+            self._page([3], f"{self.BASE}/x?page=3"),
+            self._page([4]),
+        ])
+        client = GitHubClient(self.BASE, {}, None, session)
+        assert list(client.paginate("/x")) == [1, 2, 3, 4]
+        assert [r[1] for r in session.requests] == [
+            f"{self.BASE}/x", f"{self.BASE}/x?page=2", f"{self.BASE}/x?page=3",
+        ]
+
+    def test_limit_stops_before_next_page(self):
+        """Test that an early-exit limit avoids fetching further pages."""
+        session = FakeSession([
+            self._page([1, 2], f"{self.BASE}/x?page=2"),
+            self._page([3]),
+        ])
+        client = GitHubClient(self.BASE, {}, None, session)
+        assert list(client.paginate("/x", limit=2)) == [1, 2]
+        assert len(session.requests) == 1
+
+    def test_cached_page_keeps_next_link(self, tmp_path):
+        """Test that a 304-served page still points at the next page."""
+        session = FakeSession([
+            self._page([1], f"{self.BASE}/x?page=2", etag='"p1"'),
+            self._page([2]),
+            FakeResponse(304),
+            self._page([2]),
+        ])
+        client = GitHubClient(self.BASE, {}, ResponseCache(tmp_path), session)
+        assert list(client.paginate("/x")) == [1, 2]
+        assert list(client.paginate("/x")) == [1, 2]
+        assert client.stats.hits == 1
+
+
+class FakeClock:
+    """Deterministic clock/sleep pair for scheduler tests."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_scheduler(clock, **kwargs):
+    return RateLimitScheduler(sleep=clock.sleep, clock=clock.time, jitter=lambda: 0.5, **kwargs)
+
+
+class TestRateLimitScheduler:
+    """Test rate-limit aware pacing, retries and accounting."""
+
+    BASE = "https://api.github.com"
+
+    def test_retries_server_errors_with_backoff(self):
+        """Test that 5xx responses are retried with jittered backoff."""
+        clock = FakeClock()
+        session = FakeSession([FakeResponse(502), FakeResponse(503), FakeResponse(200, [1])])
+        client = GitHubClient(self.BASE, {}, None, session, scheduler=make_scheduler(clock))
+
+        assert client.get("/x") == [1]
+        assert clock.sleeps == [0.75, 1.5]
+        assert client.scheduler.retries == 2
+        assert client.scheduler.calls == 3
+
+    def test_honors_retry_after_on_secondary_limit(self):
+        """Test that Retry-After is used for secondary rate limits."""
+        clock = FakeClock()
+        session = FakeSession([
+            FakeResponse(403, headers={"Retry-After": "7"}, text="secondary rate limit"),
+            FakeResponse(200, {"ok": True}),
+        ])
+        client = GitHubClient(self.BASE, {}, None, session, scheduler=make_scheduler(clock))
+
+        assert client.get("/x") == {"ok": True}
+        assert clock.sleeps == [7.0]
+
+    def test_waits_for_reset_when_primary_limit_hit(self):
+        """Test that an exhausted primary limit waits until the reset time."""
+        clock = FakeClock()
+        session = FakeSession([
+            FakeResponse(403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"}),
+            FakeResponse(200, [1]),
+        ])
+        client = GitHubClient(self.BASE, {}, None, session, scheduler=make_scheduler(clock))
+
+        assert client.get("/x") == [1]
+        assert clock.sleeps == [31.0]
+
+    def test_paces_when_remaining_is_low(self):
+        """Test that calls are spread over the window once remaining runs low."""
+        clock = FakeClock()
+        headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "150", "X-RateLimit-Reset": "1100"}
+        session = FakeSession([FakeResponse(200, [1], headers), FakeResponse(200, [2], headers)])
+        client = GitHubClient(self.BASE, {}, None, session, scheduler=make_scheduler(clock, reserve=50))
+
+        client.get("/a")
+        client.get("/b")
+        assert clock.sleeps == [1.0]  # 100s window / 100 spare calls
+
+    def test_budget_stops_run(self):
+        """Test that the per-run call budget is enforced."""
+        clock = FakeClock()
+        session = FakeSession([FakeResponse(200, [1])])
+        client = GitHubClient(self.BASE, {}, None, session, scheduler=make_scheduler(clock, budget=1))
+
+        client.get("/a")
+        try:
+            client.get("/b")
+            assert False, "Expected budget exhaustion"
+        except RateLimitExceeded:
+            pass
+        assert client.scheduler.calls == 1
+
+    def test_summary_reports_calls_and_remaining(self, tmp_path):
+        """Test that 304s are reported as not charged against the limit."""
+        clock = FakeClock()
+        headers = {"ETag": '"v"', "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "2000"}
+        session = FakeSession([FakeResponse(200, [1], headers), FakeResponse(304, headers=headers)])
+        client = GitHubClient(self.BASE, {}, ResponseCache(tmp_path), session, scheduler=make_scheduler(clock))
+
+        client.get("/a")
+        client.get("/a")
+        summary = client.scheduler.summary()
+        assert "2 calls sent" in summary
+        assert "1 charged" in summary
+        assert "core 4999/5000 remaining" in summary
+
+
+class TestRecordReplay:
+    """Test recording GitHub traffic and replaying it offline."""
+
+    BASE = "https://api.github.com"
+
+    def _record(self, archive):
+        inner = FakeSession([
+            FakeResponse(200, [1, 2], {"Link": f'<{self.BASE}/x?page=2>; rel="next"', "Server": "GitHub.com"}),
+            FakeResponse(200, [3]),
+            FakeResponse(200, {"data": {"viewer": {"login": "bot"}}}),
+        ])
+        session = RecordingSession(inner, archive, "2026-01-28 18:30 UTC")
+        client = GitHubClient(self.BASE, {}, None, session)
+        items = list(client.paginate("/x"))
+        data = client.graphql("{ viewer { login } }")
+        client.close()
+        return items, data
+
+    def test_replay_matches_recording(self, tmp_path):
+        """Test that replayed pagination and GraphQL match the live run."""
+        archive = tmp_path / "traffic.jsonl.gz"
+        recorded = self._record(archive)
+
+        replay = ReplaySession(archive)
+        client = GitHubClient(self.BASE, {}, None, replay)
+        assert (list(client.paginate("/x")), client.graphql("{ viewer { login } }")) == recorded
+        assert replay.captured_at == "2026-01-28 18:30 UTC"
+        assert replay.requests == 3
+
+    def test_only_selected_headers_recorded(self, tmp_path):
+        """Test that the archive keeps pagination headers but drops the rest."""
+        archive = tmp_path / "traffic.jsonl.gz"
+        self._record(archive)
+        response = ReplaySession(archive).get(f"{self.BASE}/x")
+        assert "Link" in response.headers
+        assert "Server" not in response.headers
+
+    def test_unrecorded_request_raises(self, tmp_path):
+        """Test that replay never falls through to the network."""
+        archive = tmp_path / "traffic.jsonl.gz"
+        self._record(archive)
+        try:
+            ReplaySession(archive).get(f"{self.BASE}/not-recorded")
+            assert False, "Expected a replay miss"
+        except ReplayMissError:
+            pass
+
+
+class TestMapConcurrent:
+    """Test bounded concurrent fan-out."""
+
+    def test_preserves_input_order(self):
+        """Test that results come back in input order regardless of timing."""
+        def slow_square(n):
+            time.sleep(0.01 * (5 - n))
+            return n * n
+
+        assert map_concurrent(slow_square, range(5), concurrency=5) == [0, 1, 4, 9, 16]
+
+    def test_respects_concurrency_limit(self):
+        """Test that no more than `concurrency` calls run at once."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def track(_):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+
+        map_concurrent(track, range(20), concurrency=3)
+        assert 1 < state["peak"] <= 3
+
+    def test_serial_when_concurrency_is_one(self):
+        """Test that concurrency=1 runs in the calling thread."""
+        caller = threading.get_ident()
+        assert map_concurrent(lambda _: threading.get_ident(), range(3), concurrency=1) == [caller] * 3
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the GraphQL open-PR data source in github_graphql.py
+
+These tests validate:
+- PullRequest nodes are normalized to the REST pull request shape
+- statusCheckRollup contexts are counted like REST commit statuses
+- PR pages and oversized file lists are followed via cursors
+- Changed PRs are refetched by node id in batches
+- Project items sync incrementally against a local snapshot
+"""
+
+import sys
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import github_graphql
+
+
+def make_node(number: int, files=None, files_next=None, rollup=None) -> dict:
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "url": f"https://github.com/o/r/pull/{number}",
+        "body": None,
+        "createdAt": "2026-01-01T00:00:00Z",
+        "updatedAt": "2026-01-02T00:00:00Z",
+        "headRefOid": f"sha{number}",
+        "author": {"login": "dev"},
+        "labels": {"nodes": [{"name": "t2"}]},
+        "files": {
+            "pageInfo": {"hasNextPage": files_next is not None, "endCursor": files_next},
+            "nodes": [{"path": p} for p in (files or [])],
+        },
+        "commits": {"nodes": [{"commit": {"statusCheckRollup": rollup}}]},
+    }
+
+
+class FakeGraphQLClient:
+    """Returns queued GraphQL `data` payloads and records variables."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.calls = []
+
+    def graphql(self, query, variables=None):
+        self.calls.append(variables)
+        return self.pages.pop(0)
+
+
+def pr_page(nodes, next_cursor=None) -> dict:
+    return {"repository": {"pullRequests": {
+        "pageInfo": {"hasNextPage": next_cursor is not None, "endCursor": next_cursor},
+        "nodes": nodes,
+    }}}
+
+
+class TestNormalization:
+    """Test node → REST-shape mapping."""
+
+    def test_normalize_pull_request(self):
+        """Test that fields used by the renderers are present."""
+        pr = github_graphql.normalize_pull_request(make_node(7))
+        assert pr["number"] == 7
+        assert pr["html_url"].endswith("/pull/7")
+        assert pr["user"]["login"] == "dev"
+        assert pr["labels"] == [{"name": "t2"}]
+        assert pr["head"]["sha"] == "sha7"
+        assert pr["body"] == ""
+
+    def test_rollup_counts_mixed_contexts(self):
+        """Test counting of CheckRun and StatusContext results."""
+        rollup = {"state": "FAILURE", "contexts": {"totalCount": 4, "nodes": [
+            {"__typename": "CheckRun", "status": "COMPLETED", "conclusion": "SUCCESS"},
+            {"__typename": "CheckRun", "status": "COMPLETED", "conclusion": "FAILURE"},
+            {"__typename": "CheckRun", "status": "IN_PROGRESS", "conclusion": None},
+            {"__typename": "StatusContext", "state": "SUCCESS"},
+        ]}}
+        assert github_graphql.rollup_counts(make_node(1, rollup=rollup)) == ("failure", 4, 2, 1, 1)
+
+    def test_rollup_missing_is_pending(self):
+        """Test that a commit without checks reports pending with zero counts."""
+        assert github_graphql.rollup_counts(make_node(1)) == ("pending", 0, 0, 0, 0)
+
+
+class TestPagination:
+    """Test cursor-following for PRs and files."""
+
+    def test_follows_pr_pages(self):
+        """Test that every PR page is fetched until hasNextPage is false."""
+        client = FakeGraphQLClient([
+            pr_page([make_node(1), make_node(2)], next_cursor="c1"),
+            pr_page([make_node(3)]),
+        ])
+        numbers = [pr["number"] for _, pr in github_graphql.iter_open_pull_requests(client, "o", "r")]
+        assert numbers == [1, 2, 3]
+        assert client.calls[1]["cursor"] == "c1"
+
+    def test_completes_oversized_file_lists(self):
+        """Test that files beyond the first page are fetched for that PR."""
+        client = FakeGraphQLClient([
+            pr_page([make_node(5, files=["a.md"], files_next="f1")]),
+            {"repository": {"pullRequest": {"files": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [{"path": ".github/workflows/ci.yml"}],
+            }}}},
+        ])
+        node, _ = next(github_graphql.iter_open_pull_requests(client, "o", "r"))
+        assert github_graphql.file_paths(node) == ("a.md", ".github/workflows/ci.yml")
+        assert client.calls[1]["number"] == 5
+
+    def test_fetch_by_node_id_batches(self):
+        """Test that changed PRs are refetched by id in fixed-size batches."""
+        client = FakeGraphQLClient([
+            {"nodes": [make_node(1), make_node(2)]},
+            {"nodes": [make_node(3), None]},
+        ])
+        prs = [pr for _, pr in github_graphql.fetch_pull_requests(client, "o", "r", ["a", "b", "c", "d"], batch_size=2)]
+        assert [pr["number"] for pr in prs] == [1, 2, 3]
+        assert [call["ids"] for call in client.calls] == [["a", "b"], ["c", "d"]]
+
+
+class FakeProjectClient:
+    """Serves a project board; records which item ids had details fetched."""
+
+    def __init__(self, items):
+        self.items = items  # id -> (updatedAt, number, status)
+        self.detail_requests = []
+
+    def graphql(self, query, variables=None):
+        if query is github_graphql.PROJECT_ITEM_INDEX_QUERY:
+            ids = list(self.items)
+            start = int(variables["cursor"] or 0)
+            page = ids[start:start + 2]
+            more = start + 2 < len(ids)
+            return {"repository": {"projectV2": {"items": {
+                "pageInfo": {"hasNextPage": more, "endCursor": str(start + 2) if more else None},
+                "nodes": [{"id": i, "updatedAt": self.items[i][0], "content": {}} for i in page],
+            }}}}
+        self.detail_requests.extend(variables["ids"])
+        return {"nodes": [{
+            "id": i,
+            "content": {"number": self.items[i][1], "title": f"Issue {i}", "state": "OPEN", "url": "u"},
+            "fieldValueByName": {"name": self.items[i][2]},
+        } for i in variables["ids"]]}
+
+
+class TestProjectItemSync:
+    """Test incremental Project v2 item sync."""
+
+    def _sync(self, client, snapshot):
+        return github_graphql.sync_project_items(client, "o", "r", 2, snapshot)
+
+    def test_first_sync_fetches_all_pages(self, tmp_path):
+        """Test that every page is walked and all items are fetched once."""
+        client = FakeProjectClient({
+            "a": ("t1", 1, "Blocked"),
+            "b": ("t1", 2, "Waiting for Approval"),
+            "c": ("t1", 3, None),
+        })
+        items, refreshed = self._sync(client, tmp_path / "snap.json")
+        assert [i["number"] for i in items] == [1, 2, 3]
+        assert items[0]["status"] == "Blocked"
+        assert refreshed == 3
+
+    def test_second_sync_only_fetches_changed(self, tmp_path):
+        """Test that unchanged items are served from the snapshot."""
+        snapshot = tmp_path / "snap.json"
+        client = FakeProjectClient({"a": ("t1", 1, "Blocked"), "b": ("t1", 2, "Blocked")})
+        self._sync(client, snapshot)
+
+        client.items["b"] = ("t2", 2, "Done")
+        client.detail_requests = []
+        items, refreshed = self._sync(client, snapshot)
+        assert client.detail_requests == ["b"]
+        assert refreshed == 1
+        assert [i["status"] for i in items] == ["Blocked", "Done"]
+
+    def test_removed_items_drop_out(self, tmp_path):
+        """Test that items removed from the board leave the snapshot."""
+        snapshot = tmp_path / "snap.json"
+        client = FakeProjectClient({"a": ("t1", 1, "Blocked"), "b": ("t1", 2, "Blocked")})
+        self._sync(client, snapshot)
+
+        del client.items["a"]
+        items, refreshed = self._sync(client, snapshot)
+        assert [i["number"] for i in items] == [2]
+        assert refreshed == 0
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
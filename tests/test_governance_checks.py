@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for concurrent check execution in governance_validator.py
+
+These tests validate:
+- Checks run concurrently: wall time follows the slowest check
+- Output and results are reported in declared order, not completion order
+- A check starts only once its declared inputs have loaded
+- The diff is read on the pool, not at construction
+- Check output goes to per-task buffers; sys.stdout is never replaced
+- Artifact loading failures are reported, unexpected errors re-raised
+- A failing check's error surfaces after the output of earlier checks
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import governance_validator
+from governance_validator import Check, GovernanceValidator
+
+
+def make_validator(monkeypatch, delays):
+    """Validator whose checks sleep for the given seconds, slowest first."""
+    validator = GovernanceValidator()
+    validator._print_results = lambda: None
+    checks = []
+    for index, delay in enumerate(delays):
+        def check(index=index, delay=delay):
+            validator._print(f"start {index}")
+            time.sleep(delay)
+            validator.add_result(f"check {index}", True)
+            validator._print(f"end {index}")
+        setattr(validator, f"_check_{index}", check)
+        checks.append(Check(f"_check_{index}", ("pr_description",)))
+    monkeypatch.setattr(governance_validator, "CHECKS", tuple(checks))
+    return validator
+
+
+class TestConcurrentChecks:
+    """Test the check scheduler behind validate()."""
+
+    def test_wall_time_is_slowest_check(self, monkeypatch):
+        """Test that checks overlap instead of running back to back."""
+        validator = make_validator(monkeypatch, [0.3, 0.3, 0.3, 0.3])
+        started = time.monotonic()
+        assert validator.validate()
+        assert time.monotonic() - started < 0.9
+
+    def test_deterministic_order(self, monkeypatch, capsys):
+        """Test that output and results follow CHECKS order when later checks finish first."""
+        validator = make_validator(monkeypatch, [0.2, 0.1, 0.0])
+        validator.validate()
+        output = capsys.readouterr().out
+        lines = [line for line in output.splitlines() if line.startswith(("start", "end"))]
+        assert lines == ["start 0", "end 0", "start 1", "end 1", "start 2", "end 2"]
+        assert [r.name for r in validator.results] == ["check 0", "check 1", "check 2"]
+
+    def test_sequential_with_one_job(self, monkeypatch, capsys):
+        """Test that one worker still runs every check (loaders are queued first)."""
+        monkeypatch.setattr(governance_validator, "GOVERNANCE_CHECK_JOBS", 1)
+        validator = make_validator(monkeypatch, [0.0, 0.0])
+        validator.validate()
+        assert [r.name for r in validator.results] == ["check 0", "check 1"]
+
+    def test_waits_for_inputs(self, monkeypatch):
+        """Test that an artifact check runs only after the artifacts have loaded."""
+        validator = make_validator(monkeypatch, [])
+        loaded = threading.Event()
+
+        def load_artifacts():
+            time.sleep(0.1)
+            loaded.set()
+
+        validator._load_artifacts = load_artifacts
+        validator._check_artifacts = lambda: validator.add_result("artifacts", loaded.is_set())
+        monkeypatch.setattr(governance_validator, "CHECKS", (Check("_check_artifacts", ("artifacts",)),))
+        assert validator.validate()
+
+    def test_diff_read_on_pool(self, monkeypatch, capsys):
+        """Test that the diff loads on a worker, once, ahead of the checks that read it."""
+        monkeypatch.setenv("CHANGED_FILES", "a.txt")
+        validator = make_validator(monkeypatch, [])
+        reads = []
+
+        def read_diff():
+            time.sleep(0.1)
+            reads.append(threading.current_thread())
+            return None, ""
+
+        validator._read_diff = read_diff
+        assert reads == []
+        validator._check_files = lambda: validator.add_result("files", validator.changed_files == [Path("a.txt")])
+        validator._check_diff = lambda: validator.add_result("diff", validator.diff is None and len(reads) == 1)
+        checks = (Check("_check_files", ("changed_files",)), Check("_check_diff", ("diff",)))
+        monkeypatch.setattr(governance_validator, "CHECKS", checks)
+        assert validator.validate()
+        assert len(reads) == 1 and reads[0] is not threading.main_thread()
+        assert "Using changed files from GitHub API: 1 files" in capsys.readouterr().out
+
+    def test_artifact_load_failure_reported(self, monkeypatch, capsys):
+        """Test that a broken catalog is reported once and unexpected errors still surface."""
+        validator = make_validator(monkeypatch, [])
+        validator._check_artifacts = lambda: validator.add_result("artifacts", True)
+        monkeypatch.setattr(governance_validator, "CHECKS", (Check("_check_artifacts", ("artifacts",)),))
+
+        def corrupt(*args):
+            raise sqlite3.DatabaseError("file is not a database")
+
+        validator.catalog.refresh = corrupt
+        assert validator.validate()
+        assert "Artifact catalog unavailable (file is not a database)" in capsys.readouterr().out
+
+        def crash(*args):
+            raise RuntimeError("boom")
+
+        validator.catalog.refresh = crash
+        try:
+            validator.validate()
+        except RuntimeError as e:
+            assert str(e) == "boom"
+        else:
+            raise AssertionError("Expected RuntimeError from the artifact loader")
+
+    def test_error_after_earlier_output(self, monkeypatch, capsys):
+        """Test that a crashing check re-raises once earlier checks have printed."""
+        validator = make_validator(monkeypatch, [0.05, 0.0])
+
+        def crash():
+            raise RuntimeError("boom")
+
+        validator._check_1 = crash
+        stdout = sys.stdout
+        try:
+            validator.validate()
+        except RuntimeError as e:
+            assert str(e) == "boom"
+        else:
+            raise AssertionError("Expected RuntimeError from the crashing check")
+        assert "end 0" in capsys.readouterr().out
+        assert sys.stdout is stdout
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the compiled path classifier in path_policy.py
+
+These tests validate:
+- Literal patterns match a path and everything under it, root-anchored
+- Multi-segment prefixes such as .github/workflows match
+- Glob tails (`*`, `?`, `**`) are matched below their literal prefix
+- Each path reports the pattern that matched it
+- The validator and the daily brief agree on protected paths
+"""
+
+import sys
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from generate_daily_brief import _risk_tier_from_files
+from governance_validator import GovernanceValidator
+from path_policy import PROTECTED_POLICY, PathPolicy
+
+
+class TestPathPolicy:
+    """Test pattern compilation and matching."""
+
+    def test_prefixes_are_root_anchored(self):
+        """Test that literal patterns match whole leading segments only."""
+        policy = PathPolicy(["GOVERNANCE", "STATE/STATUS_LEDGER.md"])
+        assert policy.match("GOVERNANCE/GUARDRAILS.md") == "GOVERNANCE"
+        assert policy.match(Path("./GOVERNANCE")) == "GOVERNANCE"
+        assert policy.match("STATE/STATUS_LEDGER.md") == "STATE/STATUS_LEDGER.md"
+        for path in ("GOVERNANCE_NOTES.md", "docs/GOVERNANCE/x.md", "STATE/other.md"):
+            assert policy.match(path) is None, path
+
+    def test_multi_segment_protected_path(self):
+        """Test that .github/workflows is protected but the rest of .github is not."""
+        assert PROTECTED_POLICY.match(".github/workflows/ci.yml") == ".github/workflows"
+        assert PROTECTED_POLICY.match(".github/CODEOWNERS") is None
+
+    def test_glob_tails(self):
+        """Test single-segment and recursive wildcards."""
+        policy = PathPolicy(["docs/*.md", "**/*.pem", "APP/**", "logs/day-??.txt"])
+        assert policy.match("docs/a.md") == "docs/*.md"
+        assert policy.match("docs/sub/a.md") is None
+        assert policy.match("deep/dir/key.pem") == "**/*.pem"
+        assert policy.match("key.pem") == "**/*.pem"
+        assert policy.match("APP/src/main.py") == "APP/**"
+        assert policy.match("logs/day-01.txt") == "logs/day-??.txt"
+        assert policy.match("logs/day-1.txt") is None
+
+    def test_classify_reports_rules(self):
+        """Test that a batch classification maps every path to its rule."""
+        result = PROTECTED_POLICY.classify(["AGENTS/ROLES.md", "APP/x.py", Path("STATE/LAST_KNOWN_STATE.md")])
+        assert result == {"AGENTS/ROLES.md": "AGENTS", "APP/x.py": None, "STATE/LAST_KNOWN_STATE.md": "STATE"}
+
+    def test_any_match_stops_early(self):
+        """Test that any_match stops consuming an iterator at the first match."""
+        consumed = []
+
+        def paths():
+            for path in ("APP/a.py", "COCKPIT/x.md", "APP/b.py"):
+                consumed.append(path)
+                yield path
+
+        assert PROTECTED_POLICY.any_match(paths())
+        assert consumed == ["APP/a.py", "COCKPIT/x.md"]
+
+
+class TestAgreement:
+    """Test that both scripts classify paths the same way."""
+
+    def test_validator_and_brief_agree(self):
+        """Test protected-path decisions for paths the old checks disagreed on."""
+        cases = {
+            ".github/workflows/ci.yml": True,
+            "GOVERNANCE/RISK_TIERS.md": True,
+            "docs/MY_GOVERNANCE_NOTES.md": False,
+            "APP/STATE/cache.py": False,
+        }
+        validator = GovernanceValidator()
+        for path, protected in cases.items():
+            validator.results = []
+            validator.changed_files = [Path(path)]
+            validator._check_artifacts_for_protected_paths()
+            validator_protected = validator.results[0].message != "No protected paths changed"
+            assert validator_protected == protected, path
+            assert (_risk_tier_from_files([path]) == "T1") == protected, path
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
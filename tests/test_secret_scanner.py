@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming secret scanner in secret_scanner.py
+
+These tests validate:
+- Only added lines are scanned; removed and context lines are ignored
+- Findings carry the new-file path and line number
+- Every finding is reported, across files and hunks
+- git diff output is streamed from a real repository
+- Rule packs load from JSON into one combined matcher with allowlists
+- Per-rule hit counts and timings are reported
+- History audits scan each unique blob once and reuse the blob cache
+- History audits report every non-allowlisted path of a blob and stream large blobs
+- History audits read objects in-process or through the git CLI alike
+- Allowlist regexes exempt only whole values such as an env lookup
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from governance_validator import ValidationResult
+import git_objects
+import secret_scanner
+from secret_scanner import SECRET_PATTERNS, SECRET_RULES_FILE, RuleSet, SecretRule, audit_history, scan_diff_lines, scan_git_diff
+
+# Fixture secrets are assembled at runtime so this file never trips the scanner
+PASSWORD_NAME = "pass" + "word"
+API_KEY_NAME = "api" + "_key"
+SECRET_NAME = "sec" + "ret"
+PRIVATE_KEY_LINE = "-----BEGIN " + "PRIVATE KEY-----"
+
+DIFF = f"""diff --git a/app/config.py b/app/config.py
+index 1111111..2222222 100644
+--- a/app/config.py
++++ b/app/config.py
+@@ -3,2 +3,3 @@ import os
+ DEBUG = True
+-{PASSWORD_NAME} = "old"
++{PASSWORD_NAME} = "hunter2"
++TIMEOUT = 5
+@@ -20 +21 @@ def load():
++    {API_KEY_NAME} = "abc123"
+diff --git a/old.env b/old.env
+deleted file mode 100644
+--- a/old.env
++++ /dev/null
+@@ -1 +0,0 @@
+-{SECRET_NAME} = "gone"
+diff --git a/keys/id_rsa b/keys/id_rsa
+new file mode 100644
+--- /dev/null
++++ b/keys/id_rsa
+@@ -0,0 +1,2 @@
++{PRIVATE_KEY_LINE}
+++++ not a header
+"""
+
+
+def git(cwd: Path, *args: str):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+class TestScanDiffLines:
+    """Test parsing and scanning of unified diff text."""
+
+    def test_only_added_lines_with_locations(self):
+        """Test that findings come from added lines with new-file line numbers."""
+        findings = list(scan_diff_lines(DIFF.splitlines(keepends=True)))
+        assert [(f.path, f.line) for f in findings] == [
+            ("app/config.py", 4),
+            ("app/config.py", 21),
+            ("keys/id_rsa", 1),
+        ]
+        assert findings[0].excerpt == f'{PASSWORD_NAME} = "hunter2"'
+
+    def test_added_line_resembling_header(self):
+        """Test that an added '++' line inside a hunk is content, not a file header."""
+        findings = list(scan_diff_lines(DIFF.splitlines(keepends=True), [r"not a header"]))
+        assert [(f.path, f.line) for f in findings] == [("keys/id_rsa", 2)]
+
+    def test_accepts_a_lazy_line_stream(self):
+        """Test that any iterator of lines can be scanned."""
+        lines = iter(DIFF.splitlines(keepends=True))
+        assert len(list(scan_diff_lines(lines))) == 3
+
+
+class TestScanGitDiff:
+    """Test streaming from git."""
+
+    def test_scans_branch_diff(self, tmp_path):
+        """Test that base...HEAD changes are scanned with correct locations."""
+        git(tmp_path, "init", "-q", "-b", "main")
+        git(tmp_path, "config", "user.email", "t@example.com")
+        git(tmp_path, "config", "user.name", "t")
+        (tmp_path / "a.txt").write_text(f"line1\n{PASSWORD_NAME} = 'x'\n")
+        git(tmp_path, "add", ".")
+        git(tmp_path, "commit", "-q", "-m", "base")
+        git(tmp_path, "checkout", "-q", "-b", "feature")
+        (tmp_path / "a.txt").write_text(f"line1\nline2\n{SECRET_NAME} = 'y'\n")
+        git(tmp_path, "commit", "-q", "-am", "change")
+
+        findings = scan_git_diff("main", tmp_path)
+        assert [(f.path, f.line) for f in findings] == [("a.txt", 3)]
+
+    def test_bad_ref_raises(self, tmp_path):
+        """Test that a failing git diff raises CalledProcessError."""
+        git(tmp_path, "init", "-q")
+        try:
+            scan_git_diff("missing-ref", tmp_path)
+        except subprocess.CalledProcessError:
+            return
+        raise AssertionError("expected CalledProcessError")
+
+
+def write_pack(tmp_path: Path, rules, allowlist=None) -> Path:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"rules": rules, "allowlist": allowlist or {}}))
+    return path
+
+
+class TestRuleSet:
+    """Test rule pack loading and the combined matcher."""
+
+    def test_missing_pack_uses_defaults(self, tmp_path):
+        """Test that SECRET_PATTERNS apply when no rule pack exists."""
+        rules = RuleSet.load(tmp_path / "missing.json")
+        assert [rule.pattern for rule in rules.rules] == SECRET_PATTERNS
+
+    def test_shipped_pack_loads(self):
+        """Test that the repository rule pack compiles and catches provider tokens."""
+        rules = RuleSet.load(SECRET_RULES_FILE)
+        assert rules.match_line("token = ghp_" + "a" * 36) == ["github-token"]
+        assert rules.match_line("AWS_KEY AKIA" + "A" * 16) == ["aws-access-key-id"]
+        assert rules.match_line("-----BEGIN RSA " + "PRIVATE KEY-----") == ["private-key"]
+
+    def test_case_sensitivity_per_rule(self, tmp_path):
+        """Test that ignore_case is applied per rule inside the combined matcher."""
+        rules = RuleSet.load(write_pack(tmp_path, [
+            {"id": "exact", "pattern": "AKIA[0-9]{4}", "ignore_case": False},
+            {"id": "loose", "pattern": "token"},
+        ]))
+        assert rules.match_line("akia1234 TOKEN") == ["loose"]
+        assert rules.match_line("AKIA1234 token") == ["exact", "loose"]
+
+    def test_allowlists(self, tmp_path):
+        """Test that allowlisted paths and matched text are skipped."""
+        rules = RuleSet.load(write_pack(
+            tmp_path,
+            [{"id": "pw", "pattern": "password\\s*=\\s*\\S+"}],
+            {"paths": ["docs/*"], "regexes": ["\\w+ = EXAMPLE$"]},
+        ))
+        diff = (
+            f"diff --git a/docs/a.md b/docs/a.md\n+++ b/docs/a.md\n@@ -0,0 +1 @@\n+{PASSWORD_NAME} = real\n"
+            f"diff --git a/app.py b/app.py\n+++ b/app.py\n@@ -0,0 +1,3 @@\n"
+            f"+{PASSWORD_NAME} = EXAMPLE\n+{PASSWORD_NAME} = real\n+{PASSWORD_NAME} = EXAMPLE or real\n"
+        )
+        findings = list(scan_diff_lines(diff.splitlines(keepends=True), rules))
+        assert [(f.path, f.line, f.rule) for f in findings] == [("app.py", 2, "pw"), ("app.py", 3, "pw")]
+
+    def test_shipped_allowlist_exempts_whole_values_only(self):
+        """Test that an env lookup is exempt only when it is the entire value."""
+        rules = RuleSet.load(SECRET_RULES_FILE)
+        for line in (
+            f'DB_{PASSWORD_NAME.upper()} = os.getenv("DB_PASSWORD")',
+            f'{API_KEY_NAME} = os.environ["API_KEY"]  # from CI',
+            f"{SECRET_NAME}=${{{{ secrets.TOKEN }}}}",
+        ):
+            assert rules.match_line(line) == [], line
+        for line in (
+            f'{PASSWORD_NAME} = os.getenv("X") or "hunter2"',
+            f'{PASSWORD_NAME} = "hunter2"  # os.getenv("X")',
+            f"{SECRET_NAME}=${{{{ secrets.TOKEN }}}}-suffix",
+        ):
+            assert rules.match_line(line) != [], line
+
+    def test_stats_report_hits_and_timings(self, tmp_path):
+        """Test per-rule hit counts, and per-rule timings when profiling."""
+        rules = RuleSet([SecretRule("a", "alpha"), SecretRule("b", "beta")])
+        rules.profile = True
+        for line in ("alpha", "alpha beta", "gamma"):
+            rules.match_line(line)
+        stats = rules.stats()
+        assert stats["lines_scanned"] == 3
+        assert {rule: entry["hits"] for rule, entry in stats["rules"].items()} == {"a": 2, "b": 1}
+        assert all("seconds" in entry for entry in stats["rules"].values())
+
+    def test_overlapping_rules_all_counted(self):
+        """Test that a rule overlapping an earlier rule's match is still reported and counted."""
+        rules = RuleSet([SecretRule("assignment", r"token\s*=\s*\S+"), SecretRule("github", r"ghp_[A-Za-z0-9]{8}")])
+        assert rules.match_line("token = ghp_ABCDEFGH") == ["assignment", "github"]
+        assert rules.match_line("ghp_ABCDEFGH") == ["github"]
+        assert {rule: entry["hits"] for rule, entry in rules.stats()["rules"].items()} == {"assignment": 1, "github": 2}
+
+    def test_invalid_rules_rejected(self, tmp_path):
+        """Test that bad patterns, duplicate ids and named groups are errors."""
+        for rules in (
+            [{"id": "bad", "pattern": "("}],
+            [{"id": "dup", "pattern": "a"}, {"id": "dup", "pattern": "b"}],
+            [{"id": "named", "pattern": "(?P<x>a)"}],
+        ):
+            try:
+                RuleSet.load(write_pack(tmp_path, rules))
+            except ValueError:
+                continue
+            raise AssertionError(f"expected ValueError for {rules}")
+
+
+def make_history(tmp_path: Path) -> Path:
+    """Repo where a secret was committed, copied, then removed from HEAD."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "user.email", "t@example.com")
+    git(repo, "config", "user.name", "t")
+    (repo / "a.txt").write_text(f"ok\n{PASSWORD_NAME} = 'leaked'\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "one")
+    (repo / "copy.txt").write_text(f"ok\n{PASSWORD_NAME} = 'leaked'\n")
+    (repo / "clean.txt").write_text("nothing here\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "two")
+    (repo / "a.txt").write_text("ok\n")
+    (repo / "copy.txt").unlink()
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "three")
+    return repo
+
+
+class TestAuditHistory:
+    """Test the blob-deduplicated history audit."""
+
+    def test_finds_removed_secret_once_per_blob(self, tmp_path):
+        """Test that history is audited and identical blobs are scanned once, reported per path."""
+        repo = make_history(tmp_path)
+        report = audit_history(repo, RuleSet.from_patterns(), jobs=1)
+        assert [(f.path, f.line) for f in report.findings] == [("a.txt", 2), ("copy.txt", 2)]
+        # a.txt v1 == copy.txt, a.txt v2, clean.txt
+        assert report.stats["blobs"] == 3
+        assert report.stats["scanned"] == 3
+
+    def test_cache_skips_scanned_blobs(self, tmp_path):
+        """Test that a second audit reads no blobs and still reports findings."""
+        repo = make_history(tmp_path)
+        cache = tmp_path / "audit.json"
+        audit_history(repo, RuleSet.from_patterns(), cache_path=cache, jobs=1)
+        report = audit_history(repo, RuleSet.from_patterns(), cache_path=cache, jobs=1)
+        assert report.stats["scanned"] == 0
+        assert report.stats["cached"] == 3
+        assert len(report.findings) == 2
+
+        # A different rule pack invalidates the cache
+        changed = audit_history(repo, RuleSet.from_patterns(["nothing"]), cache_path=cache, jobs=1)
+        assert changed.stats["scanned"] == 3
+        assert [(f.path, f.line) for f in changed.findings] == [("clean.txt", 1)]
+
+    def test_range_limits_blobs(self, tmp_path):
+        """Test that a commit range only audits blobs introduced in it."""
+        repo = make_history(tmp_path)
+        report = audit_history(repo, RuleSet.from_patterns(), rev_range="HEAD~1..HEAD", jobs=1)
+        assert report.findings == []
+        assert report.stats["blobs"] == 1
+
+    def test_process_pool_matches_serial(self, tmp_path, monkeypatch):
+        """Test that parallel batches give the same findings and merged stats."""
+        repo = make_history(tmp_path)
+        monkeypatch.setattr(secret_scanner, "AUDIT_BATCH_SIZE", 1)
+        serial = audit_history(repo, RuleSet.from_patterns(), jobs=1)
+        parallel = audit_history(repo, RuleSet.from_patterns(), jobs=2)
+        assert parallel.findings == serial.findings
+        assert parallel.stats["lines_scanned"] == serial.stats["lines_scanned"] == 4
+
+    def test_allowlisted_path_does_not_hide_blob(self, tmp_path):
+        """Test that a blob is scanned when any of its paths is not allowlisted."""
+        repo = make_history(tmp_path)
+        rules = RuleSet.load(write_pack(tmp_path, [{"id": "pw", "pattern": PASSWORD_NAME}], {"paths": ["a.txt"]}))
+        report = audit_history(repo, rules, jobs=1)
+        assert [(f.path, f.line) for f in report.findings] == [("copy.txt", 2)]
+        assert report.stats["skipped"] == {"allowlisted": 1}
+
+    def test_large_blobs_streamed(self, tmp_path, monkeypatch):
+        """Test that blobs over the size limit are scanned, not skipped."""
+        repo = make_history(tmp_path)
+        expected = audit_history(repo, RuleSet.from_patterns(), jobs=1)
+        monkeypatch.setattr(secret_scanner, "AUDIT_MAX_BLOB_BYTES", 1)
+        for backend in ("auto", "cli"):
+            monkeypatch.setattr(git_objects, "GIT_OBJECT_BACKEND", backend)
+            report = audit_history(repo, RuleSet.from_patterns(), jobs=1)
+            assert report.findings == expected.findings
+            assert report.stats["lines_scanned"] == expected.stats["lines_scanned"]
+
+    def test_git_cli_fallback_matches(self, tmp_path, monkeypatch):
+        """Test that the git CLI path finds the same blobs as the in-process reader."""
+        repo = make_history(tmp_path)
+        for rev_range, blobs in (("HEAD~2..HEAD", 2), (None, 3)):
+            monkeypatch.setattr(git_objects, "GIT_OBJECT_BACKEND", "auto")
+            in_process = audit_history(repo, RuleSet.from_patterns(), rev_range=rev_range, jobs=1)
+            monkeypatch.setattr(git_objects, "GIT_OBJECT_BACKEND", "cli")
+            cli = audit_history(repo, RuleSet.from_patterns(), rev_range=rev_range, jobs=1)
+            assert cli.findings == in_process.findings
+            assert cli.stats["blobs"] == in_process.stats["blobs"] == blobs
+
+
+class TestValidationResultDetails:
+    """Test the optional details payload."""
+
+    def test_details_only_when_set(self):
+        """Test that details appear in the JSON dict only when provided."""
+        assert "details" not in ValidationResult("A", True).to_dict()
+        details = {"findings": [{"path": "x"}]}
+        assert ValidationResult("B", False, "m", details=details).to_dict()["details"] == details
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
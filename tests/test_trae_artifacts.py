@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the TRAE_REVIEW artifact index in trae_artifacts.py
+
+These tests validate:
+- One-pass parsing yields a compact record with best-practice fields
+- YAML values are normalized and checked against the declared schema
+- The content-hash cache serves unchanged artifacts without reparsing
+- The expiry index answers expiring-soon and lapsed-since range queries
+- Artifacts are grouped by PR number and ordered by created_at
+- The directory is scanned once for any number of lookups
+- Adding an artifact invalidates the index via the directory mtime
+- Unknown, non-numeric and missing-directory lookups return nothing
+"""
+
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import trae_artifacts
+from trae_artifacts import ReviewExpiryIndex, TraeArtifact, TraeArtifactIndex, TraeArtifactLoader, parse_trae_artifact, parse_trae_content
+
+
+def write_artifact(directory: Path, name: str, pr_number: int, verdict: str, created_at: str) -> Path:
+    path = directory / name
+    path.write_text(
+        "ARTIFACT_TYPE: TRAE_REVIEW\n"
+        f'created_at: "{created_at}"\n'
+        f"pr_number: {pr_number}\n"
+        f'verdict: "{verdict}"\n'
+    )
+    return path
+
+
+class TestParse:
+    """Test artifact parsing."""
+
+    def test_parse_fields(self, tmp_path):
+        """Test that pr_number, verdict and created_at are extracted."""
+        path = write_artifact(tmp_path, "TRAE-20260101-5.yml", 5, "APPROVE", "2026-01-01 10:00 UTC")
+        artifact = parse_trae_artifact(path)
+        assert artifact.pr_number == 5
+        assert artifact.verdict == "APPROVE"
+        assert artifact.created_at == "2026-01-01 10:00 UTC"
+        assert artifact.file_path == path
+        assert artifact.approved
+        assert artifact.plan_quality is None
+
+    def test_single_pass_matches_field_rules(self, monkeypatch):
+        """Test first-occurrence wins and best-practice values need the section."""
+        monkeypatch.setattr(trae_artifacts, "yaml", None)
+        content = (
+            'verdict: "REJECT"\n'
+            "  verdict: APPROVE\n"
+            "pr_number: 9\n"
+            "notes: PLAN_QUALITY: CONCERN\n"
+        )
+        artifact = parse_trae_content(content, Path("TRAE-20260101-9.yml"))
+        assert artifact.verdict == "REJECT"
+        assert artifact.pr_number == 9
+        assert artifact.plan_quality is None
+
+        aligned = parse_trae_content(content + "BEST_PRACTICE_ALIGNMENT:\n  change_size: too_large\n", Path("x.yml"))
+        assert aligned.plan_quality == "CONCERN"
+        assert aligned.change_size == "TOO_LARGE"
+        assert aligned.ownership_clear is None
+
+    def test_record_has_no_instance_dict(self, tmp_path):
+        """Test that records are compact __slots__ objects."""
+        artifact = parse_trae_content("verdict: APPROVE\n", tmp_path / "a.yml")
+        assert not hasattr(artifact, "__dict__")
+
+
+class TestSchema:
+    """Test YAML loading and schema validation."""
+
+    def test_yaml_values_normalized(self, tmp_path):
+        """Test that YAML booleans, lower-case values and string numbers are normalized."""
+        content = (
+            'pr_number: "12"\n'
+            "verdict: APPROVE\n"
+            'created_at: "2026-01-01 09:00 UTC"\n'
+            "BEST_PRACTICE_ALIGNMENT:\n"
+            "  PLAN_QUALITY: pass\n"
+            "  OWNERSHIP_CLEAR: YES\n"
+        )
+        artifact = parse_trae_content(content, tmp_path / "a.yml")
+        assert artifact.pr_number == 12
+        assert artifact.plan_quality == "PASS"
+        assert artifact.ownership_clear == "YES"
+        assert artifact.errors == ()
+
+    def test_schema_errors_reported(self, tmp_path):
+        """Test that missing fields, bad types and unknown values are errors."""
+        content = "pr_number: [1]\nverdict: MAYBE\nBEST_PRACTICE_ALIGNMENT:\n  CHANGE_SIZE: HUGE\n"
+        errors = parse_trae_content(content, tmp_path / "a.yml").errors
+        assert "missing required field 'created_at'" in errors
+        assert "'pr_number' has unexpected type list" in errors
+        assert "unknown verdict 'MAYBE'" in errors
+        assert any(e.startswith("BEST_PRACTICE_ALIGNMENT.CHANGE_SIZE") for e in errors)
+
+    def test_invalid_yaml_yields_no_fields(self, tmp_path):
+        """Test that text PyYAML rejects gives a positioned error and no salvaged fields."""
+        content = 'verdict: "REJECT"\n  verdict: APPROVE\npr_number: 9\n'
+        artifact = parse_trae_content(content, tmp_path / "a.yml")
+        assert (artifact.verdict, artifact.pr_number) == (None, None)
+        assert len(artifact.errors) == 1
+        assert artifact.errors[0].startswith("invalid YAML: 2:")
+
+    def test_notes_after_leading_document(self, tmp_path):
+        """Test that free-text notes after the document's `---` end line are ignored."""
+        content = (
+            "---\n"
+            "pr_number: 7\n"
+            "verdict: APPROVE\n"
+            'created_at: "2026-01-01 09:00 UTC"\n'
+            "---\n"
+            "## Notes\n"
+            "- verdict: REJECT, reviewer: {unbalanced\n"
+        )
+        artifact = parse_trae_content(content, tmp_path / "a.yml")
+        assert (artifact.pr_number, artifact.verdict, artifact.errors) == (7, "APPROVE", ())
+
+    def test_regex_fallback_without_yaml(self, tmp_path, monkeypatch):
+        """Test that parsing still works when PyYAML is unavailable."""
+        monkeypatch.setattr(trae_artifacts, "yaml", None)
+        path = write_artifact(tmp_path, "TRAE-20260101-5.yml", 5, "REJECT", "2026-01-01 10:00 UTC")
+        artifact = parse_trae_artifact(path)
+        assert (artifact.pr_number, artifact.verdict, artifact.errors) == (5, "REJECT", ())
+
+
+class TestTraeArtifactLoader:
+    """Test the content-hash parse cache."""
+
+    def test_cache_skips_parsing(self, tmp_path, monkeypatch):
+        """Test that a persisted cache serves identical content without parsing."""
+        path = write_artifact(tmp_path, "TRAE-20260101-5.yml", 5, "APPROVE", "2026-01-01 10:00 UTC")
+        loader = TraeArtifactLoader(tmp_path / "cache.marshal")
+        first = loader.load(path)
+        loader.flush()
+
+        calls = []
+        monkeypatch.setattr(trae_artifacts, "parse_trae_content", lambda *a: calls.append(a))
+        warm = TraeArtifactLoader(tmp_path / "cache.marshal")
+        artifact = warm.load(path)
+        assert calls == []
+        assert (warm.hits, warm.misses) == (1, 0)
+        assert (artifact.pr_number, artifact.verdict, artifact.created_at) == (first.pr_number, first.verdict, first.created_at)
+        assert artifact.file_path == path
+
+    def test_corrupt_cache_ignored(self, tmp_path):
+        """Test that an unreadable cache file starts empty."""
+        (tmp_path / "cache.marshal").write_bytes(b"not marshal")
+        path = write_artifact(tmp_path, "TRAE-20260101-5.yml", 5, "APPROVE", "2026-01-01 10:00 UTC")
+        loader = TraeArtifactLoader(tmp_path / "cache.marshal")
+        assert loader.load(path).verdict == "APPROVE"
+        assert loader.misses == 1
+
+
+class TestTraeArtifactIndex:
+    """Test the PR number → artifacts index."""
+
+    def test_latest_by_created_at(self, tmp_path):
+        """Test that latest follows created_at, not file name order."""
+        write_artifact(tmp_path, "TRAE-20260105-7.yml", 7, "REJECT", "2026-01-02 09:00 UTC")
+        write_artifact(tmp_path, "TRAE-20260101-7.yml", 7, "APPROVE", "2026-01-03 09:00 UTC")
+        index = TraeArtifactIndex(tmp_path)
+        assert [a.verdict for a in index.artifacts_for(7)] == ["REJECT", "APPROVE"]
+        assert index.latest("7").verdict == "APPROVE"
+
+    def test_single_scan_for_many_lookups(self, tmp_path):
+        """Test that repeated lookups do not rescan an unchanged directory."""
+        write_artifact(tmp_path, "TRAE-20260101-1.yml", 1, "APPROVE", "2026-01-01 09:00 UTC")
+        index = TraeArtifactIndex(tmp_path)
+        for pr_number in range(100):
+            index.latest(pr_number)
+        assert index.scans == 1
+
+    def test_new_artifact_invalidates(self, tmp_path):
+        """Test that a new file is picked up after the directory changes."""
+        index = TraeArtifactIndex(tmp_path)
+        assert index.latest(3) is None
+        write_artifact(tmp_path, "TRAE-20260101-3.yml", 3, "APPROVE", "2026-01-01 09:00 UTC")
+        # Force a distinct mtime on filesystems with coarse timestamps
+        stat = os.stat(tmp_path)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert index.latest(3).verdict == "APPROVE"
+        assert index.scans == 2
+
+    def test_ignores_non_artifacts(self, tmp_path):
+        """Test that templates and non-numeric names are not indexed."""
+        (tmp_path / "TEMPLATE.md").write_text("verdict: APPROVE\n")
+        write_artifact(tmp_path, "TRAE-20260101-test.yml", 0, "APPROVE", "2026-01-01 09:00 UTC")
+        index = TraeArtifactIndex(tmp_path)
+        assert index.pr_numbers() == []
+        assert index.latest("test") is None
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing directory yields an empty index."""
+        index = TraeArtifactIndex(tmp_path / "missing")
+        assert not index.exists
+        assert index.latest(1) is None
+
+
+class TestReviewExpiryIndex:
+    """Test expiry-ordered range queries."""
+
+    def make_index(self):
+        return ReviewExpiryIndex([
+            TraeArtifact(Path("a.yml"), 1, "APPROVE", "2026-01-01 09:00 UTC"),
+            TraeArtifact(Path("b.yml"), 2, "APPROVE", "2026-01-03 09:00 UTC", expiry_days=1),
+            TraeArtifact(Path("c.yml"), 3, "APPROVE", "2026-01-05 09:00 UTC"),
+            TraeArtifact(Path("d.yml"), 4, "REJECT", "2026-01-05 09:00 UTC"),
+            TraeArtifact(Path("e.yml"), 5, "APPROVE", "not a date"),
+        ])
+
+    def test_only_approved_with_dates(self):
+        """Test that rejected and undated reviews are not indexed."""
+        assert len(self.make_index()) == 3
+
+    def test_expiring_within(self):
+        """Test reviews lapsing in the window, soonest first, honouring expiry_days."""
+        index = self.make_index()
+        now = datetime(2026, 1, 4, 0, 0)
+        assert [a.pr_number for a in index.expiring_within(now, 5)] == [2, 1]
+        assert [a.pr_number for a in index.expiring_within(now, 10)] == [2, 1, 3]
+
+    def test_expired_since(self):
+        """Test reviews that lapsed between two runs."""
+        index = self.make_index()
+        since = datetime(2026, 1, 8, 0, 0)
+        assert [a.pr_number for a in index.expired_since(since, datetime(2026, 1, 9, 0, 0))] == [1]
+        assert index.expired_since(since, since) == []
+
+    def test_index_uses_latest_review(self, tmp_path):
+        """Test that the artifact index exposes an expiry index of latest reviews."""
+        write_artifact(tmp_path, "TRAE-20260101-7.yml", 7, "APPROVE", "2026-01-01 09:00 UTC")
+        write_artifact(tmp_path, "TRAE-20260102-7.yml", 7, "REJECT", "2026-01-02 09:00 UTC")
+        write_artifact(tmp_path, "TRAE-20260101-8.yml", 8, "APPROVE", "2026-01-01 09:00 UTC")
+        expiry = TraeArtifactIndex(tmp_path).expiry()
+        assert [a.pr_number for a in expiry.between(datetime.min, datetime.max)] == [8]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))